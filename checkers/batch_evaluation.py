@@ -0,0 +1,119 @@
+from checkers.bitboard import (NUM_OF_SQUARES, FULL_MASK, KING_DIRECTIONS,
+                               WHITE_MAN_DIRECTIONS, square_to_location)
+from checkers.constants import Color, NUM_OF_COLUMNS
+from checkers.evaluation import MAN_VALUE, KING_VALUE, POSITIONAL_TABLES
+
+try:
+    import numpy as np
+except ImportError:
+    #   numpy is optional, without it the positions are evaluated one by one
+    np = None
+
+
+#   (color, king, code) of every kind of piece - the code stands for
+#   the piece in the encoding of the positions, 0 stands for an empty square
+PIECE_CODES = (
+    (Color.WHITE, False, 1),
+    (Color.WHITE, True, 2),
+    (Color.BLACK, False, -1),
+    (Color.BLACK, True, -2),
+)
+
+
+def numpy_available():
+    '''Whether the positions can be evaluated in batches'''
+    return np is not None
+
+
+def square_weights():
+    '''Returns the evaluation of every kind of piece standing on every
+    square from white's perspective, as a list of NUM_OF_SQUARES rows
+    with a column for every kind of piece in PIECE_CODES'''
+    weights = []
+    for square in range(NUM_OF_SQUARES):
+        x, y = square_to_location(square)
+        weights.append([
+            (1 if color == Color.WHITE else -1) * (
+                (KING_VALUE if king else MAN_VALUE)
+                + POSITIONAL_TABLES[(color, king)][x + NUM_OF_COLUMNS * y])
+            for color, king, _ in PIECE_CODES
+        ])
+    return weights
+
+
+if np is not None:
+    SQUARE_SHIFTS = np.arange(NUM_OF_SQUARES, dtype=np.uint32)
+    CODES = np.array([code for _, _, code in PIECE_CODES], dtype=np.int8)
+    WEIGHTS = np.array(square_weights(), dtype=np.int32).reshape(-1)
+
+
+def _masks(positions):
+    '''Returns the arrays of the white, black and kings masks
+    of the BitBoards and whether white is to move in them'''
+    #   int64 keeps the step functions of the bitboard module working
+    #   on the arrays, they use negative masks
+    masks = np.array([(position.white, position.black, position.kings)
+                      for position in positions], dtype=np.int64)
+    white_to_move = np.array([position.turn == Color.WHITE
+                              for position in positions])
+    return masks[:, 0], masks[:, 1], masks[:, 2], white_to_move
+
+
+def encode_positions(positions):
+    '''
+    Packs BitBoards into an array of shape (number of positions,
+    NUM_OF_SQUARES), holding the code from PIECE_CODES of the piece
+    standing on every square. Requires numpy.
+    '''
+    white, black, kings, _ = _masks(positions)
+    return _encode(white, black, kings)
+
+
+def _encode(white, black, kings):
+    def bits(masks):
+        return ((masks[:, np.newaxis] >> SQUARE_SHIFTS) & 1).astype(np.int8)
+    return (bits(white) - bits(black)) * (1 + bits(kings))
+
+
+def games_over(white, black, kings, white_to_move):
+    '''The BitBoard.is_game_over method working on the arrays of masks
+    of many positions at once: the game is over where the player to move
+    has no piece which could step or jump anywhere'''
+    own = np.where(white_to_move, white, black)
+    enemy = np.where(white_to_move, black, white)
+    empty = ~(white | black) & FULL_MASK
+    can_move = np.zeros_like(own)
+    for step, reverse_step in KING_DIRECTIONS:
+        if (step, reverse_step) in WHITE_MAN_DIRECTIONS:
+            men_can_move = white_to_move
+        else:
+            men_can_move = ~white_to_move
+        movers = np.where(men_can_move, own, own & kings)
+        can_move |= movers & (reverse_step(empty)
+                              | reverse_step(reverse_step(empty) & enemy))
+    return can_move == 0
+
+
+def evaluate_positions(positions):
+    '''
+    Evaluates a list of BitBoards the same way their evaluate_position
+    method does. With numpy, all of them are evaluated at once - the
+    material and positional bonuses with a single matrix product of the
+    encoded positions and the weights of the squares, the ends of the game
+    with bitwise operations on arrays of their masks - so the cost of the
+    Python code is paid once per batch instead of once per piece.
+
+    returns:
+    list of the evaluations from white's perspective
+    '''
+    if np is None or not positions:
+        return [position.evaluate_position() for position in positions]
+    white, black, kings, white_to_move = _masks(positions)
+    one_hot = _encode(white, black, kings)[:, :, np.newaxis] == CODES
+    evaluations = (one_hot.reshape(len(positions), -1).astype(np.int32)
+                   @ WEIGHTS).tolist()
+    for index in np.flatnonzero(games_over(white, black, kings,
+                                           white_to_move)):
+        evaluations[index] = (float('-inf') if white_to_move[index]
+                              else float('inf'))
+    return evaluations
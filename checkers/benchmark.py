@@ -0,0 +1,178 @@
+from argparse import ArgumentParser
+from json import dump, load
+from random import seed as seed_random
+from sys import exit
+from time import perf_counter
+from checkers.perft import parse_position, move_name
+from checkers.player import MinimaxBot
+
+
+#   name: (phase of the game, position in the notation of
+#   checkers.perft.format_position)
+POSITIONS = {
+    'start': (
+        'opening', 'W:W21,22,23,24,25,26,27,28,29,30,31,32'
+        ':B1,2,3,4,5,6,7,8,9,10,11,12'),
+    'opening-wide': (
+        'opening', 'W:W17,18,23,24,26,27,28,29,30,31,32'
+        ':B1,2,3,4,5,6,8,9,10,11,12'),
+    'opening-flank': (
+        'opening', 'W:W21,22,23,24,25,27,28,29,30,31,32'
+        ':B1,2,3,4,5,7,8,11,12,13,15'),
+    'middlegame-nine': (
+        'middlegame', 'W:W17,19,21,23,26,29,30,31,32'
+        ':B3,4,7,9,10,11,12,14,16'),
+    'middlegame-seven': (
+        'middlegame', 'W:W22,23,28,29,30,31,32:B1,3,4,5,11,15,16'),
+    'middlegame-open': (
+        'middlegame', 'W:W12,16,17,21,30,31,32:B1,3,4,5,15,18'),
+    'middlegame-six': (
+        'middlegame', 'W:W18,19,23,29,31,32:B1,3,4,11,17,20'),
+    'endgame-men': (
+        'endgame', 'W:W17,18,29,30,32:B1,2,3,13,19'),
+    'endgame-kings': (
+        'endgame', 'W:WK10,K19,27:B6,K23'),
+    'endgame-hunt': (
+        'endgame', 'B:WK14,K22:BK5'),
+}
+
+DEFAULT_DEPTHS = (4, 6)
+#   by how much longer than in the baseline a position may take to search
+DEFAULT_MAX_SLOWDOWN = 0.25
+#   searches are only reported as slower if they take at least that many
+#   seconds longer, short ones differ more than that between runs anyway
+MIN_SLOWDOWN_TIME = 0.02
+
+
+def benchmark_position(name, depth, seed=0, use_pvs=False):
+    '''
+    Searches one of the POSITIONS to a given depth with a new bot, so no
+    results of earlier searches are reused, and with the random module
+    seeded, so the same moves are chosen every time.
+
+    returns:
+    dictionary with the results of the search
+    '''
+    phase, position = POSITIONS[name]
+    board = parse_position(position)
+    bot = MinimaxBot(board.turn, depth, False, use_pvs=use_pvs,
+                     book_path=None, tablebase_path=None)
+    seed_random(seed)
+    start = perf_counter()
+    if use_pvs:
+        move = bot.search(board, depth)
+    else:
+        _, move = bot.minimax(board, depth)
+    elapsed = perf_counter() - start
+    nodes = bot.nodes + bot.quiescence_nodes
+    return {
+        'position': name,
+        'phase': phase,
+        'depth': depth,
+        'nodes': nodes,
+        'quiescence_nodes': bot.quiescence_nodes,
+        'time': elapsed,
+        'nodes_per_second': nodes / max(elapsed, 1e-9),
+        'move': move_name(move) if move is not None else None,
+    }
+
+
+def run_suite(depths=DEFAULT_DEPTHS, names=None, seed=0, use_pvs=False):
+    '''Benchmarks the positions with given names, by default all of the
+    POSITIONS, at every depth. Returns the list of the results.'''
+    if names is None:
+        names = list(POSITIONS)
+    return [benchmark_position(name, depth, seed, use_pvs)
+            for depth in depths for name in names]
+
+
+def compare(results, baseline, max_slowdown=DEFAULT_MAX_SLOWDOWN):
+    '''
+    Compares the results with the baseline ones, matched by the position
+    and depth.
+
+    returns:
+    regressions: list of descriptions of the searches slower by more than
+    max_slowdown of the baseline time and by more than MIN_SLOWDOWN_TIME
+    changes: list of descriptions of the searches with a different number
+    of nodes or move, which means the search itself has changed
+    '''
+    baseline_results = {(result['position'], result['depth']): result
+                        for result in baseline}
+    regressions, changes = [], []
+    for result in results:
+        old = baseline_results.get((result['position'], result['depth']))
+        if old is None:
+            continue
+        label = f'{result["position"]} at depth {result["depth"]}'
+        slowdown = result['time'] - old['time']
+        if (slowdown > old['time'] * max_slowdown
+                and slowdown > MIN_SLOWDOWN_TIME):
+            regressions.append(f'{label}: {result["time"]:.3f} s instead '
+                               f'of {old["time"]:.3f} s')
+        if (result['nodes'], result['move']) != (old['nodes'], old['move']):
+            changes.append(f'{label}: {result["nodes"]} nodes and move '
+                           f'{result["move"]}, the baseline has '
+                           f'{old["nodes"]} nodes and move {old["move"]}')
+    return regressions, changes
+
+
+def print_results(results):
+    '''Prints the results as a table, with the totals of all searches'''
+    print(f'{"position":<18}{"depth":>6}{"nodes":>10}{"time [s]":>10}'
+          f'{"nodes/s":>10}  move')
+    for result in results:
+        print(f'{result["position"]:<18}{result["depth"]:>6}'
+              f'{result["nodes"]:>10}{result["time"]:>10.3f}'
+              f'{result["nodes_per_second"]:>10.0f}  {result["move"]}')
+    total_nodes = sum(result['nodes'] for result in results)
+    total_time = sum(result['time'] for result in results)
+    print(f'{"total":<24}{total_nodes:>10}{total_time:>10.3f}'
+          f'{total_nodes / max(total_time, 1e-9):>10.0f}')
+
+
+def main(arguments=None):
+    '''Measures the speed of the search on a fixed set of positions
+    and compares it with a baseline'''
+    parser = ArgumentParser(description=main.__doc__)
+    parser.add_argument('--depths', type=int, nargs='+',
+                        default=list(DEFAULT_DEPTHS))
+    parser.add_argument('--positions', nargs='+', choices=list(POSITIONS),
+                        help='the names of the positions, by default all')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--pvs', action='store_true',
+                        help='use the principal variation search '
+                        'instead of minimax')
+    parser.add_argument('--output', help='the JSON file to save results to')
+    parser.add_argument('--baseline',
+                        help='the JSON file of earlier results to compare to')
+    parser.add_argument('--max-slowdown', type=float,
+                        default=DEFAULT_MAX_SLOWDOWN,
+                        help='the allowed slowdown of a search, '
+                        'as a fraction of its baseline time')
+    arguments = parser.parse_args(arguments)
+
+    results = run_suite(arguments.depths, arguments.positions,
+                        arguments.seed, arguments.pvs)
+    print_results(results)
+    if arguments.output:
+        with open(arguments.output, 'w') as output_file:
+            dump({'seed': arguments.seed, 'pvs': arguments.pvs,
+                  'results': results}, output_file, indent=2)
+    if arguments.baseline:
+        with open(arguments.baseline) as baseline_file:
+            baseline = load(baseline_file)
+        regressions, changes = compare(results, baseline['results'],
+                                       arguments.max_slowdown)
+        for change in changes:
+            print(change)
+        for regression in regressions:
+            print(f'regression - {regression}')
+        if regressions:
+            return 1
+        print('no regressions')
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,290 @@
+from dataclasses import dataclass
+from typing import Tuple
+from checkers.constants import Color, NUM_OF_COLUMNS
+from checkers.evaluation import MAN_VALUE, KING_VALUE, POSITIONAL_TABLES
+
+
+#   The 32 dark squares of the board are numbered row by row, four squares
+#   in each row: square = y * 4 + x // 2. Bit n of every mask below stands
+#   for square n, so a whole set of pieces fits into one 32-bit int.
+NUM_OF_SQUARES = 32
+SQUARES_IN_ROW = 4
+FULL_MASK = (1 << NUM_OF_SQUARES) - 1
+
+EVEN_ROWS = sum(0xF << (8 * row) for row in range(4))
+ODD_ROWS = EVEN_ROWS << 4
+FIRST_COLUMN = sum(1 << square for square in range(0, NUM_OF_SQUARES, 4))
+LAST_COLUMN = FIRST_COLUMN << 3
+TOP_ROW = 0xF
+BOTTOM_ROW = 0xF << (NUM_OF_SQUARES - SQUARES_IN_ROW)
+
+
+def _step_plus_plus(bits):
+    '''Shifts every bit onto the square at (x+1, y+1)'''
+    return (((bits & EVEN_ROWS & ~LAST_COLUMN) << 5)
+            | ((bits & ODD_ROWS) << 4)) & FULL_MASK
+
+
+def _step_minus_plus(bits):
+    '''Shifts every bit onto the square at (x-1, y+1)'''
+    return (((bits & EVEN_ROWS) << 4)
+            | ((bits & ODD_ROWS & ~FIRST_COLUMN) << 3)) & FULL_MASK
+
+
+def _step_plus_minus(bits):
+    '''Shifts every bit onto the square at (x+1, y-1)'''
+    return (((bits & EVEN_ROWS & ~LAST_COLUMN) >> 3)
+            | ((bits & ODD_ROWS) >> 4))
+
+
+def _step_minus_minus(bits):
+    '''Shifts every bit onto the square at (x-1, y-1)'''
+    return (((bits & EVEN_ROWS) >> 4)
+            | ((bits & ODD_ROWS & ~FIRST_COLUMN) >> 5))
+
+
+#   (step, reverse step) pairs - the reverse step is used to find the pieces
+#   which can reach a given set of squares
+WHITE_MAN_DIRECTIONS = (
+    (_step_plus_minus, _step_minus_plus),
+    (_step_minus_minus, _step_plus_plus),
+)
+BLACK_MAN_DIRECTIONS = (
+    (_step_plus_plus, _step_minus_minus),
+    (_step_minus_plus, _step_plus_minus),
+)
+KING_DIRECTIONS = WHITE_MAN_DIRECTIONS + BLACK_MAN_DIRECTIONS
+
+
+def location_to_square(location):
+    '''Maps the x, y location of a dark field onto its square number'''
+    x, y = location
+    return y * SQUARES_IN_ROW + x // 2
+
+
+def square_to_location(square):
+    '''Maps a square number onto the x, y location of its field'''
+    y, column = divmod(square, SQUARES_IN_ROW)
+    x = 2 * column + (1 if y % 2 == 0 else 0)
+    return (x, y)
+
+
+def bit_index(bit):
+    '''Returns the square number of a single set bit'''
+    return bit.bit_length() - 1
+
+
+def count_bits(bits):
+    '''Returns the number of set bits (pieces) in a mask'''
+    return bin(bits).count('1')
+
+
+@dataclass(frozen=True)
+class BitMove:
+    '''
+    Class representing a move on a BitBoard
+
+    param path: the square numbers visited by the piece, starting with the
+    square it moves from. A quiet move has a path of length two, a capture
+    sequence has one more square per jumped piece.
+    type path: Tuple[int]
+
+    param captured: a mask of the squares of the pieces jumped over
+    type captured: int
+    '''
+    path: Tuple[int, ...]
+    captured: int
+
+    @property
+    def attacking(self):
+        '''Whether the move jumps over any enemy pieces'''
+        return self.captured != 0
+
+
+@dataclass(frozen=True)
+class BitBoard:
+    '''
+    Compact representation of a checkers position, used by the search
+    instead of the Board, Piece and Field objects
+
+    param white, black: masks of the squares taken by the pieces
+    of a given color
+    type white, black: int
+
+    param kings: mask of the squares taken by king pieces of both colors
+    type kings: int
+
+    param turn: the color of the player who is supposed to move
+    type turn: Color
+    '''
+    white: int
+    black: int
+    kings: int
+    turn: Color
+
+    @classmethod
+    def from_board(cls, board):
+        '''Packs the position of a Board into a BitBoard'''
+        white = black = kings = 0
+        for color, pieces in board.pieces_by_colors.items():
+            for piece in pieces:
+                bit = 1 << location_to_square(piece.location)
+                if color == Color.WHITE:
+                    white |= bit
+                else:
+                    black |= bit
+                if piece.king:
+                    kings |= bit
+        return cls(white, black, kings, board.turn)
+
+    def to_board(self):
+        '''Unpacks the position into a new Board object'''
+        # imported here, piece_move_board imports this module
+        from checkers.piece_move_board import Board, Piece
+        pieces = []
+        for color, bits in ((Color.WHITE, self.white),
+                            (Color.BLACK, self.black)):
+            while bits:
+                bit = bits & -bits
+                bits ^= bit
+                piece = Piece(color, *square_to_location(bit_index(bit)))
+                if bit & self.kings:
+                    piece.promote()
+                pieces.append(piece)
+        board = Board()
+        board.setup_position(pieces, self.turn)
+        return board
+
+    def own_and_enemy_pieces(self):
+        '''Returns the masks of the pieces of the player to move and
+        of his opponent'''
+        if self.turn == Color.WHITE:
+            return self.white, self.black
+        return self.black, self.white
+
+    @property
+    def empty(self):
+        '''Mask of the squares with no piece on them'''
+        return ~(self.white | self.black) & FULL_MASK
+
+    def _man_directions(self):
+        if self.turn == Color.WHITE:
+            return WHITE_MAN_DIRECTIONS
+        return BLACK_MAN_DIRECTIONS
+
+    def _promotion_row(self):
+        return TOP_ROW if self.turn == Color.WHITE else BOTTOM_ROW
+
+    def legal_moves(self):
+        '''Returns the list of moves the player to move can make. If any
+        capture is possible, only the capture sequences are returned'''
+        captures = self.capture_moves()
+        if captures:
+            return captures
+        return self.quiet_moves()
+
+    def quiet_moves(self):
+        '''Returns all non attacking moves of the player to move'''
+        own, _ = self.own_and_enemy_pieces()
+        empty = self.empty
+        man_directions = self._man_directions()
+        moves = []
+        for step, reverse_step in KING_DIRECTIONS:
+            movers = own if (step, reverse_step) in man_directions else (
+                own & self.kings)
+            movers &= reverse_step(empty)
+            while movers:
+                bit = movers & -movers
+                movers ^= bit
+                moves.append(BitMove(
+                    (bit_index(bit), bit_index(step(bit))), 0))
+        return moves
+
+    def jumpers(self):
+        '''Returns the mask of the pieces of the player to move
+        which can jump over an enemy piece'''
+        own, enemy = self.own_and_enemy_pieces()
+        empty = self.empty
+        man_directions = self._man_directions()
+        jumpers = 0
+        for step, reverse_step in KING_DIRECTIONS:
+            movers = own if (step, reverse_step) in man_directions else (
+                own & self.kings)
+            jumpers |= movers & reverse_step(reverse_step(empty) & enemy)
+        return jumpers
+
+    def capture_moves(self):
+        '''Returns all complete capture sequences of the player to move'''
+        _, enemy = self.own_and_enemy_pieces()
+        jumpers = self.jumpers()
+        moves = []
+        while jumpers:
+            bit = jumpers & -jumpers
+            jumpers ^= bit
+            self._extend_capture(bit, bool(bit & self.kings), enemy,
+                                 self.empty, (bit_index(bit),), 0, moves)
+        return moves
+
+    def _extend_capture(self, bit, king, enemy, empty, path, captured,
+                        moves):
+        '''Follows every jump the piece on the bit square can make and
+        appends the finished sequences to moves. Jumped pieces are taken off
+        the board right away, a man reaching the last row is promoted
+        and keeps on capturing as a king.'''
+        directions = KING_DIRECTIONS if king else self._man_directions()
+        extended = False
+        for step, _ in directions:
+            jumped = step(bit) & enemy
+            landing = step(jumped) & empty
+            if not landing:
+                continue
+            extended = True
+            self._extend_capture(
+                landing, king or bool(landing & self._promotion_row()),
+                enemy & ~jumped, (empty | bit | jumped) & ~landing,
+                path + (bit_index(landing),), captured | jumped, moves)
+        if not extended and captured:
+            moves.append(BitMove(path, captured))
+
+    def apply(self, move):
+        '''Returns the position after the player to move makes a move'''
+        start = 1 << move.path[0]
+        end = 1 << move.path[-1]
+        visited = 0
+        for square in move.path:
+            visited |= 1 << square
+        own, enemy = self.own_and_enemy_pieces()
+        own = (own & ~start) | end
+        enemy &= ~move.captured
+        kings = self.kings & ~start & ~move.captured
+        if self.kings & start or visited & self._promotion_row():
+            kings |= end
+        if self.turn == Color.WHITE:
+            return BitBoard(own, enemy, kings, Color.BLACK)
+        return BitBoard(enemy, own, kings, Color.WHITE)
+
+    def is_game_over(self):
+        '''The game is over if the player to move has no legal moves'''
+        if self.jumpers():
+            return False
+        return not self.quiet_moves()
+
+    def evaluate_position(self):
+        '''Evaluates the position the same way Board.evaluate_position does
+        - positive evaluation means white has the edge'''
+        if self.is_game_over():
+            if self.turn == Color.WHITE:
+                return float('-inf')
+            return float('inf')
+        evaluation = 0
+        for color, bits, sign in ((Color.WHITE, self.white, 1),
+                                  (Color.BLACK, self.black, -1)):
+            while bits:
+                bit = bits & -bits
+                bits ^= bit
+                king = bool(bit & self.kings)
+                x, y = square_to_location(bit_index(bit))
+                evaluation += sign * (
+                    (KING_VALUE if king else MAN_VALUE)
+                    + POSITIONAL_TABLES[(color, king)][x + NUM_OF_COLUMNS * y])
+        return evaluation
@@ -0,0 +1,129 @@
+from argparse import ArgumentParser
+from mmap import mmap, ACCESS_READ
+from struct import Struct
+from checkers.constants import BOOK_PATH, BOOK_DEPTH, Color
+from checkers.piece_move_board import Board
+from checkers.transposition import move_key, find_move
+
+
+BOOK_MAGIC = b'CKRSBOOK'
+#   the magic bytes and the number of records
+HEADER = Struct('<8sQ')
+#   the Zobrist key of a position and the key of its best move
+RECORD = Struct('<QI')
+
+
+def write_book(path, moves_by_keys):
+    '''Saves a dictionary mapping the Zobrist keys of positions onto
+    the keys of their best moves as a book file, sorted by the keys'''
+    with open(path, 'wb') as book_file:
+        book_file.write(HEADER.pack(BOOK_MAGIC, len(moves_by_keys)))
+        for key in sorted(moves_by_keys):
+            book_file.write(RECORD.pack(key, moves_by_keys[key]))
+
+
+def build_book(plies=BOOK_DEPTH, search_depth=8, board=None):
+    '''
+    Searches every position reachable from the board (by default the
+    starting one) in less than a given number of plies and returns
+    a dictionary mapping their Zobrist keys onto the keys of the moves
+    chosen by a search of a given depth. Positions reached by different
+    orders of moves are searched once.
+    '''
+    # imported here, the player module imports this one
+    from checkers.player import MinimaxBot
+    if board is None:
+        board = Board()
+    bots = {color: MinimaxBot(color, search_depth, False)
+            for color in Color}
+    moves_by_keys = dict()
+
+    def add_positions(plies_left):
+        if (plies_left == 0 or board.is_game_over
+                or board.zobrist_key in moves_by_keys):
+            return
+        bot = bots[board.turn]
+        bot.nodes = bot.quiescence_nodes = 0
+        moves_by_keys[board.zobrist_key] = move_key(
+            bot.iterative_deepening(board))
+        for move in board.all_possible_moves(board.turn):
+            record = board.make_move(move)
+            add_positions(plies_left - 1)
+            board.unmake_move(record)
+
+    add_positions(plies)
+    return moves_by_keys
+
+
+class OpeningBook:
+    '''
+    Class reading an opening book file through mmap, so the book is not
+    loaded into memory - only the pages with the records looked at are.
+    The file starts with a HEADER followed by RECORDs sorted by the keys
+    of the positions, which are looked up with a binary search.
+
+    param path: the path to the book file
+    type path: str
+    '''
+
+    def __init__(self, path) -> None:
+        self.path = path
+        with open(path, 'rb') as book_file:
+            self._map = mmap(book_file.fileno(), 0, access=ACCESS_READ)
+        if len(self._map) < HEADER.size:
+            self._map.close()
+            raise ValueError(f'{path} is not an opening book file')
+        magic, self._num_of_records = HEADER.unpack_from(self._map)
+        if (magic != BOOK_MAGIC or len(self._map)
+                != HEADER.size + self._num_of_records * RECORD.size):
+            self._map.close()
+            raise ValueError(f'{path} is not an opening book file')
+
+    def __len__(self):
+        return self._num_of_records
+
+    def close(self):
+        '''Closes the mapping of the file'''
+        self._map.close()
+
+    def probe(self, key):
+        '''Returns the key of the move stored for the position with
+        a given Zobrist key or None if there is no such position'''
+        low, high = 0, self._num_of_records
+        while low < high:
+            middle = (low + high) // 2
+            record_key, record_move_key = RECORD.unpack_from(
+                self._map, HEADER.size + middle * RECORD.size)
+            if record_key == key:
+                return record_move_key
+            if record_key < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def find_move(self, board):
+        '''Returns the move of the board stored in the book or None'''
+        stored_move_key = self.probe(board.zobrist_key)
+        if stored_move_key is None:
+            return None
+        return find_move(board.all_possible_moves(board.turn),
+                         stored_move_key)
+
+
+def main(arguments=None):
+    '''Builds an opening book from searches of the starting positions'''
+    parser = ArgumentParser(description=main.__doc__)
+    parser.add_argument('--output', default=BOOK_PATH)
+    parser.add_argument('--plies', type=int, default=BOOK_DEPTH,
+                        help='how many moves from the start the book covers')
+    parser.add_argument('--depth', type=int, default=8,
+                        help='the depth of the search of every position')
+    arguments = parser.parse_args(arguments)
+    moves_by_keys = build_book(arguments.plies, arguments.depth)
+    write_book(arguments.output, moves_by_keys)
+    print(f'Saved {len(moves_by_keys)} positions to {arguments.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -19,6 +19,36 @@ SLEEP_TIME_IN_PVB_GAME = 0.25
 SLEEP_TIME_IN_BVB_GAME = 1.2
 MINIMAX_DEPTH = 8
 MAX_MOVES_WITHOUT_ATTACKS = 50
+DEBUG_MOVE_GENERATION = False
+TT_SIZE_MB = 16
+#   how many nodes the bot searches between checks of its time limit
+NODES_BETWEEN_TIME_CHECKS = 256
+#   half of the width of the window the principal variation search
+#   starts each iteration with, around the score of the previous one
+ASPIRATION_WINDOW = 25
+#   how many attacks past its depth the search can follow
+QUIESCENCE_MAX_DEPTH = 8
+#   how many processes the bot searches with
+SEARCH_WORKERS = 1
+#   whether those processes search the whole position at once, sharing
+#   their transposition table, instead of splitting its moves
+LAZY_SMP = False
+#   the opening book file, built with python -m checkers.book, and for
+#   how many moves from the start of the game the bot looks moves up in it
+BOOK_PATH = 'opening_book.bin'
+BOOK_DEPTH = 4
+#   the endgame tablebase file, generated with python -m checkers.tablebase
+#   for the positions with up to TABLEBASE_PIECES pieces, and the score
+#   of a position won according to it
+TABLEBASE_PATH = 'tablebase.bin'
+TABLEBASE_PIECES = 3
+TABLEBASE_WIN_SCORE = 10000
+#   whether the bitboard search evaluates the leaves in batches with numpy,
+#   which gives up the cutoffs among the leaves of a position
+BATCH_FRONTIER = False
+#   the JSONL file the statistics of every move of the minimax bots
+#   are appended to, None if they are not saved
+STATS_LOG_PATH = None
 
 
 class Color(Enum):
@@ -0,0 +1,50 @@
+from checkers.constants import NUM_OF_COLUMNS, NUM_OF_ROWS, Color
+
+
+MAN_VALUE = 100
+KING_VALUE = 160
+#   for every row a man has moved towards its promotion
+ADVANCE_BONUS = 3
+#   for a man still on its own back row, keeping the enemy men
+#   from getting promoted there
+BACK_RANK_BONUS = 10
+#   for a man on one of the central fields
+CENTER_BONUS = 6
+#   for every field a king could step onto from its field,
+#   which is 4 in the middle of the board and less near its edges
+KING_MOBILITY_BONUS = 4
+
+CENTER_COLUMNS = range(2, NUM_OF_COLUMNS - 2)
+CENTER_ROWS = range(3, NUM_OF_ROWS - 3)
+
+
+def _positional_bonus(color, king, x, y):
+    if king:
+        neighbours = sum(1 for dx in (-1, 1) for dy in (-1, 1)
+                         if 0 <= x + dx < NUM_OF_COLUMNS
+                         and 0 <= y + dy < NUM_OF_ROWS)
+        return KING_MOBILITY_BONUS * neighbours
+    back_row = NUM_OF_ROWS - 1 if color == Color.WHITE else 0
+    bonus = ADVANCE_BONUS * abs(back_row - y)
+    if y == back_row:
+        bonus += BACK_RANK_BONUS
+    if x in CENTER_COLUMNS and y in CENTER_ROWS:
+        bonus += CENTER_BONUS
+    return bonus
+
+
+#   maps (color, king) of a piece onto the bonuses for standing on every
+#   field, indexed like Board.one_dimensional_field_list. The tables of
+#   the colors mirror each other, so equal positions are evaluated as 0.
+POSITIONAL_TABLES = {
+    (color, king): [_positional_bonus(color, king, index % NUM_OF_COLUMNS,
+                                      index // NUM_OF_COLUMNS)
+                    for index in range(NUM_OF_COLUMNS * NUM_OF_ROWS)]
+    for color in Color for king in (False, True)
+}
+
+
+def positional_score(piece):
+    '''Returns the positional bonus of a piece standing on its field'''
+    return POSITIONAL_TABLES[(piece.color, piece.king)][
+        piece.x + NUM_OF_COLUMNS * piece.y]
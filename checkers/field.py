@@ -16,6 +16,8 @@ class Field:
     type y: int
     '''
 
+    __slots__ = ('color', '_piece', '_x', '_y')
+
     def __init__(self, color, x, y) -> None:
         self.color = color
         self._piece = None
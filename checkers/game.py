@@ -1,7 +1,6 @@
 import pygame
 from checkers.constants import (FIELD_SIZE, PIECE_PADDING, GREEN, BROWN,
-                                SLEEP_TIME_IN_PVB_GAME, SLEEP_TIME_IN_BVB_GAME,
-                                Color)
+                                SLEEP_TIME_IN_PVB_GAME, SLEEP_TIME_IN_BVB_GAME)
 from checkers.piece_move_board import Board, Piece
 from time import sleep
 
@@ -21,6 +20,10 @@ class Game:
     param selected_piece: the piece currently selected by the user
     type selected_piece: Piece
 
+    param jump_path: the landing fields of a sequence of jumps the user
+    has clicked so far, when more than one sequence matched the clicks
+    type jump_path: tuple
+
     param num_of_bots: the number of computer controlled players in a game
     type num_of_bots: int
 
@@ -34,6 +37,7 @@ class Game:
         self.load_images()
         self.players = players
         self.selected_piece = None
+        self.jump_path = ()
         self._player_color_dictionary = {
             player.color: player
             for player in self.players
@@ -133,7 +137,7 @@ class Game:
 
     def handle_piece_click(self, clicked_piece):
         '''The method for handling an event when a given piece is clicked.'''
-        self.board.update_possible_moves_by_colors()
+        self.jump_path = ()
         if (clicked_piece.color == self.board.turn
                 and self.board.can_piece_move(clicked_piece)):
             self.show_possible_moves(clicked_piece)
@@ -143,38 +147,51 @@ class Game:
             self.draw_board()
 
     @staticmethod
-    def find_move_by_move_location(location, piece_move_list):
-        '''Returns a move from the given list with the new_cords
-        param matching the given location'''
-        for move in piece_move_list:
-            if move.new_cords == location:
-                return move
-        raise IndexError('Tried to reach a nonexisting move')
+    def find_moves_by_clicked_locations(locations, piece_move_list):
+        '''Returns the moves from the given list matching the clicked
+        locations: the moves landing on them in that order first or,
+        if there are none, the moves ending on the only clicked location'''
+        matching_moves = [move for move in piece_move_list
+                          if move.landings[:len(locations)] == locations]
+        if not matching_moves and len(locations) == 1:
+            matching_moves = [move for move in piece_move_list
+                              if move.new_cords == locations[0]]
+        return matching_moves
 
     def handle_field_click(self, clicked_field):
-        '''The method for handling an event when a field is clicked'''
-        if self.selected_piece is not None:
-            (possible_move_locations,
-             possible_moves) = (self.board.
-                                feasible_locations_and_moves_for_piece(
-                                    self.selected_piece))
-
-            if clicked_field.location in possible_move_locations:
-                move_to_make = self.find_move_by_move_location(
-                    clicked_field.location, possible_moves)
-                if move_to_make.attacking:
-                    self.board.handle_attacking_move(move_to_make)
-                    self.draw_board()
-                    self.board.moves_without_attacks = 0
-
-                else:
-                    self.board.handle_passive_move(move_to_make)
-                    self.draw_board()
-                    self.board.moves_without_attacks += 1
-
-                self.selected_piece = None
-            else:
-                self.draw_board()
+        '''The method for handling an event when a field is clicked.
+        When more than one sequence of jumps matches the clicks, the next
+        fields they land on are highlighted and the user picks the sequence
+        by clicking them.'''
+        if self.selected_piece is None:
+            return
+        possible_moves = self.board.feasible_locations_and_moves_for_piece(
+            self.selected_piece)[1]
+        clicked_locations = self.jump_path + (clicked_field.location,)
+        matching_moves = self.find_moves_by_clicked_locations(
+            clicked_locations, possible_moves)
+        if len(matching_moves) == 1:
+            self.apply_move(matching_moves[0])
+        elif matching_moves:
+            #   the paths only match when the clicks were the landings
+            if matching_moves[0].landings[:len(clicked_locations)] == (
+                    clicked_locations):
+                self.jump_path = clicked_locations
+            self.draw_board()
+            for move in matching_moves:
+                self.highlight_field(self.board.get_field_by_location(
+                    move.landings[len(self.jump_path)]))
+        else:
+            self.jump_path = ()
+            self.draw_board()
+
+    def apply_move(self, move):
+        '''Makes a move on the board, the one chosen by the user
+        or the Move object returned by a bot'''
+        self.board.handle_move(move)
+        self.selected_piece = None
+        self.jump_path = ()
+        self.draw_board()
 
     def interpret_clicked_pixel_location(self, location):
         '''Maps the clicked pixel coordinates onto the corresponding
@@ -199,23 +216,9 @@ class Game:
             self.handle_field_click(clicked_field)
 
     def handle_random_bot_move(self):
-        '''This method gives the random bot the arguments
-        he needs to decide on his move and executes it
+        '''This method lets the random bot choose its move
+        and executes it
         '''
         sleep(self.sleep_duration)
         bot = self.player_color_dictionary[self.board.turn]
-        if bot.color == Color.WHITE:
-            movable_pieces = [piece for piece in self.board.all_white_pieces(
-            ) if self.board.moves_by_colors[Color.WHITE][piece]]
-            piece_click_location = bot.click_random_piece(movable_pieces)
-        else:
-            movable_pieces = [piece for piece in self.board.all_black_pieces(
-            ) if self.board.moves_by_colors[Color.BLACK][piece]]
-            piece_click_location = bot.click_random_piece(movable_pieces)
-        self.handle_mouse_click(piece_click_location)
-        moves_for_chosen_piece = (self.board.
-                                  feasible_locations_and_moves_for_piece(
-                                      self.selected_piece)[1])
-        move_click_location = bot.choose_random_possible_move_location(
-            moves_for_chosen_piece)
-        self.handle_mouse_click(move_click_location)
+        self.apply_move(bot.choose_move(self.board))
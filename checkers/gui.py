@@ -1,7 +1,8 @@
 import pygame
 from checkers.constants import (WIN_WIDTH, WIN_HEIGHT, BEIGE, TITLE_RECT_MID_X,
                                 TITLE_RECT_MID_Y, BUTTON_OUTLINE_HEIGHT,
-                                BUTTON_OUTLINE_WIDTH, LIGHT_BROWN, Color)
+                                BUTTON_OUTLINE_WIDTH, LIGHT_BROWN, Color,
+                                BOOK_PATH, TABLEBASE_PATH)
 from time import sleep
 from checkers.player import RandomBot, MinimaxBot
 
@@ -154,8 +155,9 @@ def get_bot_settings_from_the_user(colors):
                         print('Invalid time limit!')
                         print('\n')
 
-            settings.append(MinimaxBot(color, int(
-                minimax_depth), int(minimax_time_limit)))
+            settings.append(MinimaxBot(
+                color, int(minimax_depth), int(minimax_time_limit),
+                book_path=BOOK_PATH, tablebase_path=TABLEBASE_PATH))
 
     if len(colors) == 1:
         print('Good luck!')
@@ -5,14 +5,24 @@ from checkers.gui import (draw_game_over_screen,
                           draw_menu, get_bot_settings_from_the_user)
 from checkers.game import Game
 from checkers.player import Player, MinimaxBot
+from checkers.profiling import profiler_from_environment
 from sys import exit
 from time import perf_counter, sleep
 
 
+def close_bots(game):
+    '''Stops the background searches and the worker processes
+    of the bots of a finished game'''
+    for player in game.player_color_dictionary.values():
+        if isinstance(player, MinimaxBot):
+            player.close()
+
+
 def main():
     '''The main function controlling the flow of the entire program,
     starting with the menu, going on through the game and
     ending at the game over screen. To play, run the file via terminal.'''
+    profiler_from_environment()
     pygame.init()
     game_running = False
     menu_active = True
@@ -75,17 +85,22 @@ def main():
                 bot_to_move = game.player_color_dictionary[game.board.turn]
                 if isinstance(bot_to_move, MinimaxBot):
                     start_time = perf_counter()
-                    piece_click, field_click = bot_to_move.make_move(
-                        game.board)
+                    move = bot_to_move.choose_move(game.board)
                     end_time = perf_counter()
                     if end_time - start_time < 1:
                         sleep(game.sleep_duration)
-                    game.handle_mouse_click(piece_click)
-                    game.handle_mouse_click(field_click)
+                    #   the Move itself is made, two sequences of jumps
+                    #   may end on the same field
+                    game.apply_move(move)
+                    if not game.player_color_dictionary[
+                            game.board.turn].ai:
+                        #   keeps thinking while the human player does
+                        bot_to_move.start_pondering(game.board)
                 else:
                     game.handle_random_bot_move()
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
+                    close_bots(game)
                     pygame.quit()
                     exit()
 
@@ -93,6 +108,7 @@ def main():
                     if event.key == pygame.K_q:
                         game_running = False
                         menu_active = True
+                        close_bots(game)
 
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     mouse_position = pygame.mouse.get_pos()
@@ -101,6 +117,7 @@ def main():
             if game.board.is_game_over:
                 game_running = False
                 game_over_screen_active = True
+                close_bots(game)
 
         pygame.display.update()
         clock.tick(MAX_FPS)
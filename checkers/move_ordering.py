@@ -0,0 +1,124 @@
+from checkers.transposition import move_key
+
+
+KILLERS_PER_PLY = 2
+PV_MOVE_SCORE = 5_000_000
+TABLE_MOVE_SCORE = 4_000_000
+CAPTURE_SCORE = 3_000_000
+CAPTURED_PIECE_SCORE = 1000
+PROMOTION_SCORE = 2_000_000
+KILLER_SCORE = 1_000_000
+#   the lowest 12 bits of a move key hold its start and end fields
+FROM_TO_MASK = (1 << 12) - 1
+
+
+class MoveOrdering:
+    '''
+    Class sorting the moves of a position so that the ones most likely
+    to cause an alpha-beta cutoff are searched first: the move of the
+    previous iteration's principal variation, the best move from the
+    transposition table, then attacks
+    and promotions, then the killer moves of the ply and then the rest
+    by their history score.
+
+    param killers: for every ply, the keys of the last two passive moves
+    which caused a cutoff there
+    type killers: list
+
+    param history: maps the start and end fields of a passive move onto
+    a score growing with every cutoff it causes
+    type history: dict
+
+    param cutoffs: the number of cutoffs recorded since the last
+    new_search
+    type cutoffs: int
+
+    param first_move_cutoffs: how many of those cutoffs were caused by
+    the first move searched
+    type first_move_cutoffs: int
+
+    param cutoffs_by_move_number: maps the number of the move, in the order
+    of searching, onto how many of those cutoffs it caused
+    type cutoffs_by_move_number: dict
+
+    param root_rotation: by how many places the moves of the root are
+    rotated before sorting, so the root moves with equal scores are
+    searched in another order. Used to make the Lazy SMP workers differ.
+    type root_rotation: int
+    '''
+
+    def __init__(self, root_rotation=0) -> None:
+        self.killers = []
+        self.history = dict()
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.cutoffs_by_move_number = dict()
+        self.root_rotation = root_rotation
+
+    def new_search(self):
+        '''Forgets the killer moves and the counters of the previous search
+        and halves the history scores, so the newer cutoffs matter more'''
+        self.killers = []
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.cutoffs_by_move_number = dict()
+        self.history = {key: score // 2
+                        for key, score in self.history.items() if score > 1}
+
+    def _killers_of_ply(self, ply):
+        while len(self.killers) <= ply:
+            self.killers.append([0] * KILLERS_PER_PLY)
+        return self.killers[ply]
+
+    def move_score(self, move, key, killers):
+        '''Returns how promising a move is, higher is searched earlier'''
+        if move.attacking:
+            score = CAPTURE_SCORE + CAPTURED_PIECE_SCORE * len(
+                move.captured_pieces)
+            if move.piece.eligible_for_promotion_after_move(move):
+                score += CAPTURED_PIECE_SCORE // 2
+            return score
+        if move.piece.eligible_for_promotion_after_move(move):
+            return PROMOTION_SCORE
+        if key in killers:
+            return KILLER_SCORE + KILLERS_PER_PLY - killers.index(key)
+        return self.history.get(key & FROM_TO_MASK, 0)
+
+    def order(self, moves, ply, table_move_key=0, pv_move_key=0):
+        '''Returns the moves sorted from the most to the least promising.
+        Moves with equal scores keep their order, at the root after
+        the rotation by root_rotation.'''
+        killers = self._killers_of_ply(ply)
+        if ply == 0 and self.root_rotation and moves:
+            shift = self.root_rotation % len(moves)
+            moves = moves[shift:] + moves[:shift]
+        scored_moves = []
+        for move in moves:
+            key = move_key(move)
+            if key == pv_move_key:
+                score = PV_MOVE_SCORE
+            elif key == table_move_key:
+                score = TABLE_MOVE_SCORE
+            else:
+                score = self.move_score(move, key, killers)
+            scored_moves.append((score, move))
+        scored_moves.sort(key=lambda score_and_move: -score_and_move[0])
+        return [move for _, move in scored_moves]
+
+    def record_cutoff(self, move, ply, depth, move_number):
+        '''Updates the killers and history after the move, searched
+        as the move_number-th one at a ply, caused a cutoff'''
+        self.cutoffs += 1
+        if move_number == 0:
+            self.first_move_cutoffs += 1
+        self.cutoffs_by_move_number[move_number] = (
+            self.cutoffs_by_move_number.get(move_number, 0) + 1)
+        if move.attacking:
+            return
+        key = move_key(move)
+        killers = self._killers_of_ply(ply)
+        if killers[0] != key:
+            killers[1:] = killers[:-1]
+            killers[0] = key
+        from_to = key & FROM_TO_MASK
+        self.history[from_to] = self.history.get(from_to, 0) + depth * depth
@@ -0,0 +1,63 @@
+from checkers.constants import NUM_OF_COLUMNS, NUM_OF_ROWS, Color
+
+
+#   directions as (dx, dy) steps on the board
+PLUS_PLUS = (1, 1)
+PLUS_MINUS = (1, -1)
+MINUS_PLUS = (-1, 1)
+MINUS_MINUS = (-1, -1)
+
+KING_DIRECTIONS = (PLUS_PLUS, PLUS_MINUS, MINUS_PLUS, MINUS_MINUS)
+MAN_DIRECTIONS = {
+    Color.WHITE: (PLUS_MINUS, MINUS_MINUS),
+    Color.BLACK: (PLUS_PLUS, MINUS_PLUS)
+}
+
+
+def field_index(location):
+    '''Returns the index of the field at a given x, y location in
+    Board.one_dimensional_field_list'''
+    x, y = location
+    return x + NUM_OF_COLUMNS * y
+
+
+def _on_board(x, y):
+    return 0 <= x < NUM_OF_COLUMNS and 0 <= y < NUM_OF_ROWS
+
+
+def _build_table(directions):
+    '''
+    Returns a list indexed by field_index. For every playable field it
+    holds a tuple with an entry for each direction a piece can step in:
+    (direction, step location, step index, landing location, landing index)
+    The step field is also the one jumped over during an attack. If the
+    landing field is outside of the board, its location is None and its
+    index is -1. Fields pieces never stand on have empty tuples.
+    '''
+    table = [() for _ in range(NUM_OF_COLUMNS * NUM_OF_ROWS)]
+    for y in range(NUM_OF_ROWS):
+        for x in range(NUM_OF_COLUMNS):
+            if (x + y) % 2 == 0:
+                continue
+            entries = []
+            for dx, dy in directions:
+                if not _on_board(x + dx, y + dy):
+                    continue
+                step = (x + dx, y + dy)
+                landing = (x + 2 * dx, y + 2 * dy)
+                if not _on_board(*landing):
+                    landing = None
+                entries.append((
+                    (dx, dy), step, field_index(step), landing,
+                    field_index(landing) if landing is not None else -1))
+            table[field_index((x, y))] = tuple(entries)
+    return table
+
+
+#   maps (color, king) of a piece onto its table
+MOVE_TABLES = {
+    (Color.WHITE, False): _build_table(MAN_DIRECTIONS[Color.WHITE]),
+    (Color.BLACK, False): _build_table(MAN_DIRECTIONS[Color.BLACK]),
+}
+MOVE_TABLES[(Color.WHITE, True)] = MOVE_TABLES[(Color.BLACK, True)] = (
+    _build_table(KING_DIRECTIONS))
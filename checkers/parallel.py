@@ -0,0 +1,390 @@
+from argparse import ArgumentParser
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from queue import Empty
+from random import Random, seed as seed_random
+from time import perf_counter
+from checkers.bitboard import BitBoard
+from checkers.piece_move_board import Board
+from checkers.constants import Color, TT_SIZE_MB
+from checkers.move_ordering import MoveOrdering
+from checkers.player import MinimaxBot, SearchTimeout
+from checkers.transposition import (TranspositionTable, table_size_in_bytes,
+                                    AGE_MASK)
+
+
+#   the bot searching the tasks of a worker process,
+#   created once per process by _init_worker
+_worker_bot = None
+#   the best evaluation of a root move found so far by any worker,
+#   from the perspective of the player to move at the root
+_shared_alpha = None
+#   the age of the search the last task of the worker belonged to
+_worker_age = None
+#   how many seconds LazySMPSearch waits for a result before it checks
+#   whether the workers are still running
+RESULT_WAIT_TIME = 1.0
+
+
+def encode_position(board):
+    '''
+    Packs a Board into a tuple of integers, which is sent to the workers
+    instead of the objects of the board:
+    (white mask, black mask, kings mask, turn, moves without attacks)
+    '''
+    position = BitBoard.from_board(board)
+    return (position.white, position.black, position.kings,
+            position.turn.value, board.moves_without_attacks)
+
+
+def decode_position(encoded):
+    '''Reverses encode_position, returns a new Board'''
+    white, black, kings, turn, moves_without_attacks = encoded
+    board = BitBoard(white, black, kings, Color(turn)).to_board()
+    board.moves_without_attacks = moves_without_attacks
+    return board
+
+
+def move_id(move):
+    '''Identifies a move of a position independently of the objects
+    of the board it was generated on'''
+    return move.old_cords, move.landings
+
+
+def _init_worker(use_pvs, tt_size_mb, shared_alpha):
+    global _worker_bot, _shared_alpha, _worker_age
+    _worker_bot = MinimaxBot(Color.WHITE, 1, False, tt_size_mb=tt_size_mb,
+                             use_pvs=use_pvs, workers=1)
+    _shared_alpha = shared_alpha
+    _worker_age = None
+
+
+def _search_root_move(task):
+    '''
+    Searches one move of the root position in a worker process.
+    The first task of a new search ages the worker's transposition table
+    and move ordering, like the start of a search of a single bot.
+    Returns (move id, evaluation or None if the deadline passed,
+    whether the evaluation is exact, number of nodes searched)
+    '''
+    global _worker_age
+    encoded, searched_move_id, depth, deadline, age = task
+    board = decode_position(encoded)
+    move = next(move for move in board.all_possible_moves(board.turn)
+                if move_id(move) == searched_move_id)
+    bot = _worker_bot
+    if age != _worker_age:
+        _worker_age = age
+        if bot.transposition_table is not None:
+            bot.transposition_table.age = age
+        bot.move_ordering.new_search()
+    bot.nodes = bot.quiescence_nodes = 0
+    alpha = _shared_alpha.value
+    try:
+        score = bot.evaluate_root_move(board, move, depth, alpha, deadline)
+    except SearchTimeout:
+        score = None
+    else:
+        with _shared_alpha.get_lock():
+            if score > _shared_alpha.value:
+                _shared_alpha.value = score
+    exact = score is not None and score > alpha
+    return (searched_move_id, score, exact,
+            bot.nodes + bot.quiescence_nodes)
+
+
+class ParallelSearch:
+    '''
+    Class searching the moves of a position on a pool of worker processes.
+    The first move is searched alone, so the others start with its
+    evaluation as alpha, then the rest of them are split between
+    the workers, which share the best evaluation found so far.
+    The pool is started with the first search and kept until close.
+
+    param workers: the number of worker processes
+    type workers: int
+
+    param use_pvs, tt_size_mb: the settings of the bots in the workers,
+    every one of them has its own transposition table
+    type use_pvs: bool
+    type tt_size_mb: int
+
+    param age: the number of the current search, sent to the workers
+    with every task
+    type age: int
+    '''
+
+    def __init__(self, workers, use_pvs=True, tt_size_mb=TT_SIZE_MB) -> None:
+        self.workers = workers
+        self.use_pvs = use_pvs
+        self.tt_size_mb = tt_size_mb
+        self.age = 0
+        self._pool = None
+        self._shared_alpha = None
+
+    def start(self):
+        '''Starts the worker processes, otherwise the first search does'''
+        context = get_context()
+        self._shared_alpha = context.Value('d', float('-inf'))
+        self._pool = context.Pool(
+            self.workers, initializer=_init_worker,
+            initargs=(self.use_pvs, self.tt_size_mb, self._shared_alpha))
+
+    def close(self):
+        '''Stops the worker processes'''
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def new_search(self):
+        '''Marks the start of a new search, the searches of the following
+        iterations of the same move share the results of the workers'''
+        self.age = (self.age + 1) & AGE_MASK
+
+    def search(self, board, depth, first_move=None, deadline=None):
+        '''
+        Searches the board to a given depth. The first_move, if given,
+        is searched before the others. Raises SearchTimeout if any move
+        could not be searched before the deadline.
+
+        returns:
+        board evaluation from white's perspective: int
+        best_move: Move of the board
+        nodes: the number of nodes searched by the workers
+        '''
+        if self._pool is None:
+            self.start()
+        moves = board.all_possible_moves(board.turn)
+        if first_move is not None and first_move in moves:
+            moves.remove(first_move)
+            moves.insert(0, first_move)
+        encoded = encode_position(board)
+        tasks = [(encoded, move_id(move), depth, deadline, self.age)
+                 for move in moves]
+        self._shared_alpha.value = float('-inf')
+        results = [self._pool.apply(_search_root_move, (tasks[0],))]
+        results.extend(self._pool.imap_unordered(_search_root_move,
+                                                 tasks[1:]))
+
+        nodes = sum(result[3] for result in results)
+        if any(result[1] is None for result in results):
+            raise SearchTimeout()
+        #   a move which was not exact is at most as good as the best one
+        best_id, best_score, _, _ = max(
+            results, key=lambda result: (result[1], result[2]))
+        best_move = next(move for move in moves if move_id(move) == best_id)
+        sign = 1 if board.turn == Color.WHITE else -1
+        return sign * best_score, best_move, nodes
+
+
+def _lazy_smp_worker(index, memory_name, use_pvs, tasks, results,
+                     stop_signal):
+    '''
+    The loop of a Lazy SMP worker process. Every task is searched with
+    iterative deepening, the workers with odd indices go one depth further.
+    The forked workers would share the state of the random module,
+    so every one is seeded with its index and rotates the moves of
+    the root by it, otherwise the workers of the same depth would
+    search the same tree in the same order.
+    The result is put into the results queue as (worker index, completed
+    depth, evaluation, move id or None, number of nodes searched).
+    None in the tasks queue ends the loop.
+    '''
+    memory = SharedMemory(name=memory_name)
+    seed_random(index)
+    bot = MinimaxBot(Color.WHITE, 1, False, tt_size_mb=0, use_pvs=use_pvs,
+                     workers=1)
+    bot.move_ordering = MoveOrdering(root_rotation=index // 2)
+    bot.transposition_table = TranspositionTable(buffer=memory.buf)
+    bot.stop_signal = stop_signal
+    try:
+        for encoded, depth, deadline, age in iter(tasks.get, None):
+            board = decode_position(encoded)
+            bot.transposition_table.age = age
+            bot.move_ordering.new_search()
+            bot.nodes = bot.quiescence_nodes = 0
+            move = bot.iterative_deepening(board, depth + index % 2,
+                                           deadline)
+            results.put((index, bot.completed_depth, bot.score,
+                         move_id(move) if move is not None else None,
+                         bot.nodes + bot.quiescence_nodes))
+    finally:
+        bot.transposition_table.release()
+        memory.close()
+
+
+class LazySMPSearch:
+    '''
+    Class searching a position with many worker processes at once. All of
+    them search the whole position, each one at its own pace and some one
+    depth deeper, but they share one transposition table kept in
+    a SharedMemory, so they mostly skip the work already done by the others.
+    When one of them completes the requested depth, the others are stopped
+    and the deepest completed result is used. The table needs no locks -
+    a half written entry never matches the key it is looked up with.
+    The processes are started with the first search and kept until close.
+
+    param workers: the number of worker processes
+    type workers: int
+
+    param use_pvs: the setting of the bots in the workers
+    type use_pvs: bool
+
+    param tt_size_mb: the size of the shared transposition table
+    type tt_size_mb: int
+
+    param age: the number of the current search, stored in the entries
+    of the table
+    type age: int
+    '''
+
+    def __init__(self, workers, use_pvs=True, tt_size_mb=TT_SIZE_MB) -> None:
+        self.workers = workers
+        self.use_pvs = use_pvs
+        self.tt_size_mb = tt_size_mb
+        self.age = 0
+        self._memory = None
+        self._processes = []
+        self._task_queues = []
+        self._results = None
+        self._stop_signal = None
+
+    def start(self):
+        '''Starts the worker processes, otherwise the first search does'''
+        context = get_context()
+        self._memory = SharedMemory(
+            create=True, size=table_size_in_bytes(self.tt_size_mb))
+        self._results = context.Queue()
+        self._stop_signal = context.Event()
+        for index in range(self.workers):
+            tasks = context.Queue()
+            process = context.Process(
+                target=_lazy_smp_worker, daemon=True,
+                args=(index, self._memory.name, self.use_pvs, tasks,
+                      self._results, self._stop_signal))
+            process.start()
+            self._task_queues.append(tasks)
+            self._processes.append(process)
+
+    def close(self):
+        '''Stops the worker processes and frees the shared table'''
+        if self._memory is None:
+            return
+        for tasks in self._task_queues:
+            tasks.put(None)
+        for process in self._processes:
+            process.join()
+        self._processes, self._task_queues = [], []
+        self._memory.close()
+        self._memory.unlink()
+        self._memory = None
+
+    def _abort(self):
+        '''Kills the worker processes and frees the shared table,
+        after one of the workers has died in the middle of a search'''
+        for process in self._processes:
+            process.terminate()
+            process.join()
+        self._processes, self._task_queues = [], []
+        self._memory.close()
+        self._memory.unlink()
+        self._memory = None
+
+    def _next_result(self):
+        '''Waits for the next result of a worker. Raises RuntimeError
+        if a worker has died, instead of waiting for it forever.'''
+        while True:
+            try:
+                return self._results.get(timeout=RESULT_WAIT_TIME)
+            except Empty:
+                if not all(process.is_alive()
+                           for process in self._processes):
+                    self._abort()
+                    raise RuntimeError('a Lazy SMP worker process died')
+
+    def search(self, board, depth, deadline=None):
+        '''
+        Searches the board up to a given depth, or until the deadline.
+        Raises RuntimeError if one of the workers dies during the search,
+        the next search starts new ones.
+
+        returns:
+        completed_depth: the depth of the deepest completed search
+        board evaluation from white's perspective: int
+        best_move: Move of the board
+        nodes: the number of nodes searched by all workers
+        '''
+        if self._memory is None:
+            self.start()
+        self.age = (self.age + 1) & AGE_MASK
+        self._stop_signal.clear()
+        encoded = encode_position(board)
+        for tasks in self._task_queues:
+            tasks.put((encoded, depth, deadline, self.age))
+        results = []
+        while len(results) < self.workers:
+            result = self._next_result()
+            results.append(result)
+            if result[1] >= depth:
+                self._stop_signal.set()
+        nodes = sum(result[4] for result in results)
+        #   the deepest result, from the worker with the lowest index
+        _, completed_depth, score, best_id, _ = max(
+            results, key=lambda result: (result[1], -result[0]))
+        best_move = next(move for move in board.all_possible_moves(board.turn)
+                         if move_id(move) == best_id)
+        return completed_depth, score, best_move, nodes
+
+
+def benchmark_boards(count, seed=0):
+    '''Returns the starting board and count - 1 boards after a few
+    random moves from it'''
+    rng = Random(seed)
+    boards = [Board()]
+    while len(boards) < count:
+        board = Board()
+        for _ in range(rng.randint(4, 12)):
+            board.handle_move(rng.choice(board.all_possible_moves(board.turn)))
+        if not board.is_game_over:
+            boards.append(board)
+    return boards
+
+
+def main(arguments=None):
+    '''Reports how long the search takes with each number of workers
+    and its speedup over the search with the first number given'''
+    parser = ArgumentParser(description=main.__doc__)
+    parser.add_argument('--depth', type=int, default=7)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=[1, 2, 4, 8, 16])
+    parser.add_argument('--positions', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--lazy-smp', action='store_true',
+                        help='search with LazySMPSearch')
+    arguments = parser.parse_args(arguments)
+
+    boards = benchmark_boards(arguments.positions, arguments.seed)
+    print(f'{"workers":>8}{"time [s]":>10}{"nodes":>10}{"speedup":>9}')
+    first_time = None
+    for workers in arguments.workers:
+        if arguments.lazy_smp:
+            search = LazySMPSearch(workers)
+        else:
+            search = ParallelSearch(workers)
+        search.start()
+        nodes = 0
+        start = perf_counter()
+        for board in boards:
+            #   the number of nodes is the last value of both results
+            nodes += search.search(board, arguments.depth)[-1]
+        elapsed = perf_counter() - start
+        search.close()
+        if first_time is None:
+            first_time = elapsed
+        print(f'{workers:>8}{elapsed:>10.2f}{nodes:>10}'
+              f'{first_time / elapsed:>9.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+from argparse import ArgumentParser
+from sys import exit
+from time import perf_counter
+from checkers.bitboard import (BitBoard, location_to_square,
+                               square_to_location)
+from checkers.constants import Color
+from checkers.piece_move_board import Board, Piece
+
+
+#   the numbers of leaves of the move tree of the starting position,
+#   by depth, as published for english draughts
+REFERENCE_COUNTS = {
+    1: 7,
+    2: 49,
+    3: 302,
+    4: 1469,
+    5: 7361,
+    6: 36768,
+    7: 179740,
+    8: 845931,
+    9: 3963680,
+    10: 18391564,
+}
+
+COLOR_LETTERS = {Color.WHITE: 'W', Color.BLACK: 'B'}
+
+
+def square_name(location):
+    '''Returns the number of a field in the notation of the positions
+    and moves, the square number of the bitboard module counted from 1'''
+    return str(location_to_square(location) + 1)
+
+
+def move_name(move):
+    '''Returns a move written like 22-18 or, for a capture, 26x17x10'''
+    separator = 'x' if move.attacking else '-'
+    return separator.join(square_name(location)
+                          for location in (move.old_cords,) + move.landings)
+
+
+def bit_move_name(move):
+    '''The move_name function for a BitMove'''
+    separator = 'x' if move.attacking else '-'
+    return separator.join(str(square + 1) for square in move.path)
+
+
+def format_position(board):
+    '''
+    Writes the position of a board in a FEN-like notation:
+    the player to move and the fields of the pieces of both colors,
+    kings marked with K, for example W:W21,22,K30:B1,2
+    '''
+    parts = [COLOR_LETTERS[board.turn]]
+    for color in Color:
+        parts.append(COLOR_LETTERS[color] + ','.join(
+            ('K' if piece.king else '') + square_name(piece.location)
+            for piece in sorted(board.pieces_by_colors[color],
+                                key=lambda piece: location_to_square(
+                                    piece.location))))
+    return ':'.join(parts)
+
+
+def parse_position(text):
+    '''Reverses format_position, returns a new Board.
+    Raises ValueError if the text is not a valid position.'''
+    colors = {letter: color for color, letter in COLOR_LETTERS.items()}
+    turn, *piece_lists = text.strip().split(':')
+    if turn not in colors or len(piece_lists) != 2:
+        raise ValueError(f'{text} is not a valid position')
+    pieces = []
+    squares = set()
+    for piece_list in piece_lists:
+        if piece_list[:1] not in colors:
+            raise ValueError(f'{text} is not a valid position')
+        color = colors[piece_list[0]]
+        for name in filter(None, piece_list[1:].split(',')):
+            king = name.startswith('K')
+            try:
+                square = int(name[1:] if king else name) - 1
+            except ValueError:
+                raise ValueError(f'{text} is not a valid position') from None
+            if not 0 <= square < 32 or square in squares:
+                raise ValueError(f'{text} is not a valid position')
+            squares.add(square)
+            piece = Piece(color, *square_to_location(square))
+            if king:
+                piece.promote()
+            pieces.append(piece)
+    board = Board()
+    board.setup_position(pieces, colors[turn])
+    return board
+
+
+def perft(board, depth):
+    '''Returns the number of leaves of the tree of legal moves of a given
+    depth growing from the board. The moves are made and taken back
+    on the board itself.'''
+    moves = board.all_possible_moves(board.turn)
+    if depth <= 1:
+        return len(moves) if depth == 1 else 1
+    nodes = 0
+    for move in moves:
+        record = board.make_move(move)
+        nodes += perft(board, depth - 1)
+        board.unmake_move(record)
+    return nodes
+
+
+def perft_bitboard(position, depth):
+    '''The perft function working on a BitBoard'''
+    moves = position.legal_moves()
+    if depth <= 1:
+        return len(moves) if depth == 1 else 1
+    return sum(perft_bitboard(position.apply(move), depth - 1)
+               for move in moves)
+
+
+def divide(board, depth):
+    '''Returns a list of (move, perft of the board after it) pairs for all
+    moves of the board, so two move generators can be compared move
+    by move'''
+    results = []
+    for move in board.all_possible_moves(board.turn):
+        record = board.make_move(move)
+        results.append((move, perft(board, depth - 1)))
+        board.unmake_move(record)
+    return results
+
+
+def divide_bitboard(position, depth):
+    '''The divide function working on a BitBoard'''
+    return [(move, perft_bitboard(position.apply(move), depth - 1))
+            for move in position.legal_moves()]
+
+
+def main(arguments=None):
+    '''Counts the leaves of the tree of legal moves of a position'''
+    parser = ArgumentParser(description=main.__doc__)
+    parser.add_argument('--depth', type=int, default=6)
+    parser.add_argument('--position',
+                        help='the position in the notation of '
+                        'format_position, by default the starting one')
+    parser.add_argument('--bitboard', action='store_true',
+                        help='count with the BitBoard move generator')
+    parser.add_argument('--divide', action='store_true',
+                        help='print the count of every move of the position')
+    arguments = parser.parse_args(arguments)
+    if arguments.position:
+        try:
+            board = parse_position(arguments.position)
+        except ValueError as error:
+            parser.error(str(error))
+    else:
+        board = Board()
+    print(format_position(board))
+
+    start = perf_counter()
+    if arguments.divide and arguments.depth > 0:
+        if arguments.bitboard:
+            results = [(bit_move_name(move), count) for move, count in
+                       divide_bitboard(BitBoard.from_board(board),
+                                       arguments.depth)]
+        else:
+            results = [(move_name(move), count) for move, count in
+                       divide(board, arguments.depth)]
+        nodes = 0
+        #   sorted, so the outputs of both generators can be diffed
+        for name, count in sorted(results):
+            print(f'{name}: {count}')
+            nodes += count
+    elif arguments.bitboard:
+        nodes = perft_bitboard(BitBoard.from_board(board), arguments.depth)
+    else:
+        nodes = perft(board, arguments.depth)
+    elapsed = perf_counter() - start
+    print(f'depth {arguments.depth}: {nodes} nodes in {elapsed:.2f} s '
+          f'({nodes / max(elapsed, 1e-9):.0f} nodes/s)')
+
+    if not arguments.position and arguments.depth in REFERENCE_COUNTS:
+        expected = REFERENCE_COUNTS[arguments.depth]
+        if nodes != expected:
+            print(f'wrong count, expected {expected}')
+            return 1
+        print('matches the reference count')
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
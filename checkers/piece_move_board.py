@@ -1,8 +1,13 @@
 from dataclasses import dataclass
 from typing import Tuple
 from checkers.field import Field
+from checkers.zobrist import piece_key, BLACK_TO_MOVE_KEY
+from checkers.evaluation import MAN_VALUE, KING_VALUE, positional_score
+from checkers.move_tables import (MOVE_TABLES, PLUS_PLUS, PLUS_MINUS,
+                                  MINUS_PLUS, MINUS_MINUS)
 from checkers.constants import (BEIGE, BROWN, FIELD_SIZE, NUM_OF_COLUMNS,
-                                NUM_OF_ROWS, Color, MAX_MOVES_WITHOUT_ATTACKS)
+                                NUM_OF_ROWS, Color, MAX_MOVES_WITHOUT_ATTACKS,
+                                DEBUG_MOVE_GENERATION)
 from copy import deepcopy
 
 
@@ -30,8 +35,10 @@ class Piece:
     type image_dict_int: str
     '''
 
+    __slots__ = ('_value', '_king', 'color', '_x', '_y', 'image_dict_ind')
+
     def __init__(self, color, x, y) -> None:
-        self._value = 3
+        self._value = MAN_VALUE
         self._king = False
         self.color = color
         self._x = x
@@ -48,19 +55,30 @@ class Piece:
         to the one representing the king
         '''
         self.king = True
-        self.value = 5
+        self.value = KING_VALUE
         if self.image_dict_ind == 'WP':
             self.image_dict_ind = 'WK'
         else:
             self.image_dict_ind = 'BK'
 
+    def demote(self):
+        '''Turns a king back into a regular piece, reversing promote'''
+        self.king = False
+        self.value = MAN_VALUE
+        if self.image_dict_ind == 'WK':
+            self.image_dict_ind = 'WP'
+        else:
+            self.image_dict_ind = 'BP'
+
     def eligible_for_promotion_after_move(self, move):
         '''Checks whether making the given move, the piece
         will land on the last rank, resulting in it being promoted to a king
         '''
-        new_y = move.new_cords[1]
-        if new_y in (0, NUM_OF_ROWS - 1) and not self.king:
-            return True
+        if self.king:
+            return False
+        for _, y in move.landings:
+            if y in (0, NUM_OF_ROWS - 1):
+                return True
         return False
 
     @property
@@ -79,198 +97,149 @@ class Piece:
     def can_move_plus_x(self, attack=False):
         '''Returns a boolean determining whether the piece
         has the space to move/attack onto a field with a higher x coordinate'''
-        if attack:
-            cols_where_cannot = [NUM_OF_COLUMNS - 2, NUM_OF_COLUMNS - 1]
-        else:
-            cols_where_cannot = [NUM_OF_COLUMNS - 1]
-        return self.x not in cols_where_cannot
+        return self.x < NUM_OF_COLUMNS - (2 if attack else 1)
 
     def can_move_minus_x(self, attack=False):
         '''Returns a boolean determining whether the piece
         has the space to move/attack onto a field with a lower x coordinate'''
-        if attack:
-            cols_where_cannot = [0, 1]
-        else:
-            cols_where_cannot = [0]
-        return self.x not in cols_where_cannot
+        return self.x >= (2 if attack else 1)
 
     def can_move_plus_y(self, attack=False):
         '''Returns a boolean determining whether the piece can move/attack
         onto a field with a higher y coordinate'''
         if self.move_constant == -1:
             return False
-        if attack:
-            rows_where_cannot = [NUM_OF_ROWS - 2, NUM_OF_ROWS - 1]
-        else:
-            rows_where_cannot = [NUM_OF_ROWS - 1]
-        return self.y not in rows_where_cannot
+        return self.y < NUM_OF_ROWS - (2 if attack else 1)
 
     def can_move_minus_y(self, attack=False):
         '''Returns a boolean determining whether the piece can move/attack
         onto a field with a lower y coordinate'''
         if self.move_constant == 1:
             return False
-        if attack:
-            rows_where_cannot = [0, 1]
-        else:
-            rows_where_cannot = [0]
-        return self.y not in rows_where_cannot
+        return self.y >= (2 if attack else 1)
+
+    @property
+    def move_table(self):
+        '''The precomputed steps and jumps the piece can make from its
+        field, see checkers.move_tables'''
+        return MOVE_TABLES[(self.color, self.king)][
+            self.x + NUM_OF_COLUMNS * self.y]
 
     def all_possible_non_attacking_moves(self):
         '''Returns the basic forward (and backward if it's a king) moves a
         piece could possibly make, not taking in consideration whether they're
         legal
         '''
-        moves = list()
-        x = self.x
-        y = self.y
-
-        if self.can_move_plus_x():
-            if self.can_move_plus_y():
-                moves.append(Move(False, (x, y), (x + 1, y + 1), self))
-            if self.can_move_minus_y():
-                moves.append(Move(False, (x, y), (x + 1, y - 1), self))
-        if self.can_move_minus_x():
-            if self.can_move_plus_y():
-                moves.append(Move(False, (x, y), (x - 1, y + 1), self))
-            if self.can_move_minus_y():
-                moves.append(Move(False, (x, y), (x - 1, y - 1), self))
-        return moves
+        location = self.location
+        return [Move(False, location, step, self)
+                for _, step, _, _, _ in self.move_table]
 
     def all_legal_non_attacking_moves(self, board: 'Board'):
-        '''Takes in the list of non attacking moves and Checks
-        whether they're legal
-        returns a list of legal moves
+        '''Returns a list of the non attacking moves of the piece
+        which lead onto an empty field
         '''
-        legal_moves = []
-        for move in self.all_possible_non_attacking_moves():
-            location_to_move = move.new_cords
-            field_to_move = board.get_field_by_location(location_to_move)
-            if not field_to_move.is_taken():
-                legal_moves.append(move)
-        return legal_moves
+        fields = board.one_dimensional_field_list
+        location = self.location
+        return [Move(False, location, step, self)
+                for _, step, step_index, _, _ in self.move_table
+                if fields[step_index].piece is None]
+
+    def _can_jump(self, fields, step_index, landing_index):
+        '''Checks whether there is an enemy piece on the step field
+        and the landing field behind it is empty'''
+        if landing_index < 0:
+            return False
+        attacked_piece = fields[step_index].piece
+        return (attacked_piece is not None
+                and attacked_piece.color != self.color
+                and fields[landing_index].piece is None)
+
+    def _can_attack(self, board: 'Board', direction):
+        '''Checks whether the piece can jump in a given direction'''
+        for entry_direction, _, step_index, _, landing_index in (
+                self.move_table):
+            if entry_direction == direction:
+                return self._can_jump(board.one_dimensional_field_list,
+                                      step_index, landing_index)
+        return False
 
     def can_attack_plus_plus(self, board: 'Board'):
         '''Checks whether it's possible to attack a field with coordinates
         (x+1, y+1). If an enemy piece is on the field and the field behind
         it is empty, returns True
         '''
-        if not (self.can_move_plus_x(attack=True)
-                and self.can_move_plus_y(attack=True)):
-            return False
-        else:
-            field_to_attack = board.get_field_by_location(
-                (self.x + 1, self.y + 1)
-            )
-            field_to_jump_to = board.get_field_by_location(
-                (self.x + 2, self.y + 2)
-            )
-            if not field_to_attack.is_taken():
-                return False
-            else:
-                if (field_to_attack.piece.color != self.color
-                        and not field_to_jump_to.is_taken()):
-                    return True
-                return False
+        return self._can_attack(board, PLUS_PLUS)
 
     def can_attack_plus_minus(self, board: 'Board'):
         '''Checks whether it's possible to attack a field with coordinates
         (x+1, y-1). If an enemy piece is on the field and the field behind
         it is empty, returns True
         '''
-        if not (self.can_move_plus_x(attack=True)
-                and self.can_move_minus_y(attack=True)):
-            return False
-        else:
-            field_to_attack = board.get_field_by_location(
-                (self.x + 1, self.y - 1)
-            )
-            field_to_jump_to = board.get_field_by_location(
-                (self.x + 2, self.y - 2)
-            )
-            if not field_to_attack.is_taken():
-                return False
-            else:
-                if (field_to_attack.piece.color != self.color
-                        and not field_to_jump_to.is_taken()):
-                    return True
-                return False
+        return self._can_attack(board, PLUS_MINUS)
 
     def can_attack_minus_plus(self, board: 'Board'):
         '''Checks whether it's possible to attack a field with coordinates
         (x-1, y+1). If an enemy piece is on the field and the field behind
         it is empty, returns True
         '''
-        if not (self.can_move_minus_x(attack=True)
-                and self.can_move_plus_y(attack=True)):
-            return False
-        else:
-            field_to_attack = board.get_field_by_location(
-                (self.x - 1, self.y + 1)
-            )
-            field_to_jump_to = board.get_field_by_location(
-                (self.x - 2, self.y + 2)
-            )
-            if not field_to_attack.is_taken():
-                return False
-            else:
-                if (field_to_attack.piece.color != self.color
-                        and not field_to_jump_to.is_taken()):
-                    return True
-                return False
+        return self._can_attack(board, MINUS_PLUS)
 
     def can_attack_minus_minus(self, board: 'Board'):
         '''Checks whether it's possible to attack a field with coordinates
         (x-1, y-1). If an enemy piece is on the field and the field behind
         it is empty, returns True
         '''
-        if not (self.can_move_minus_x(attack=True)
-                and self.can_move_minus_y(attack=True)):
-            return False
-        else:
-            field_to_attack = board.get_field_by_location(
-                (self.x - 1, self.y - 1)
-            )
-            field_to_jump_to = board.get_field_by_location(
-                (self.x - 2, self.y - 2)
-            )
-            if not field_to_attack.is_taken():
-                return False
-            else:
-                if (field_to_attack.piece.color != self.color
-                        and not field_to_jump_to.is_taken()):
-                    return True
-                return False
+        return self._can_attack(board, MINUS_MINUS)
 
     def all_legal_attacking_moves(self, board: 'Board'):
         '''
         Returns a list of legal attacking moves a piece can make on a given
-        board
+        board. Each of them is a whole sequence of jumps, which goes on
+        as long as the piece can jump over another enemy piece.
         '''
-        legal_moves = []
-        if self.can_attack_plus_plus(board):
-            legal_moves.append(
-                Move(True, self.location, (self.x + 2, self.y + 2), self))
-        if self.can_attack_minus_plus(board):
-            legal_moves.append(
-                Move(True, self.location, (self.x - 2, self.y + 2), self))
-        if self.can_attack_plus_minus(board):
-            legal_moves.append(
-                Move(True, self.location, (self.x + 2, self.y - 2), self))
-        if self.can_attack_minus_minus(board):
-            legal_moves.append(
-                Move(True, self.location, (self.x - 2, self.y - 2), self))
-        return legal_moves
+        moves = []
+        self._add_attack_sequences(
+            board.one_dimensional_field_list,
+            self.x + NUM_OF_COLUMNS * self.y, self.king, (), (), moves)
+        return moves
+
+    def _add_attack_sequences(self, fields, index, king, path, captured,
+                              moves):
+        '''Follows every jump the piece can make from the field with the
+        given index and appends the finished sequences to moves.
+        The jumped pieces count as taken off the board right away and
+        a piece reaching the last row jumps on as a king.'''
+        extended = False
+        for _, _, step_index, landing, landing_index in MOVE_TABLES[
+                (self.color, king)][index]:
+            if landing_index < 0:
+                continue
+            jumped_piece = fields[step_index].piece
+            if (jumped_piece is None or jumped_piece.color == self.color
+                    or jumped_piece in captured):
+                continue
+            landing_piece = fields[landing_index].piece
+            if (landing_piece is not None and landing_piece is not self
+                    and landing_piece not in captured):
+                continue
+            extended = True
+            self._add_attack_sequences(
+                fields, landing_index,
+                king or landing[1] in (0, NUM_OF_ROWS - 1),
+                path + (landing,), captured + (jumped_piece,), moves)
+        if not extended and captured:
+            moves.append(Move(True, self.location, path[-1], self,
+                              path, captured))
 
     def all_possible_legal_moves(self, board: 'Board'):
         '''Returns the list of potential legal moves a piece can make,
         taking into consideration the fact that if there are any possible
         attacks, they have to be executed first
         '''
-        if self.all_legal_attacking_moves(board):
-            return self.all_legal_attacking_moves(board)
-        else:
-            return self.all_legal_non_attacking_moves(board)
+        attacking_moves = self.all_legal_attacking_moves(board)
+        if attacking_moves:
+            return attacking_moves
+        return self.all_legal_non_attacking_moves(board)
 
     def location_to_draw(self):
         '''
@@ -343,11 +312,64 @@ class Move:
     type old_cords, new_cords: tuple
 
     param piece: the piece to be moved
-    type piece: Piece'''
+    type piece: Piece
+
+    param path: the locations the piece lands on after each jump of
+    an attacking move, the last one being new_cords. Empty for moves
+    making a single step or jump.
+    type path: tuple
+
+    param captured_pieces: the pieces jumped over, in the order of the jumps
+    type captured_pieces: tuple'''
     attacking: bool
     old_cords: Tuple[int, int]
     new_cords: Tuple[int, int]
     piece: Piece
+    path: Tuple[Tuple[int, int], ...] = ()
+    captured_pieces: Tuple[Piece, ...] = ()
+
+    @property
+    def landings(self):
+        '''The locations the piece lands on during the move'''
+        return self.path or (self.new_cords,)
+
+
+@dataclass(frozen=True)
+class MoveRecord:
+    '''
+    Class holding everything needed to take back a move made with
+    Board.make_move
+
+    param move: the move which was made
+    type move: Move
+
+    param captured_pieces: the pieces jumped over during the move
+    type captured_pieces: tuple
+
+    param captured_indices: the positions of the captured pieces in their
+    player's list of pieces
+    type captured_indices: tuple
+
+    param promoted: whether the moving piece got promoted
+    type promoted: bool
+
+    param turn, moves_without_attacks, is_game_over, moves_by_colors,
+    mandatory_attacks, piece_moves, zobrist_key, material, positional:
+    the values of the board attributes before the move
+    '''
+    move: Move
+    captured_pieces: Tuple[Piece, ...]
+    captured_indices: Tuple[int, ...]
+    promoted: bool
+    turn: Color
+    moves_without_attacks: int
+    is_game_over: bool
+    moves_by_colors: dict
+    mandatory_attacks: dict
+    piece_moves: dict
+    zobrist_key: int
+    material: dict
+    positional: dict
 
 
 class Board:
@@ -383,10 +405,30 @@ class Board:
     param mandatory_attacks: keeps the information whether a player of a
     certain color has to attack during this turn or not.
     type mandatory_attacks: dict
+
+    param debug_move_generation: if set, every incremental update of the
+    possible moves is checked against generating them from scratch
+    type debug_move_generation: bool
+
+    param zobrist_key: a 64-bit hash of the pieces on the board and the
+    player to move, updated with every change instead of recomputed
+    type zobrist_key: int
+
+    param ply: the number of moves made since the start of the game
+    or since the position was set up
+    type ply: int
+
+    param material, positional: map the colors onto the sums of the values
+    and the positional bonuses of the players' pieces, updated with every
+    change, so evaluating the board does not go through the pieces
+    type material, positional: dict
     '''
 
     def __init__(self) -> None:
+        self.debug_move_generation = DEBUG_MOVE_GENERATION
+        self._piece_moves = None
         self._fields = None
+        self._squares = None
         self._setup_fields()
         self._setup_pieces()
         self.pieces_by_colors = dict()
@@ -400,24 +442,30 @@ class Board:
             Color.WHITE: False,
             Color.BLACK: False
         }
+        self.zobrist_key = self.compute_zobrist_key()
+        self.ply = 0
+        self.material, self.positional = self.compute_scores()
 
     def get_field_by_location(self, location) -> 'Field':
-        '''Returns the field object at the given x, y location'''
-        for field in self.one_dimensional_field_list:
-            if field.location == location:
-                return field
+        '''Returns the field object at the given x, y location
+        or None if the location is outside of the board'''
+        x, y = location
+        if 0 <= x < NUM_OF_COLUMNS and 0 <= y < NUM_OF_ROWS:
+            return self._squares[x + NUM_OF_COLUMNS * y]
+        return None
 
     def _setup_fields(self):
         '''Fills the fields parameter with a correct setting of fields
         on a chessboard.
         '''
-        self.fields = [[] for i in range(8)]
-        for i in range(8):
-            for j in range(8):
+        fields = [[] for i in range(NUM_OF_COLUMNS)]
+        for i in range(NUM_OF_COLUMNS):
+            for j in range(NUM_OF_ROWS):
                 if (i + j) % 2 == 0:
-                    self.fields[i].append(Field(BEIGE, i, j))
+                    fields[i].append(Field(BEIGE, i, j))
                 else:
-                    self.fields[i].append(Field(BROWN, i, j))
+                    fields[i].append(Field(BROWN, i, j))
+        self.fields = fields
 
     def _setup_pieces(self):
         '''Sets up the pieces at the beginning of a game to their
@@ -436,6 +484,40 @@ class Board:
                     piece = Piece(Color.WHITE, j, i)
                     current_field.piece = piece
 
+    def setup_position(self, pieces, turn):
+        '''Replaces the pieces on the board with the given ones and sets
+        the player to move, so a game can be continued from any position'''
+        for field in self.one_dimensional_field_list:
+            field.piece = None
+        for piece in pieces:
+            self.get_field_by_location(piece.location).piece = piece
+        self.setup_pieces_by_colors()
+        self.turn = turn
+        self.update_possible_moves_by_colors()
+        self.moves_without_attacks = 0
+        self.is_game_over = not self.player_has_moving_options(turn)
+        self.zobrist_key = self.compute_zobrist_key()
+        self.ply = 0
+        self.material, self.positional = self.compute_scores()
+
+    def compute_zobrist_key(self):
+        '''Computes the Zobrist key of the position from scratch'''
+        key = BLACK_TO_MOVE_KEY if self.turn == Color.BLACK else 0
+        for pieces in self.pieces_by_colors.values():
+            for piece in pieces:
+                key ^= piece_key(piece)
+        return key
+
+    def compute_scores(self):
+        '''Computes the material and positional dictionaries from scratch'''
+        material = {color: 0 for color in Color}
+        positional = {color: 0 for color in Color}
+        for color, pieces in self.pieces_by_colors.items():
+            for piece in pieces:
+                material[color] += piece.value
+                positional[color] += positional_score(piece)
+        return material, positional
+
     @property
     def fields(self):
         '''Getter for the fields parameter'''
@@ -443,8 +525,14 @@ class Board:
 
     @fields.setter
     def fields(self, new_fields):
-        '''Setter for the fields parameter'''
+        '''Setter for the fields parameter, it also fills the flat list
+        of fields indexed by x + NUM_OF_COLUMNS * y'''
         self._fields = new_fields
+        squares = [None] * (NUM_OF_COLUMNS * NUM_OF_ROWS)
+        for column in new_fields:
+            for field in column:
+                squares[field.x + NUM_OF_COLUMNS * field.y] = field
+        self._squares = squares
 
     @property
     def mandatory_attacks(self):
@@ -458,21 +546,26 @@ class Board:
         '''
         Remove a given piece from the board when it's jumped over.
         '''
+        self._remove_piece(piece)
+        self._update_moves_around([piece.location], [piece])
+
+    def _remove_piece(self, piece):
+        '''Takes the piece off its field and out of the list of pieces,
+        leaving moves_by_colors untouched'''
         piece_field = self.get_field_by_location(piece.location)
         piece_field.piece = None
         self.pieces_by_colors[piece.color].remove(piece)
-        del self.moves_by_colors[piece.color][piece]
+        self.zobrist_key ^= piece_key(piece)
+        self.material[piece.color] -= piece.value
+        self.positional[piece.color] -= positional_score(piece)
 
     @property
     def one_dimensional_field_list(self):
         '''Returns the fields of the board in a list with length of 64
         so in most cases one for loop is used instead of 2 when iterating
-        over them.'''
-        field_list = list()
-        for row in self.fields:
-            for field in row:
-                field_list.append(field)
-        return field_list
+        over them. The field at (x, y) has the index x + 8 * y.
+        The list is shared with the board and should not be modified.'''
+        return self._squares
 
     @property
     def moves_without_attacks(self):
@@ -506,54 +599,101 @@ class Board:
 
     def update_possible_moves_by_colors(self):
         '''Updates the possible_moves_by_colors parameter to reflect the
-        current state of the board.
+        current state of the board, generating the moves of every piece
+        from scratch.
         '''
-        moves_by_colors = {
-            Color.WHITE: {},
-            Color.BLACK: {}
+        self._set_piece_moves(self._generate_piece_moves())
+
+    def _generate_piece_moves(self):
+        '''Returns a dictionary mapping each color to a dictionary with
+        the moves of its pieces, regardless of the moves of other pieces'''
+        return {
+            color: {piece: piece.all_possible_legal_moves(self)
+                    for piece in pieces}
+            for color, pieces in self.pieces_by_colors.items()
         }
 
-        new_mandatory_attacks = {
-            Color.WHITE: False,
-            Color.BLACK: False
-        }
-
-        for piece in self.all_white_pieces():
-            moves_by_colors[Color.WHITE][piece] = (piece.
-                                                   all_possible_legal_moves(
-                                                       self))
-            if not all([not move.attacking
-                        for move in moves_by_colors[Color.WHITE][piece]]):
-                new_mandatory_attacks[Color.WHITE] = True
-
-        for piece in self.all_black_pieces():
-            moves_by_colors[Color.BLACK][piece] = (piece.
-                                                   all_possible_legal_moves(
-                                                       self))
-            if not all([not move.attacking
-                        for move in moves_by_colors[Color.BLACK][piece]]):
-                new_mandatory_attacks[Color.BLACK] = True
-
-        self.mandatory_attacks = new_mandatory_attacks
-
-        if self.mandatory_attacks[Color.WHITE]:
-            for piece in self.all_white_pieces():
-                moves_by_colors[Color.WHITE][piece] = list(
-                    filter(lambda x: x.attacking,
-                           moves_by_colors[Color.WHITE][piece]))
-
-        if self.mandatory_attacks[Color.BLACK]:
-            for piece in self.all_black_pieces():
-                moves_by_colors[Color.BLACK][piece] = list(
-                    filter(lambda x: x.attacking,
-                           moves_by_colors[Color.BLACK][piece]))
-
-        self.moves_by_colors = moves_by_colors
+    @staticmethod
+    def _moves_by_colors_from_piece_moves(piece_moves):
+        '''Filters the moves of every piece, so that if a player can attack
+        with any piece, only the attacks are kept.
+        Returns the moves_by_colors and mandatory_attacks dictionaries'''
+        moves_by_colors = dict()
+        mandatory_attacks = dict()
+        for color, moves_of_pieces in piece_moves.items():
+            #   a piece which can attack has nothing but attacks on its list
+            mandatory_attacks[color] = any(
+                moves and moves[0].attacking
+                for moves in moves_of_pieces.values())
+            if mandatory_attacks[color]:
+                moves_by_colors[color] = {
+                    piece: moves if moves and moves[0].attacking else []
+                    for piece, moves in moves_of_pieces.items()
+                }
+            else:
+                moves_by_colors[color] = dict(moves_of_pieces)
+        return moves_by_colors, mandatory_attacks
+
+    def _set_piece_moves(self, piece_moves):
+        '''Stores the moves of the pieces and updates moves_by_colors
+        and mandatory_attacks to match them'''
+        self._piece_moves = piece_moves
+        (self.moves_by_colors,
+         self.mandatory_attacks) = self._moves_by_colors_from_piece_moves(
+            piece_moves)
+
+    def _update_moves_around(self, locations, removed_pieces=()):
+        '''Updates the possible moves after the pieces on the given
+        locations changed. Only the pieces within jump distance of those
+        locations can get a first jump or step they didn't have, so only
+        they and the pieces which could already attack (their sequences
+        of jumps may go anywhere) get their moves generated again.
+        The dictionaries are copied rather than modified, so the ones
+        saved in a MoveRecord stay valid.'''
+        piece_moves = {color: dict(moves_of_pieces)
+                       for color, moves_of_pieces in self._piece_moves.items()}
+        for removed_piece in removed_pieces:
+            piece_moves[removed_piece.color].pop(removed_piece, None)
+        updated_pieces = set()
+        for moves_of_pieces in piece_moves.values():
+            for piece, moves in moves_of_pieces.items():
+                if moves and moves[0].attacking:
+                    updated_pieces.add(piece)
+                    moves_of_pieces[piece] = (
+                        piece.all_possible_legal_moves(self))
+        for x, y in locations:
+            for dx in range(-2, 3):
+                for dy in range(-2, 3):
+                    #   pieces only stand on fields of the same color
+                    if (dx + dy) % 2:
+                        continue
+                    field = self.get_field_by_location((x + dx, y + dy))
+                    if field is None or field.piece is None:
+                        continue
+                    piece = field.piece
+                    if piece not in updated_pieces:
+                        updated_pieces.add(piece)
+                        piece_moves[piece.color][piece] = (
+                            piece.all_possible_legal_moves(self))
+        self._set_piece_moves(piece_moves)
+        if self.debug_move_generation:
+            self._check_moves_by_colors()
+
+    def _check_moves_by_colors(self):
+        '''Raises an AssertionError if the incrementally updated moves
+        differ from the ones generated from scratch'''
+        expected_moves, expected_attacks = (
+            self._moves_by_colors_from_piece_moves(
+                self._generate_piece_moves()))
+        if (self.moves_by_colors != expected_moves
+                or self.mandatory_attacks != expected_attacks):
+            raise AssertionError(
+                'Incrementally updated moves differ from generating them '
+                f'from scratch: {self.moves_by_colors} != {expected_moves}')
 
     def feasible_locations_and_moves_for_piece(self, piece):
         '''Returns the locations and moves a piece can
         move to in the current round'''
-        self.update_possible_moves_by_colors()
         moves = self.moves_by_colors[piece.color][piece]
         locations = [move.new_cords for move in moves]
         return locations, moves
@@ -561,10 +701,24 @@ class Board:
     def update_piece_location(self, piece, move):
         '''Moves the given piece by a given move inside of its and the fields'
         parameters'''
+        self.zobrist_key ^= piece_key(piece)
+        self.positional[piece.color] -= positional_score(piece)
         piece.x, piece.y = move.new_cords
+        self.zobrist_key ^= piece_key(piece)
+        self.positional[piece.color] += positional_score(piece)
         self.get_field_by_location(move.old_cords).piece = None
         self.get_field_by_location(move.new_cords).piece = piece
 
+    def promote(self, piece):
+        '''Promotes a piece standing on the board to a king'''
+        self.zobrist_key ^= piece_key(piece)
+        self.material[piece.color] -= piece.value
+        self.positional[piece.color] -= positional_score(piece)
+        piece.promote()
+        self.zobrist_key ^= piece_key(piece)
+        self.material[piece.color] += piece.value
+        self.positional[piece.color] += positional_score(piece)
+
     def can_piece_move(self, piece):
         '''Determines whether a piece can be moved during a player's turn
         If the piece can't attack and another one of its color can,
@@ -576,7 +730,10 @@ class Board:
 
     def get_jumped_piece(self, move):
         '''Returns a piece that gets jumped over during the given move
-        so it can be removed'''
+        so it can be removed. For a sequence of jumps it's the first
+        jumped piece.'''
+        if move.captured_pieces:
+            return move.captured_pieces[0]
         old_x, old_y = move.old_cords
         next_x, next_y = move.new_cords
         jumped_x, jumped_y = int(
@@ -591,30 +748,42 @@ class Board:
         self.update_piece_location(moving_piece, move)
         if (moving_piece.eligible_for_promotion_after_move(move)
                 and not moving_piece.king):
-            moving_piece.promote()
+            self.promote(moving_piece)
         self.change_turn()
-        self.update_possible_moves_by_colors()
+        self._update_moves_around([move.old_cords, move.new_cords])
         self.moves_without_attacks += 1
+        self.ply += 1
         if (not self.player_has_moving_options(self.turn)
                 or self.moves_without_attacks >= MAX_MOVES_WITHOUT_ATTACKS):
             self.is_game_over = True
 
+    def captured_pieces(self, move):
+        '''Returns the pieces jumped over during an attacking move'''
+        return move.captured_pieces or (self.get_jumped_piece(move),)
+
     def handle_attacking_move(self, move):
-        '''Handles an attacking move and its consequences including promotion,
-        changing the turn etc.'''
+        '''Handles an attacking move - a whole sequence of jumps - and its
+        consequences including promotion, changing the turn etc.'''
         moving_piece = move.piece
-        jumped_piece = self.get_jumped_piece(move)
-        self.delete_piece(jumped_piece)
+        jumped_pieces = self.captured_pieces(move)
+        #   moves_by_colors gets rebuilt below, the old dictionaries
+        #   are left as they were so unmake_move can bring them back
+        for jumped_piece in jumped_pieces:
+            self._remove_piece(jumped_piece)
         self.update_piece_location(moving_piece, move)
         if (moving_piece.eligible_for_promotion_after_move(move)
                 and not moving_piece.king):
-            moving_piece.promote()
-        self.update_possible_moves_by_colors()
-        self.moves_without_attacks += 1
-        if not moving_piece.all_legal_attacking_moves(self):
-            self.change_turn()
-            if not self.player_has_moving_options(self.turn):
-                self.is_game_over = True
+            self.promote(moving_piece)
+        self.change_turn()
+        self._update_moves_around(
+            (move.old_cords,) + move.landings
+            + tuple(piece.location for piece in jumped_pieces),
+            jumped_pieces)
+        #   a capture starts the count towards a draw anew
+        self.moves_without_attacks = 0
+        self.ply += 1
+        if not self.player_has_moving_options(self.turn):
+            self.is_game_over = True
 
     def handle_move(self, move):
         '''Compiles handle_attacking and passive move methods into one to
@@ -624,6 +793,100 @@ class Board:
         else:
             self.handle_passive_move(move)
 
+    def make_move(self, move):
+        '''Makes the move on this board and returns a MoveRecord
+        which unmake_move uses to restore the previous position'''
+        captured_pieces = ()
+        captured_indices = ()
+        if move.attacking:
+            captured_pieces = self.captured_pieces(move)
+            enemy_pieces = self.pieces_by_colors[captured_pieces[0].color]
+            captured_indices = tuple(enemy_pieces.index(piece)
+                                     for piece in captured_pieces)
+        record = MoveRecord(
+            move, captured_pieces, captured_indices,
+            move.piece.eligible_for_promotion_after_move(move),
+            self.turn, self.moves_without_attacks, self.is_game_over,
+            self.moves_by_colors, self.mandatory_attacks, self._piece_moves,
+            self.zobrist_key, self.material, self.positional)
+        #   the dictionaries in the record have to stay as they are
+        self.material = dict(self.material)
+        self.positional = dict(self.positional)
+        self.handle_move(move)
+        return record
+
+    def unmake_move(self, record):
+        '''Takes back the move described by the record, the move
+        has to be the last one made on the board'''
+        move = record.move
+        moving_piece = move.piece
+        moving_piece.x, moving_piece.y = move.old_cords
+        self.get_field_by_location(move.new_cords).piece = None
+        self.get_field_by_location(move.old_cords).piece = moving_piece
+        if record.promoted:
+            moving_piece.demote()
+        #   inserting the pieces in the order of their original indices
+        #   puts every one of them back in its place in the list
+        for captured_index, captured_piece in sorted(
+                zip(record.captured_indices, record.captured_pieces),
+                key=lambda index_and_piece: index_and_piece[0]):
+            self.get_field_by_location(
+                captured_piece.location).piece = captured_piece
+            self.pieces_by_colors[captured_piece.color].insert(
+                captured_index, captured_piece)
+        self.turn = record.turn
+        self.moves_without_attacks = record.moves_without_attacks
+        self.is_game_over = record.is_game_over
+        self.moves_by_colors = record.moves_by_colors
+        self.mandatory_attacks = record.mandatory_attacks
+        self._piece_moves = record.piece_moves
+        self.zobrist_key = record.zobrist_key
+        self.material = record.material
+        self.positional = record.positional
+        self.ply -= 1
+
+    def all_possible_moves(self, color_to_move):
+        '''Returns a list of all moves a player with a given color
+        can make'''
+        return [move for moves in self.moves_by_colors[color_to_move].values()
+                for move in moves]
+
+    def staged_moves(self, color_to_move):
+        '''Generator of the moves of a player with a given color - all
+        attacking moves come first, then the passive ones'''
+        moves_by_pieces = self.moves_by_colors[color_to_move]
+        for moves in moves_by_pieces.values():
+            for move in moves:
+                if move.attacking:
+                    yield move
+        if self.mandatory_attacks[color_to_move]:
+            return
+        for moves in moves_by_pieces.values():
+            for move in moves:
+                if not move.attacking:
+                    yield move
+
+    def iter_children(self, moves=None):
+        '''
+        Generator going through the child positions of the current one
+        on this very board. Each move is made right before it's yielded
+        and taken back when the next one is requested, so only one child
+        exists at a time. The generator has to be exhausted or closed for
+        the last move to be taken back.
+
+        param moves: the moves to make, in order. By default the
+        staged_moves of the player to move.
+        type moves: iterable of Move
+        '''
+        if moves is None:
+            moves = self.staged_moves(self.turn)
+        for move in moves:
+            record = self.make_move(move)
+            try:
+                yield move
+            finally:
+                self.unmake_move(record)
+
     def all_possible_children_boards(self, color_to_move):
         '''Returns all possible boards that could derive from the possible
         moves of a player with a given color
@@ -634,8 +897,13 @@ class Board:
                 temp_board = deepcopy(self)
                 temp_piece = temp_board.get_field_by_location(
                     (piece.x, piece.y)).piece
+                temp_captured_pieces = tuple(
+                    temp_board.get_field_by_location(
+                        captured_piece.location).piece
+                    for captured_piece in move.captured_pieces)
                 temp_move = Move(move.attacking, move.old_cords,
-                                 move.new_cords, temp_piece)
+                                 move.new_cords, temp_piece, move.path,
+                                 temp_captured_pieces)
                 temp_board.handle_move(temp_move)
                 possible_boards.append((temp_board, move))
         return possible_boards
@@ -643,7 +911,9 @@ class Board:
     def evaluate_position(self):
         '''Evaluates the current situation on the board
         Positive evaluation means white has the edge, negative means
-        black does. 0 Means the position is even.'''
+        black does. 0 Means the position is even. It is the difference
+        of the players' material and positional bonuses, which are kept
+        up to date by the board, so it takes constant time.'''
         if self.is_game_over:
             if self.winner() == Color.WHITE:
                 return float('inf')
@@ -652,13 +922,9 @@ class Board:
             else:
                 return 0
         else:
-            evaluation = 0
-            sum_of_white_pieces = sum(
-                piece.value for piece in self.all_white_pieces())
-            sum_of_black_pieces = sum(
-                piece.value for piece in self.all_black_pieces())
-            evaluation += (sum_of_white_pieces - sum_of_black_pieces)
-            return evaluation
+            return (self.material[Color.WHITE] - self.material[Color.BLACK]
+                    + self.positional[Color.WHITE]
+                    - self.positional[Color.BLACK])
 
     def player_has_moving_options(self, color):
         '''Checks whether a player with a given color has any possible
@@ -673,6 +939,7 @@ class Board:
     def change_turn(self):
         '''Changes the turn parameter to the opposite color'''
         self.turn = Color.WHITE if self.turn == Color.BLACK else Color.BLACK
+        self.zobrist_key ^= BLACK_TO_MOVE_KEY
 
     def winner(self):
         '''Returns which player won the game or None if it's a tie'''
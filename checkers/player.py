@@ -1,7 +1,22 @@
+from os.path import exists
 from random import randint, shuffle
 from checkers.piece_move_board import Piece, Board
+from checkers.bitboard import BitBoard, square_to_location
+from checkers.batch_evaluation import evaluate_positions, numpy_available
 from typing import List
-from checkers.constants import FIELD_SIZE, Color
+from checkers.constants import (FIELD_SIZE, Color, TT_SIZE_MB,
+                                NODES_BETWEEN_TIME_CHECKS, ASPIRATION_WINDOW,
+                                QUIESCENCE_MAX_DEPTH, SEARCH_WORKERS,
+                                LAZY_SMP, BOOK_DEPTH, TABLEBASE_WIN_SCORE,
+                                BATCH_FRONTIER, STATS_LOG_PATH)
+from checkers.transposition import (TranspositionTable, EXACT, LOWER_BOUND,
+                                    UPPER_BOUND, move_key, find_move)
+from checkers.move_ordering import MoveOrdering
+from checkers.book import OpeningBook
+from checkers.tablebase import Tablebase, WIN, LOSS
+from checkers.search_stats import SearchStats
+from checkers.perft import move_name
+from threading import Event, Thread, Timer
 from time import time
 
 
@@ -55,6 +70,20 @@ class RandomBot(Bot):
         click_location = self.map_field_cords_to_pixels(field_to_move_cords)
         return click_location
 
+    def choose_move(self, board):
+        '''Returns a random move of the board, chosen the same way as
+        with the clicks: first a piece which can move, then its move'''
+        moves_by_pieces = board.moves_by_colors[board.turn]
+        movable_pieces = [piece for piece in board.pieces_by_colors[
+            board.turn] if moves_by_pieces.get(piece)]
+        piece = movable_pieces[randint(0, len(movable_pieces) - 1)]
+        moves = moves_by_pieces[piece]
+        return moves[randint(0, len(moves) - 1)]
+
+
+class SearchTimeout(Exception):
+    '''Raised inside of the search when the bot's time limit runs out'''
+
 
 class MinimaxBot(Bot):
     '''
@@ -66,15 +95,161 @@ class MinimaxBot(Bot):
 
     param depth: the depth of the evaluating algorithm
     type depth: int in range(1, 11)
+
+    param use_bitboard: whether the search should run on a BitBoard
+    instead of the Board objects
+    type use_bitboard: bool
+
+    param batch_frontier: whether the bitboard search should evaluate
+    the leaves of every position one move away from them all at once
+    with evaluate_positions. It only does if numpy is installed.
+    type batch_frontier: bool
+
+    param use_pvs: whether the Board objects should be searched with
+    the principal variation search instead of the plain minimax
+    type use_pvs: bool
+
+    param parallel_search: searches the moves of the board on a pool of
+    processes, None if the bot searches with one process only
+    type parallel_search: ParallelSearch or None
+
+    param lazy_smp: searches the board with many processes at once,
+    sharing one transposition table, if the bot was created with
+    lazy_smp and more than one worker. Replaces the parallel_search then.
+    type lazy_smp: LazySMPSearch or None
+
+    param opening_book: the book the moves are taken from, instead of
+    searching, for the first book_depth moves of the game. None if
+    no book_path was given or the file does not exist.
+    type opening_book: OpeningBook or None
+
+    param book_depth: for how many moves from the start of the game
+    the opening book is used
+    type book_depth: int
+
+    param tablebase: the solved endgame positions, probed instead of
+    searching them. None if no tablebase_path was given or the file
+    does not exist.
+    type tablebase: Tablebase or None
+
+    param tablebase_hits: the number of positions found in the tablebase
+    since the start of the last make_move
+    type tablebase_hits: int
+
+    param stop_signal: the search is interrupted when it is set
+    type stop_signal: object with an is_set method, like threading.Event,
+    or None
+
+    param transposition_table: the results of earlier searches, kept
+    between the moves of a game. None if tt_size_mb is 0 or the bot
+    searches with many processes, which use tables of their own.
+    type transposition_table: TranspositionTable or None
+
+    param move_ordering: decides in which order the moves are searched
+    type move_ordering: MoveOrdering
+
+    param nodes: the number of positions visited by minimax since the
+    start of the last make_move
+    type nodes: int
+
+    param quiescence_nodes: the number of positions visited past the depth
+    of the search since the start of the last make_move
+    type quiescence_nodes: int
+
+    param leaf_evaluations: the number of positions evaluated since
+    the start of the last make_move
+    type leaf_evaluations: int
+
+    param max_depth: the most moves from the root of the search any
+    position evaluated since the start of the last make_move was
+    type max_depth: int
+
+    param iterations: (depth, seconds, nodes) of every iteration completed
+    by the last iterative_deepening
+    type iterations: list
+
+    param stats: the statistics of the last move made by make_move
+    type stats: SearchStats or None
+
+    param stats_log: the path of the JSONL file the statistics of every
+    move are appended to, None if they are not saved
+    type stats_log: str or None
+
+    param principal_variation: the moves both sides are expected to make,
+    found by the last completed iteration of iterative_deepening
+    type principal_variation: list
+
+    param completed_depth: the depth of the last completed iteration
+    type completed_depth: int
+
+    param score: the evaluation of the board found by the last search,
+    from white's perspective like evaluate_position
+    type score: int or float
     '''
 
-    def __init__(self, color, depth, time_limit) -> None:
+    def __init__(self, color, depth, time_limit, use_bitboard=False,
+                 tt_size_mb=TT_SIZE_MB, use_pvs=True,
+                 workers=SEARCH_WORKERS, lazy_smp=LAZY_SMP,
+                 book_path=None, book_depth=BOOK_DEPTH,
+                 tablebase_path=None,
+                 batch_frontier=BATCH_FRONTIER,
+                 stats_log=STATS_LOG_PATH) -> None:
         super().__init__(color, ai=True)
         self._depth = depth
         self._time_limit = time_limit
+        self.use_bitboard = use_bitboard
+        self.batch_frontier = batch_frontier
+        self.use_pvs = use_pvs
+        self.transposition_table = None
+        self.move_ordering = MoveOrdering()
+        self.parallel_search = None
+        self.lazy_smp = None
+        if workers > 1 and not use_bitboard:
+            # imported here, the parallel module imports this one
+            from checkers.parallel import ParallelSearch, LazySMPSearch
+            if lazy_smp:
+                self.lazy_smp = LazySMPSearch(workers, use_pvs, tt_size_mb)
+            else:
+                self.parallel_search = ParallelSearch(workers, use_pvs,
+                                                      tt_size_mb)
+        elif tt_size_mb:
+            #   the parallel searches use the tables of their workers
+            self.transposition_table = TranspositionTable(tt_size_mb)
+        self.opening_book = None
+        if book_path is not None and exists(book_path):
+            self.opening_book = OpeningBook(book_path)
+        self.book_depth = book_depth
+        self.tablebase = None
+        if tablebase_path is not None and exists(tablebase_path):
+            self.tablebase = Tablebase(tablebase_path)
+        self.tablebase_hits = 0
+        self.stop_signal = None
+        #   the background search of the board after the predicted
+        #   reply of the opponent and its result
+        self._ponder_thread = None
+        self._ponder_board = None
+        self._ponder_key = None
+        self._ponder_move = None
+        self.nodes = 0
+        self.quiescence_nodes = 0
+        self.leaf_evaluations = 0
+        self.max_depth = 0
+        self.iterations = []
+        self.stats = None
+        self.stats_log = stats_log
+        self.principal_variation = []
+        self.completed_depth = 0
+        self.score = None
+        #   the time at which the search has to stop, None if it has not
+        self._deadline = None
+        #   the ply of the board the search started from
+        self._root_ply = 0
+        #   the ply of the node the principal variation leads to,
+        #   -1 if the searched line has already left it
+        self._pv_ply = -1
 
     def minimax(self, board: 'Board', depth, alpha=float('-inf'),
-                beta=float('inf'), original_move=None):
+                beta=float('inf'), original_move=None, ply=0):
         '''
         The function used to determine which move is the best for the bot
         param: type
@@ -83,68 +258,554 @@ class MinimaxBot(Bot):
         alpha: float
         beta: float
         original_move: Move or None by default in the first call made
+        ply: int - how many moves away from the root the board is
 
         returns:
         board evaluation: int
         best_move/original_move: Move
         '''
+        self._count_node()
         maximizing_player = self.minimizing_or_maximizing(board.turn)
 
+        if original_move is not None and not board.is_game_over:
+            score = self.probe_tablebase(board)
+            if score is not None:
+                return (score if maximizing_player else -score,
+                        original_move)
+
         if depth == 0 or board.is_game_over:
-            return (board.evaluate_position(), original_move)
+            return (self.quiescence(board, alpha, beta), original_move)
+
+        possible_moves = list(board.staged_moves(board.turn))
+        #   a forced move is made without searching it, but only at the root
+        #   - deeper in the tree the line is searched to the full depth
+        if len(possible_moves) == 1 and original_move is None:
+            only_move = possible_moves[0]
+            record = board.make_move(only_move)
+            try:
+                evaluation = self.quiescence(board)
+            finally:
+                board.unmake_move(record)
+            return evaluation, only_move
+
+        if not maximizing_player:
+            shuffle(possible_moves)
+            #   to make the game non deterministic in positions with
+            #   no clear winning/advantageous move
 
+        table = self.transposition_table
+        table_move_key = 0
+        if table is not None:
+            entry = table.probe(board.zobrist_key)
+            if entry is not None:
+                entry_depth, bound, score, table_move_key = entry
+                #   the root has to be searched to return one of its moves
+                if entry_depth >= depth and original_move is not None:
+                    if (bound == EXACT
+                            or (bound == LOWER_BOUND and score >= beta)
+                            or (bound == UPPER_BOUND and score <= alpha)):
+                        return score, original_move
+        pv_move, pv_move_key = None, 0
+        if self._pv_ply == ply and ply < len(self.principal_variation):
+            pv_move_key = move_key(self.principal_variation[ply])
+            pv_move = find_move(possible_moves, pv_move_key)
+        possible_moves = self.move_ordering.order(
+            possible_moves, ply, table_move_key, pv_move_key)
+        original_alpha, original_beta = alpha, beta
+
+        #   the children are made on this very board one at a time,
+        #   so memory use only grows with the depth of the search
+        best_eval = float('-inf') if maximizing_player else float('inf')
         best_move = None
-        if maximizing_player:
-            max_eval = (float('-inf'), None)
-            possible_children = board.all_possible_children_boards(board.turn)
-            if len(possible_children) == 1:
-                only_child = possible_children[0]
-                only_board = only_child[0]
-                only_move = only_child[1]
-                return only_board.evaluate_position(), only_move
-
-            else:
-                for position, move in possible_children:
-                    evaluation = self.minimax(
-                        position, depth - 1, alpha, beta, move)
-                    if evaluation[0] == max_eval[0] and best_move is None:
-                        max_eval = evaluation
-                        best_move = move
-                    elif evaluation[0] > max_eval[0]:
-                        max_eval = evaluation
-                        best_move = move
+        children = board.iter_children(possible_moves)
+        try:
+            for move_number, move in enumerate(children):
+                self._pv_ply = ply + 1 if move is pv_move else -1
+                evaluation = self.minimax(board, depth - 1, alpha, beta,
+                                          move, ply + 1)
+                if maximizing_player:
+                    if evaluation[0] > best_eval or best_move is None:
+                        best_eval, best_move = evaluation[0], move
                     alpha = max(alpha, evaluation[0])
-                    if beta <= alpha:
-                        break
+                else:
+                    if evaluation[0] < best_eval or best_move is None:
+                        best_eval, best_move = evaluation[0], move
+                    beta = min(beta, evaluation[0])
+                if beta <= alpha:
+                    self.move_ordering.record_cutoff(
+                        move, ply, depth, move_number)
+                    break
+        finally:
+            #   takes back the last move made by the generator
+            children.close()
+
+        if table is not None:
+            if best_eval <= original_alpha:
+                bound = UPPER_BOUND
+            elif best_eval >= original_beta:
+                bound = LOWER_BOUND
+            else:
+                bound = EXACT
+            table.store(board.zobrist_key, depth, bound, best_eval,
+                        move_key(best_move))
+        return best_eval, best_move
+
+    def negamax(self, board: 'Board', depth, alpha=float('-inf'),
+                beta=float('inf'), ply=0):
+        '''
+        The principal variation search in the negamax form: the evaluations
+        are always from the perspective of the player to move, so one
+        branch serves both of them. The first child is searched with
+        the whole window and the others with a null window, only proving
+        that they are not better - the ones which turn out better
+        are searched again with the whole window.
+        param: type
+        board: Board
+        depth: int
+        alpha: float
+        beta: float
+        ply: int - how many moves away from the root the board is
 
-                return max_eval[0], best_move
+        returns:
+        board evaluation for the player to move: int
+        best_move: Move or None if the position is a leaf
+        '''
+        self._count_node()
+        sign = 1 if board.turn == Color.WHITE else -1
 
-        else:
-            min_eval = (float('inf'), None)
-            possible_children = board.all_possible_children_boards(board.turn)
+        if ply > 0 and not board.is_game_over:
+            score = self.probe_tablebase(board)
+            if score is not None:
+                return score, None
 
-            if len(possible_children) == 1:
-                only_child = possible_children[0]
-                only_board = only_child[0]
-                only_move = only_child[1]
-                return only_board.evaluate_position(), only_move
+        if depth == 0 or board.is_game_over:
+            if sign > 0:
+                return self.quiescence(board, alpha, beta), None
+            return -self.quiescence(board, -beta, -alpha), None
+
+        possible_moves = list(board.staged_moves(board.turn))
+        if len(possible_moves) == 1 and ply == 0:
+            only_move = possible_moves[0]
+            record = board.make_move(only_move)
+            try:
+                evaluation = self.quiescence(board)
+            finally:
+                board.unmake_move(record)
+            return sign * evaluation, only_move
+
+        if sign < 0:
+            shuffle(possible_moves)
+
+        table = self.transposition_table
+        table_move_key = 0
+        if table is not None:
+            entry = table.probe(board.zobrist_key)
+            if entry is not None:
+                entry_depth, bound, score, table_move_key = entry
+                #   the table holds the scores from white's perspective
+                score *= sign
+                if sign < 0 and bound != EXACT:
+                    bound = LOWER_BOUND + UPPER_BOUND - bound
+                if entry_depth >= depth and ply > 0:
+                    if (bound == EXACT
+                            or (bound == LOWER_BOUND and score >= beta)
+                            or (bound == UPPER_BOUND and score <= alpha)):
+                        return score, None
+        pv_move, pv_move_key = None, 0
+        if self._pv_ply == ply and ply < len(self.principal_variation):
+            pv_move_key = move_key(self.principal_variation[ply])
+            pv_move = find_move(possible_moves, pv_move_key)
+        possible_moves = self.move_ordering.order(
+            possible_moves, ply, table_move_key, pv_move_key)
+        original_alpha = alpha
+
+        best_eval = float('-inf')
+        best_move = None
+        children = board.iter_children(possible_moves)
+        try:
+            for move_number, move in enumerate(children):
+                on_pv = move is pv_move
+                self._pv_ply = ply + 1 if on_pv else -1
+                if move_number == 0 or alpha == float('-inf'):
+                    evaluation = -self.negamax(
+                        board, depth - 1, -beta, -alpha, ply + 1)[0]
+                else:
+                    evaluation = -self.negamax(
+                        board, depth - 1, -alpha - 1, -alpha, ply + 1)[0]
+                    if alpha < evaluation < beta:
+                        self._pv_ply = ply + 1 if on_pv else -1
+                        evaluation = -self.negamax(
+                            board, depth - 1, -beta, -alpha, ply + 1)[0]
+                if evaluation > best_eval or best_move is None:
+                    best_eval, best_move = evaluation, move
+                alpha = max(alpha, evaluation)
+                if alpha >= beta:
+                    self.move_ordering.record_cutoff(
+                        move, ply, depth, move_number)
+                    break
+        finally:
+            #   takes back the last move made by the generator
+            children.close()
+
+        if table is not None:
+            if best_eval <= original_alpha:
+                bound = UPPER_BOUND if sign > 0 else LOWER_BOUND
+            elif best_eval >= beta:
+                bound = LOWER_BOUND if sign > 0 else UPPER_BOUND
+            else:
+                bound = EXACT
+            table.store(board.zobrist_key, depth, bound, sign * best_eval,
+                        move_key(best_move))
+        return best_eval, best_move
 
-            shuffle(possible_children)
-            #   to make the game non deterministic in positions with
-            #   no clear winning/advantageous move
-            for position, move in possible_children:
-                evaluation = self.minimax(
-                    position, depth - 1, alpha, beta, move)
-                if evaluation[0] == min_eval[0] and best_move is None:
-                    min_eval = evaluation
-                    best_move = move
-                elif evaluation[0] < min_eval[0]:
-                    min_eval = evaluation
-                    best_move = move
-                beta = min(beta, evaluation[0])
+    def probe_tablebase(self, board):
+        '''
+        Returns the evaluation of the board according to the tablebase,
+        from the perspective of the player to move, or None if the board
+        is not in it. Won positions are worth TABLEBASE_WIN_SCORE less the
+        number of moves to the win, so the shortest win is preferred.
+        '''
+        if self.tablebase is None:
+            return None
+        result = self.tablebase.probe_board(board)
+        if result is None:
+            return None
+        self.tablebase_hits += 1
+        value, distance = result
+        if value == WIN:
+            return TABLEBASE_WIN_SCORE - distance
+        if value == LOSS:
+            return distance - TABLEBASE_WIN_SCORE
+        return 0
+
+    def quiescence(self, board: 'Board', alpha=float('-inf'),
+                   beta=float('inf'), depth=QUIESCENCE_MAX_DEPTH):
+        '''
+        Evaluates a board at the end of the search. As long as the player
+        to move has to attack, the attacks are searched further, up to
+        depth more moves, so the evaluation is never taken in the middle
+        of an exchange of pieces.
+
+        returns:
+        board evaluation from white's perspective: int
+        '''
+        self._count_node(quiescence=True)
+        if (depth == 0 or board.is_game_over
+                or not board.mandatory_attacks[board.turn]):
+            self.leaf_evaluations += 1
+            if board.ply - self._root_ply > self.max_depth:
+                self.max_depth = board.ply - self._root_ply
+            return board.evaluate_position()
+
+        maximizing_player = self.minimizing_or_maximizing(board.turn)
+        best_eval = float('-inf') if maximizing_player else float('inf')
+        children = board.iter_children()
+        try:
+            for _ in children:
+                evaluation = self.quiescence(board, alpha, beta, depth - 1)
+                if maximizing_player:
+                    best_eval = max(best_eval, evaluation)
+                    alpha = max(alpha, evaluation)
+                else:
+                    best_eval = min(best_eval, evaluation)
+                    beta = min(beta, evaluation)
                 if beta <= alpha:
                     break
-            return min_eval[0], best_move
+        finally:
+            children.close()
+        return best_eval
+
+    def evaluate_root_move(self, board: 'Board', move, depth,
+                           alpha=float('-inf'), deadline=None):
+        '''
+        Searches the board after a move with one depth less. Returns
+        the evaluation from the perspective of the player making the move.
+        If the move is not better than alpha, the search only proves it,
+        and the returned value is not more than alpha. Raises SearchTimeout
+        if the deadline passes - the board is restored either way.
+        '''
+        sign = 1 if board.turn == Color.WHITE else -1
+        record = board.make_move(move)
+        self._deadline = deadline
+        try:
+            if self.use_pvs:
+                return -self.negamax(board, depth - 1, float('-inf'),
+                                     -alpha, 1)[0]
+            if sign > 0:
+                return self.minimax(board, depth - 1, alpha, float('inf'),
+                                    move, 1)[0]
+            return -self.minimax(board, depth - 1, float('-inf'), -alpha,
+                                 move, 1)[0]
+        finally:
+            self._deadline = None
+            board.unmake_move(record)
+
+    def aspiration_search(self, board, depth, previous_score=None):
+        '''
+        Runs negamax with a narrow window around the score of the previous
+        iteration. If the score falls outside of it, the search is repeated
+        with the window opened on that side.
+
+        returns:
+        board evaluation from white's perspective: int
+        best_move: Move
+        '''
+        sign = 1 if board.turn == Color.WHITE else -1
+        alpha, beta = float('-inf'), float('inf')
+        if previous_score not in (None, float('inf'), float('-inf')):
+            alpha = sign * previous_score - ASPIRATION_WINDOW
+            beta = sign * previous_score + ASPIRATION_WINDOW
+        while True:
+            score, move = self.negamax(board, depth, alpha, beta)
+            if score <= alpha and alpha != float('-inf'):
+                alpha = float('-inf')
+            elif score >= beta and beta != float('inf'):
+                beta = float('inf')
+            else:
+                return sign * score, move
+
+    def minimax_bitboard(self, position: 'BitBoard', depth,
+                         alpha=float('-inf'), beta=float('inf')):
+        '''
+        The minimax algorithm working on a BitBoard, without creating
+        any Board objects. It evaluates the positions the same way, but
+        orders the moves differently and makes forced moves without
+        the shortcut of the minimax method, so it may choose another
+        of equally evaluated moves.
+
+        returns:
+        board evaluation: int
+        best_move: BitMove or None if the position is a leaf
+        '''
+        self._count_node()
+        if depth == 0:
+            return self.quiescence_bitboard(position, alpha, beta), None
+        moves = position.legal_moves()
+        if not moves:
+            return position.evaluate_position(), None
+        maximizing_player = self.minimizing_or_maximizing(position.turn)
+        if not maximizing_player:
+            shuffle(moves)
+
+        if depth == 1 and self.batch_frontier and numpy_available():
+            return self.evaluate_frontier(position, moves, alpha, beta)
+
+        best_eval = float('-inf') if maximizing_player else float('inf')
+        best_move = None
+        for move in moves:
+            evaluation = self.minimax_bitboard(
+                position.apply(move), depth - 1, alpha, beta)[0]
+            if maximizing_player:
+                if evaluation > best_eval or best_move is None:
+                    best_eval, best_move = evaluation, move
+                alpha = max(alpha, evaluation)
+            else:
+                if evaluation < best_eval or best_move is None:
+                    best_eval, best_move = evaluation, move
+                beta = min(beta, evaluation)
+            if beta <= alpha:
+                break
+        return best_eval, best_move
+
+    def evaluate_frontier(self, position: 'BitBoard', moves,
+                          alpha=float('-inf'), beta=float('inf')):
+        '''
+        Searches the moves of a position one move away from the leaves
+        of the bitboard search. The quiet leaves are evaluated all at once
+        with evaluate_positions, only the ones with attacks still to be
+        made are searched one by one by quiescence_bitboard.
+
+        returns:
+        board evaluation: int
+        best_move: BitMove
+        '''
+        children = [position.apply(move) for move in moves]
+        evaluations = [None] * len(children)
+        quiet = []
+        for index, child in enumerate(children):
+            self._count_node()
+            if not child.jumpers():
+                self._count_node(quiescence=True)
+                quiet.append(index)
+        for index, evaluation in zip(quiet, evaluate_positions(
+                [children[index] for index in quiet])):
+            evaluations[index] = evaluation
+        self.leaf_evaluations += len(quiet)
+
+        maximizing_player = self.minimizing_or_maximizing(position.turn)
+        best_eval = float('-inf') if maximizing_player else float('inf')
+        best_move = None
+        for move, child, evaluation in zip(moves, children, evaluations):
+            if evaluation is None:
+                evaluation = self.quiescence_bitboard(child, alpha, beta)
+            if maximizing_player:
+                if evaluation > best_eval or best_move is None:
+                    best_eval, best_move = evaluation, move
+                alpha = max(alpha, evaluation)
+            else:
+                if evaluation < best_eval or best_move is None:
+                    best_eval, best_move = evaluation, move
+                beta = min(beta, evaluation)
+            if beta <= alpha:
+                break
+        return best_eval, best_move
+
+    def quiescence_bitboard(self, position: 'BitBoard', alpha=float('-inf'),
+                            beta=float('inf'), depth=QUIESCENCE_MAX_DEPTH):
+        '''The quiescence method working on a BitBoard'''
+        self._count_node(quiescence=True)
+        moves = position.capture_moves() if depth > 0 else []
+        if not moves:
+            self.leaf_evaluations += 1
+            return position.evaluate_position()
+
+        maximizing_player = self.minimizing_or_maximizing(position.turn)
+        best_eval = float('-inf') if maximizing_player else float('inf')
+        for move in moves:
+            evaluation = self.quiescence_bitboard(
+                position.apply(move), alpha, beta, depth - 1)
+            if maximizing_player:
+                best_eval = max(best_eval, evaluation)
+                alpha = max(alpha, evaluation)
+            else:
+                best_eval = min(best_eval, evaluation)
+                beta = min(beta, evaluation)
+            if beta <= alpha:
+                break
+        return best_eval
+
+    def _count_node(self, quiescence=False):
+        '''Counts a visited node and every NODES_BETWEEN_TIME_CHECKS nodes
+        raises SearchTimeout if the deadline of the search has passed
+        or the stop_signal is set'''
+        if quiescence:
+            self.quiescence_nodes += 1
+        else:
+            self.nodes += 1
+        if (self.nodes + self.quiescence_nodes) % (
+                NODES_BETWEEN_TIME_CHECKS) != 0:
+            return
+        if self._deadline is not None and time() > self._deadline:
+            raise SearchTimeout()
+        if self.stop_signal is not None and self.stop_signal.is_set():
+            raise SearchTimeout()
+
+    def search(self, board, depth, previous_score=None):
+        '''Returns the move chosen by a search of a given depth, using
+        the bitboard or the Board objects and the principal variation search
+        or minimax depending on the bot's settings. The evaluation it found
+        is saved as the score attribute. The previous_score, if given,
+        is where the principal variation search looks for the new one.'''
+        self._root_ply = board.ply
+        if self.parallel_search is not None:
+            first_move = None
+            if self.principal_variation:
+                first_move = self.principal_variation[0]
+            self.score, move, nodes = self.parallel_search.search(
+                board, depth, first_move, self._deadline)
+            self.nodes += nodes
+            return move
+        if not self.use_bitboard:
+            if self.use_pvs:
+                self.score, move = self.aspiration_search(
+                    board, depth, previous_score)
+            else:
+                self.score, move = self.minimax(board, depth)
+            return move
+        self.score, bit_move = self.minimax_bitboard(
+            BitBoard.from_board(board), depth)
+        old_cords = square_to_location(bit_move.path[0])
+        landings = tuple(square_to_location(square)
+                         for square in bit_move.path[1:])
+        for move in board.all_possible_moves(board.turn):
+            if move.old_cords == old_cords and move.landings == landings:
+                return move
+
+    def iterative_deepening(self, board, max_depth=None, deadline=None):
+        '''
+        Searches the board one depth at a time, until the max_depth (by
+        default the bot's depth) is reached or the deadline (by default
+        the bot's time limit from now) passes. Every iteration searches
+        the principal variation of the previous one first. An iteration
+        interrupted by the deadline is abandoned and the move of the last
+        completed one is returned - the first one is always completed,
+        unless the stop_signal interrupts it, then None is returned.
+        If the board has only one move, it is searched to depth 1 only.
+        '''
+        if max_depth is None:
+            max_depth = self.depth
+        if deadline is None and self.time_limit:
+            deadline = time() + self.time_limit
+        best_move = None
+        self.principal_variation = []
+        self.completed_depth = 0
+        self.score = None
+        self.iterations = []
+        if self.lazy_smp is not None:
+            start = time()
+            self.completed_depth, self.score, best_move, nodes = (
+                self.lazy_smp.search(board, max_depth, deadline))
+            self.nodes += nodes
+            self.iterations.append(
+                (self.completed_depth, time() - start, nodes))
+            self.principal_variation = [best_move]
+            return best_move
+        #   deeper iterations could not choose another move
+        forced = len(board.all_possible_moves(board.turn)) == 1
+        try:
+            for depth in range(1, max_depth + 1):
+                if forced and depth > 1:
+                    break
+                if deadline is not None and depth > 1:
+                    if time() >= deadline:
+                        break
+                    self._deadline = deadline
+                self._pv_ply = 0
+                start = time()
+                nodes = self.nodes + self.quiescence_nodes
+                try:
+                    best_move = self.search(board, depth, self.score)
+                except SearchTimeout:
+                    #   the board was restored by the generators
+                    #   of the interrupted minimax calls
+                    break
+                self.completed_depth = depth
+                self.iterations.append(
+                    (depth, time() - start,
+                     self.nodes + self.quiescence_nodes - nodes))
+                self.principal_variation = self.find_principal_variation(
+                    board, depth, best_move)
+        finally:
+            self._deadline = None
+            self._pv_ply = -1
+        return best_move
+
+    def find_principal_variation(self, board, depth, best_move):
+        '''Returns the list of best moves following each other from the
+        board, read from the transposition table. It starts with
+        the best_move and is at most depth moves long.'''
+        if best_move is None:
+            return []
+        variation = [best_move]
+        table = self.transposition_table
+        if table is None or self.use_bitboard:
+            return variation
+        records = [board.make_move(best_move)]
+        try:
+            while len(variation) < depth and not board.is_game_over:
+                entry = table.probe(board.zobrist_key)
+                if entry is None:
+                    break
+                move = find_move(board.all_possible_moves(board.turn),
+                                 entry[3])
+                if move is None:
+                    break
+                variation.append(move)
+                records.append(board.make_move(move))
+        finally:
+            for record in reversed(records):
+                board.unmake_move(record)
+        return variation
 
     @ staticmethod
     def minimizing_or_maximizing(color):
@@ -158,31 +819,166 @@ class MinimaxBot(Bot):
             return True
         return False
 
+    def _start_search(self):
+        if self.transposition_table is not None:
+            self.transposition_table.new_search()
+        if self.parallel_search is not None:
+            self.parallel_search.new_search()
+        self.move_ordering.new_search()
+        self.nodes = 0
+        self.quiescence_nodes = 0
+        self.leaf_evaluations = 0
+        self.max_depth = 0
+        self.tablebase_hits = 0
+
+    def start_pondering(self, board):
+        '''
+        Starts searching, in a background thread, the board after the reply
+        of the opponent predicted by the principal variation, so the bot
+        uses the time the opponent spends thinking. The search is not
+        limited by time - it runs until finish_pondering or stop_pondering.
+        Nothing happens if there is no prediction or the bot searches
+        with many processes.
+        '''
+        self.stop_pondering()
+        if (board.is_game_over or len(self.principal_variation) < 2
+                or self.parallel_search is not None
+                or self.lazy_smp is not None):
+            return
+        ponder_board = BitBoard.from_board(board).to_board()
+        ponder_board.moves_without_attacks = board.moves_without_attacks
+        predicted_move = find_move(
+            ponder_board.all_possible_moves(ponder_board.turn),
+            move_key(self.principal_variation[1]))
+        if predicted_move is None:
+            return
+        ponder_board.handle_move(predicted_move)
+        if ponder_board.is_game_over:
+            return
+        self._start_search()
+        self._ponder_board = ponder_board
+        #   the key of the board changes while it is searched
+        self._ponder_key = ponder_board.zobrist_key
+        self._ponder_move = None
+        self.stop_signal = Event()
+        self._ponder_thread = Thread(target=self._ponder, daemon=True)
+        self._ponder_thread.start()
+
+    def _ponder(self):
+        self._ponder_move = self.iterative_deepening(
+            self._ponder_board, deadline=float('inf'))
+
+    def stop_pondering(self):
+        '''Stops the background search, what it found stays in
+        the transposition table'''
+        if self._ponder_thread is None:
+            return
+        self.stop_signal.set()
+        self._ponder_thread.join()
+        self._ponder_thread = None
+        self._ponder_board = None
+        self.stop_signal = None
+
+    def close(self):
+        '''Stops the background search and the worker processes
+        of the parallel search and frees the shared transposition table
+        of the Lazy SMP, a later search starts them again'''
+        self.stop_pondering()
+        if self.parallel_search is not None:
+            self.parallel_search.close()
+        if self.lazy_smp is not None:
+            self.lazy_smp.close()
+
+    def finish_pondering(self, board):
+        '''
+        Called when the opponent has moved. If the board is the one
+        the bot has been pondering on, the background search goes on
+        until it reaches the bot's depth or its time limit runs out, and
+        the move it found is returned. Otherwise the search is stopped
+        and None is returned.
+        '''
+        if self._ponder_thread is None:
+            return None
+        if board.zobrist_key != self._ponder_key:
+            self.stop_pondering()
+            return None
+        timer = None
+        if self.time_limit:
+            timer = Timer(self.time_limit, self.stop_signal.set)
+            timer.start()
+        self._ponder_thread.join()
+        if timer is not None:
+            timer.cancel()
+        self._ponder_thread = None
+        self._ponder_board = None
+        self.stop_signal = None
+        if self._ponder_move is None:
+            return None
+        return find_move(board.all_possible_moves(board.turn),
+                         move_key(self._ponder_move))
+
+    def book_move(self, board):
+        '''Returns the move the opening book holds for the board or None
+        if there is no book, no such move or the book_depth is exceeded'''
+        if self.opening_book is None or board.ply >= self.book_depth:
+            return None
+        return self.opening_book.find_move(board)
+
+    def collect_stats(self, board, move, source, elapsed):
+        '''Returns the SearchStats of a move of the board which took
+        elapsed seconds to find, read from the counters of the bot'''
+        stats = SearchStats(source, move_name(move), board.ply, elapsed)
+        if source == 'book':
+            return stats
+        stats.nodes = self.nodes
+        stats.quiescence_nodes = self.quiescence_nodes
+        stats.leaf_evaluations = self.leaf_evaluations
+        stats.max_depth = self.max_depth
+        stats.completed_depth = self.completed_depth
+        stats.cutoffs = self.move_ordering.cutoffs
+        stats.cutoffs_by_move_number = dict(
+            self.move_ordering.cutoffs_by_move_number)
+        if self.transposition_table is not None:
+            stats.table_probes = self.transposition_table.probes
+            stats.table_hits = self.transposition_table.hits
+        stats.tablebase_hits = self.tablebase_hits
+        stats.iterations = list(self.iterations)
+        return stats
+
+    def choose_move(self, board):
+        '''
+        Returns the move the bot makes on the board, without making it.
+        If the opponent made the move the bot was pondering on,
+        the pondering search is used instead of a new one, otherwise
+        the opening book is checked first. The statistics of the move are
+        saved as the stats attribute and appended to the stats_log.
+        '''
+        start = time()
+        source = 'ponder'
+        current_move = self.finish_pondering(board)
+        if current_move is None:
+            source = 'book'
+            current_move = self.book_move(board)
+            if current_move is not None:
+                self.principal_variation = [current_move]
+        if current_move is None:
+            source = 'search'
+            self._start_search()
+            current_move = self.iterative_deepening(board)
+        self.stats = self.collect_stats(board, current_move, source,
+                                        time() - start)
+        if self.stats_log is not None:
+            with open(self.stats_log, 'a') as log_file:
+                log_file.write(self.stats.to_json() + '\n')
+        return current_move
+
     def make_move(self, board):
         '''
         The method responsible for the entire process of making a move:
-        calculation and mapping the move into the pixel grid of the window.
+        calculation (by choose_move) and mapping the move into the pixel
+        grid of the window.
         '''
-        if not self.time_limit:
-            current_move = self.minimax(board, self.depth)[1]
-
-        else:
-            current_depth = 0
-            current_move = self.minimax(board, 1)[1]
-            start_time = time()
-            time_left = self.time_limit - (time() - start_time)
-
-            while time_left >= 0.3 * self.time_limit:
-                # if the time left is less than 0.3 of the max limit,
-                # increasing the depth would pretty much double current
-                # time spent on the move, so we need to limit it this way
-
-                current_depth += 1
-                if current_depth > self.depth:
-                    break
-                current_move = self.minimax(board, current_depth)[1]
-                time_left = self.time_limit - (time() - start_time)
-
+        current_move = self.choose_move(board)
         piece_click_location = self.map_field_cords_to_pixels(
             current_move.old_cords)
         field_click_location = self.map_field_cords_to_pixels(
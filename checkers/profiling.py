@@ -0,0 +1,175 @@
+from atexit import register, unregister
+import cProfile
+from functools import wraps
+from os import environ, makedirs
+from os.path import join
+from threading import Lock, local
+import tracemalloc
+from checkers.piece_move_board import Board
+from checkers.player import MinimaxBot
+
+
+#   the environment variable holding the directory the profiles are saved
+#   to, the profiling is only turned on if it is set
+PROFILE_DIR_VARIABLE = 'CHECKERS_PROFILE'
+#   how many of the lines which allocated the most memory are reported
+TOP_ALLOCATIONS = 20
+#   how many frames of the stack tracemalloc keeps for every allocation
+TRACEMALLOC_FRAMES = 1
+
+#   the methods of the Board the search spends most of its time in,
+#   profiled outside of the moves of the bots - in the moves made
+#   on the board of the game and in the pondering threads
+BOARD_METHODS = ('make_move', 'unmake_move', '_update_moves_around',
+                 'evaluate_position')
+
+
+class Profiler:
+    '''
+    Class profiling the engine while a game is played. While it is
+    installed, every MinimaxBot.choose_move, which make_move calls,
+    is run under cProfile and tracemalloc, and for every one of them
+    a move-NNN-COLOR.prof file (for pstats or snakeviz) and
+    a move-NNN-COLOR-allocations.txt report of the lines which allocated
+    the most memory during the move are saved to the directory.
+    The BOARD_METHODS called outside of the moves of the bots, like
+    the moves of the game itself and the searches of the bots pondering
+    in the background, are profiled together and saved as board.prof when
+    the profiler is uninstalled or the program exits, along with
+    the allocations.txt report of all allocations since it was installed.
+    Only one thread at a time adds to board.prof, the calls made
+    meanwhile by the others are not profiled.
+    Nothing is wrapped until install is called, so the profiling costs
+    nothing when it is not used.
+
+    param directory: the directory the files are saved to
+    type directory: str
+
+    param top: how many lines are listed in the allocation reports
+    type top: int
+
+    param moves: the number of moves profiled so far
+    type moves: int
+    '''
+
+    def __init__(self, directory, top=TOP_ALLOCATIONS) -> None:
+        self.directory = directory
+        self.top = top
+        self.moves = 0
+        self._originals = []
+        #   whether a profile is running in a thread, the profiles
+        #   do not nest
+        self._thread = local()
+        self._board_lock = Lock()
+        self._board_profile = None
+        self._board_calls = 0
+        self._snapshot = None
+        self._started_tracing = False
+
+    @property
+    def _active(self):
+        '''Whether a profile is running in the current thread'''
+        return getattr(self._thread, 'active', False)
+
+    @_active.setter
+    def _active(self, active):
+        self._thread.active = active
+
+    def install(self):
+        '''Wraps the profiled methods and starts tracing the allocations'''
+        if self._originals:
+            return
+        makedirs(self.directory, exist_ok=True)
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        self._board_profile = cProfile.Profile()
+        self._snapshot = tracemalloc.take_snapshot()
+        self._board_calls = 0
+        self._wrap(MinimaxBot, 'choose_move', self._profile_move)
+        for name in BOARD_METHODS:
+            self._wrap(Board, name, self._profile_board_method)
+        register(self.uninstall)
+
+    def uninstall(self):
+        '''Restores the profiled methods and saves the profile
+        of the BOARD_METHODS'''
+        if not self._originals:
+            return
+        for cls, name, original in self._originals:
+            setattr(cls, name, original)
+        self._originals = []
+        unregister(self.uninstall)
+        if self._board_calls:
+            self._board_profile.dump_stats(join(self.directory, 'board.prof'))
+        self._write_allocations('allocations.txt', self._snapshot,
+                                'the profiling')
+        if self._started_tracing:
+            tracemalloc.stop()
+
+    def _wrap(self, cls, name, wrapper_factory):
+        original = getattr(cls, name)
+        self._originals.append((cls, name, original))
+        setattr(cls, name, wraps(original)(wrapper_factory(original)))
+
+    def _profile_move(self, choose_move):
+        def profiled_choose_move(bot, board):
+            if self._active:
+                return choose_move(bot, board)
+            self._active = True
+            self.moves += 1
+            name = f'move-{self.moves:03d}-{bot.color.name.lower()}'
+            profile = cProfile.Profile()
+            snapshot = tracemalloc.take_snapshot()
+            try:
+                return profile.runcall(choose_move, bot, board)
+            finally:
+                self._active = False
+                self._write_allocations(
+                    f'{name}-allocations.txt', snapshot,
+                    f'move {self.moves} of the {bot.color.name.lower()} bot')
+                profile.dump_stats(join(self.directory, f'{name}.prof'))
+        return profiled_choose_move
+
+    def _profile_board_method(self, method):
+        def profiled_method(board, *args, **kwargs):
+            if self._active or not self._board_lock.acquire(blocking=False):
+                return method(board, *args, **kwargs)
+            self._active = True
+            self._board_calls += 1
+            try:
+                return self._board_profile.runcall(
+                    method, board, *args, **kwargs)
+            finally:
+                self._active = False
+                self._board_lock.release()
+        return profiled_method
+
+    def _write_allocations(self, file_name, snapshot, title):
+        '''Saves the lines which allocated the most memory since
+        the snapshot was taken'''
+        differences = _own_traces(tracemalloc.take_snapshot()).compare_to(
+            _own_traces(snapshot), 'lineno')
+        with open(join(self.directory, file_name), 'w') as report:
+            report.write(f'Allocations during {title}\n')
+            for difference in differences[:self.top]:
+                report.write(f'{difference}\n')
+
+
+def _own_traces(snapshot):
+    '''Leaves out the allocations of the profilers themselves'''
+    return snapshot.filter_traces([
+        tracemalloc.Filter(False, cProfile.__file__),
+        tracemalloc.Filter(False, tracemalloc.__file__),
+    ])
+
+
+def profiler_from_environment():
+    '''Returns an installed Profiler saving to the directory given by
+    the PROFILE_DIR_VARIABLE or None if it is not set'''
+    directory = environ.get(PROFILE_DIR_VARIABLE)
+    if not directory:
+        return None
+    profiler = Profiler(directory)
+    profiler.install()
+    return profiler
@@ -0,0 +1,109 @@
+from dataclasses import dataclass, field, asdict
+from json import dumps
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass
+class SearchStats:
+    '''
+    Class holding the statistics of how a bot found one of its moves
+
+    param source: where the move came from - 'search', 'ponder' if
+    the search was started while the opponent was thinking, or 'book'
+    type source: str
+
+    param move: the move in the notation of checkers.perft.move_name
+    type move: str
+
+    param ply: how many moves had been made on the board before the move
+    type ply: int
+
+    param time: how many seconds the bot spent on the move
+    type time: float
+
+    param nodes, quiescence_nodes: the numbers of positions visited
+    by the search and past its depth
+    type nodes, quiescence_nodes: int
+
+    param leaf_evaluations: how many times a position was evaluated
+    type leaf_evaluations: int
+
+    param max_depth: the most moves from the root any evaluated position
+    was, with the attacks searched past the depth of the search. Only
+    counted by the search on the Board objects.
+    type max_depth: int
+
+    param completed_depth: the depth of the last completed iteration
+    type completed_depth: int
+
+    param cutoffs: the number of alpha-beta cutoffs
+    type cutoffs: int
+
+    param cutoffs_by_move_number: maps the number of the move, in the order
+    the moves of a position were searched in, onto how many cutoffs moves
+    searched as that one caused. Most of them should be caused by the first.
+    type cutoffs_by_move_number: Dict[int, int]
+
+    param table_probes, table_hits: how many times the transposition table
+    was looked up and how many of those times a matching entry was found
+    type table_probes, table_hits: int
+
+    param tablebase_hits: the number of positions found in the tablebase
+    type tablebase_hits: int
+
+    param iterations: (depth, seconds, nodes) of every completed iteration
+    of the iterative deepening
+    type iterations: List[Tuple[int, float, int]]
+    '''
+    source: str = 'search'
+    move: Optional[str] = None
+    ply: int = 0
+    time: float = 0.0
+    nodes: int = 0
+    quiescence_nodes: int = 0
+    leaf_evaluations: int = 0
+    max_depth: int = 0
+    completed_depth: int = 0
+    cutoffs: int = 0
+    cutoffs_by_move_number: Dict[int, int] = field(default_factory=dict)
+    table_probes: int = 0
+    table_hits: int = 0
+    tablebase_hits: int = 0
+    iterations: List[Tuple[int, float, int]] = field(default_factory=list)
+
+    @property
+    def effective_branching_factor(self):
+        '''How many times more nodes the last iteration took than the one
+        before it, None if fewer than two iterations were completed'''
+        if len(self.iterations) < 2 or not self.iterations[-2][2]:
+            return None
+        return self.iterations[-1][2] / self.iterations[-2][2]
+
+    @property
+    def first_move_cutoff_rate(self):
+        '''The part of the cutoffs caused by the first move searched,
+        None if there were no cutoffs'''
+        if not self.cutoffs:
+            return None
+        return self.cutoffs_by_move_number.get(0, 0) / self.cutoffs
+
+    @property
+    def table_hit_rate(self):
+        '''The part of the lookups of the transposition table which found
+        a matching entry, None if the table was not used'''
+        if not self.table_probes:
+            return None
+        return self.table_hits / self.table_probes
+
+    def to_dict(self):
+        '''Returns the statistics, along with the values computed from
+        them, as a dictionary'''
+        stats = asdict(self)
+        stats['effective_branching_factor'] = self.effective_branching_factor
+        stats['first_move_cutoff_rate'] = self.first_move_cutoff_rate
+        stats['table_hit_rate'] = self.table_hit_rate
+        return stats
+
+    def to_json(self):
+        '''Returns the statistics as a line of JSON'''
+        return dumps(self.to_dict())
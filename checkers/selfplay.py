@@ -0,0 +1,161 @@
+from argparse import ArgumentParser
+from json import dumps
+from multiprocessing import get_context
+from os.path import join
+from random import seed as seed_random
+from time import perf_counter
+from checkers.constants import Color
+from checkers.perft import move_name
+from checkers.piece_move_board import Board
+from checkers.player import RandomBot, MinimaxBot
+
+
+def create_bot(spec, color):
+    '''
+    Creates a bot described by a spec: random for a RandomBot or
+    minimax:DEPTH[:TIME_LIMIT] for a MinimaxBot, for example minimax:6:2
+    searches 6 moves deep for at most 2 seconds.
+    Raises ValueError if the spec is not valid.
+    '''
+    name, *settings = spec.split(':')
+    if name == 'random' and not settings:
+        return RandomBot(color)
+    if name == 'minimax' and 1 <= len(settings) <= 2:
+        try:
+            depth = int(settings[0])
+            time_limit = float(settings[1]) if len(settings) == 2 else False
+        except ValueError:
+            pass
+        else:
+            if depth > 0 and (time_limit is False or time_limit > 0):
+                #   the games themselves may be played in parallel,
+                #   the bots search on one process each
+                return MinimaxBot(color, depth, time_limit, workers=1)
+    raise ValueError(f'{spec} is not a valid bot, use random '
+                     'or minimax:DEPTH[:TIME_LIMIT]')
+
+
+def play_game(task):
+    '''
+    Plays one game between the bots described by the specs, with
+    the random module seeded, so a game of bots without time limits
+    is repeated exactly with the same seed. If profile_directory is
+    given, the moves of the bots are profiled into its game-NNN
+    subdirectory.
+
+    returns:
+    dictionary with the result of the game
+    '''
+    number, white_spec, black_spec, seed, profile_directory = task
+    profiler = None
+    if profile_directory is not None:
+        # imported here, so the profiling is only set up when it is used
+        from checkers.profiling import Profiler
+        profiler = Profiler(join(profile_directory, f'game-{number:03d}'))
+        profiler.install()
+    seed_random(seed)
+    bots = {Color.WHITE: create_bot(white_spec, Color.WHITE),
+            Color.BLACK: create_bot(black_spec, Color.BLACK)}
+    board = Board()
+    moves, move_times = [], []
+    start = perf_counter()
+    try:
+        while not board.is_game_over:
+            move_start = perf_counter()
+            move = bots[board.turn].choose_move(board)
+            move_times.append(perf_counter() - move_start)
+            moves.append(move_name(move))
+            board.handle_move(move)
+    finally:
+        if profiler is not None:
+            profiler.uninstall()
+    winner = board.winner()
+    return {
+        'game': number,
+        'white': white_spec,
+        'black': black_spec,
+        'seed': seed,
+        'winner': winner.name.lower() if winner is not None else 'draw',
+        'length': len(moves),
+        'time': perf_counter() - start,
+        'move_times': move_times,
+        'moves': moves,
+    }
+
+
+def game_tasks(games, white_spec, black_spec, seed=0, alternate=False,
+               profile_directory=None):
+    '''Returns the play_game tasks of the games, every one with its own
+    seed. With alternate, the bots swap colors every other game.'''
+    tasks = []
+    for number in range(games):
+        specs = (white_spec, black_spec)
+        if alternate and number % 2:
+            specs = (black_spec, white_spec)
+        tasks.append((number, *specs, seed + number, profile_directory))
+    return tasks
+
+
+def run_games(tasks, workers=1):
+    '''Generator of the results of the play_game tasks, in the order
+    the games end. With more than one worker, the games are played
+    on a pool of processes.'''
+    if workers <= 1:
+        yield from map(play_game, tasks)
+        return
+    with get_context().Pool(workers) as pool:
+        yield from pool.imap_unordered(play_game, tasks)
+
+
+def main(arguments=None):
+    '''Plays games between bots without the window of the game'''
+    parser = ArgumentParser(description=main.__doc__)
+    parser.add_argument('--games', type=int, default=10)
+    parser.add_argument('--white', default='minimax:4',
+                        help='random or minimax:DEPTH[:TIME_LIMIT]')
+    parser.add_argument('--black', default='random',
+                        help='random or minimax:DEPTH[:TIME_LIMIT]')
+    parser.add_argument('--alternate', action='store_true',
+                        help='swap the colors of the bots every other game')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='the number of games played at once')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='the JSONL file the results '
+                        'of the games are appended to')
+    parser.add_argument('--profile', metavar='DIRECTORY',
+                        help='profile the moves of the bots into '
+                        'a directory, see checkers.profiling')
+    arguments = parser.parse_args(arguments)
+    for spec in (arguments.white, arguments.black):
+        try:
+            create_bot(spec, Color.WHITE)
+        except ValueError as error:
+            parser.error(str(error))
+
+    tasks = game_tasks(arguments.games, arguments.white, arguments.black,
+                       arguments.seed, arguments.alternate,
+                       arguments.profile)
+    wins = dict()
+    output_file = open(arguments.output, 'a') if arguments.output else None
+    try:
+        for result in run_games(tasks, arguments.workers):
+            if output_file is not None:
+                output_file.write(dumps(result) + '\n')
+                output_file.flush()
+            winner = result['winner']
+            if winner != 'draw':
+                winner = result[winner]
+            wins[winner] = wins.get(winner, 0) + 1
+            print(f'game {result["game"]}: {result["white"]} (white) vs '
+                  f'{result["black"]} (black) - {result["winner"]} '
+                  f'after {result["length"]} moves, {result["time"]:.1f} s')
+    finally:
+        if output_file is not None:
+            output_file.close()
+    for winner, count in sorted(wins.items()):
+        print(f'{winner}: {count}')
+    return wins
+
+
+if __name__ == '__main__':
+    main()
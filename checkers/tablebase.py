@@ -0,0 +1,308 @@
+from argparse import ArgumentParser
+from array import array
+from itertools import combinations
+from math import comb
+from mmap import mmap, ACCESS_READ
+from struct import Struct
+from checkers.bitboard import BitBoard, NUM_OF_SQUARES, SQUARES_IN_ROW
+from checkers.constants import Color, TABLEBASE_PATH, TABLEBASE_PIECES
+
+
+#   values of the positions, from the perspective of the player to move
+UNKNOWN = 0
+WIN = 1
+LOSS = 2
+DRAW = 3
+VALUE_BITS = 2
+VALUES_IN_BYTE = 8 // VALUE_BITS
+VALUE_MASK = (1 << VALUE_BITS) - 1
+MAX_DISTANCE = 255
+
+TABLEBASE_MAGIC = b'CKRSTBDB'
+#   the magic bytes, the maximal number of pieces, the number of positions
+HEADER = Struct('<8sII')
+
+#   men never stand on the row they get promoted on, so each color's men
+#   have 28 squares: white ones the squares 4-31, black ones 0-27
+MAN_SQUARES = NUM_OF_SQUARES - SQUARES_IN_ROW
+
+
+def signatures(max_pieces):
+    '''Returns the (white men, white kings, black men, black kings)
+    numbers of pieces of all positions with 1 to max_pieces pieces'''
+    return [
+        (white_men, white_kings, black_men, black_kings)
+        for white_men in range(max_pieces + 1)
+        for white_kings in range(max_pieces + 1 - white_men)
+        for black_men in range(max_pieces + 1 - white_men - white_kings)
+        for black_kings in range(
+            max_pieces + 1 - white_men - white_kings - black_men)
+        if white_men + white_kings + black_men + black_kings > 0
+    ]
+
+
+def _set_rank(squares):
+    '''Returns the number of a set of squares among all the sets of its
+    size, in the combinatorial number system'''
+    return sum(comb(square, number + 1)
+               for number, square in enumerate(sorted(squares)))
+
+
+def _squares_of(bits):
+    squares = []
+    while bits:
+        bit = bits & -bits
+        bits ^= bit
+        squares.append(bit.bit_length() - 1)
+    return squares
+
+
+class PositionIndexer:
+    '''
+    Class numbering all positions with up to max_pieces pieces. Each
+    signature (the numbers of men and kings of both colors) takes up
+    a range of numbers, inside of which a position is numbered by the sets
+    of squares taken by every kind of piece and by the player to move.
+    Numbers of impossible positions, with two pieces on one square,
+    are left unused.
+
+    param max_pieces: the maximal number of pieces on the board
+    type max_pieces: int
+
+    param num_of_positions: how many numbers are used
+    type num_of_positions: int
+    '''
+
+    def __init__(self, max_pieces) -> None:
+        self.max_pieces = max_pieces
+        self._offsets = dict()
+        offset = 0
+        for signature in signatures(max_pieces):
+            self._offsets[signature] = offset
+            offset += self.signature_size(signature)
+        self.num_of_positions = offset
+
+    @staticmethod
+    def signature_size(signature):
+        '''Returns how many numbers the positions of a signature take'''
+        white_men, white_kings, black_men, black_kings = signature
+        return (comb(MAN_SQUARES, white_men)
+                * comb(NUM_OF_SQUARES, white_kings)
+                * comb(MAN_SQUARES, black_men)
+                * comb(NUM_OF_SQUARES, black_kings) * 2)
+
+    def index(self, position: 'BitBoard'):
+        '''Returns the number of a position or None if it has more
+        than max_pieces pieces'''
+        white_men = _squares_of(position.white & ~position.kings)
+        white_kings = _squares_of(position.white & position.kings)
+        black_men = _squares_of(position.black & ~position.kings)
+        black_kings = _squares_of(position.black & position.kings)
+        offset = self._offsets.get((len(white_men), len(white_kings),
+                                    len(black_men), len(black_kings)))
+        if offset is None:
+            return None
+        index = _set_rank(square - SQUARES_IN_ROW for square in white_men)
+        index = index * comb(NUM_OF_SQUARES, len(white_kings)) + _set_rank(
+            white_kings)
+        index = index * comb(MAN_SQUARES, len(black_men)) + _set_rank(
+            black_men)
+        index = index * comb(NUM_OF_SQUARES, len(black_kings)) + _set_rank(
+            black_kings)
+        return offset + 2 * index + (position.turn == Color.BLACK)
+
+    def positions(self):
+        '''Generator of (number, position) pairs of all possible positions'''
+        for white_men, white_kings, black_men, black_kings in signatures(
+                self.max_pieces):
+            for white_men_squares in combinations(
+                    range(SQUARES_IN_ROW, NUM_OF_SQUARES), white_men):
+                white_men_bits = sum(1 << square
+                                     for square in white_men_squares)
+                for white_kings_squares in combinations(
+                        range(NUM_OF_SQUARES), white_kings):
+                    white_kings_bits = sum(1 << square
+                                           for square in white_kings_squares)
+                    if white_kings_bits & white_men_bits:
+                        continue
+                    white = white_men_bits | white_kings_bits
+                    yield from self._black_positions(
+                        white, white_kings_bits, black_men, black_kings)
+
+    def _black_positions(self, white, white_kings, black_men, black_kings):
+        for black_men_squares in combinations(range(MAN_SQUARES), black_men):
+            black_men_bits = sum(1 << square for square in black_men_squares)
+            if black_men_bits & white:
+                continue
+            for black_kings_squares in combinations(
+                    range(NUM_OF_SQUARES), black_kings):
+                black_kings_bits = sum(1 << square
+                                       for square in black_kings_squares)
+                if black_kings_bits & (white | black_men_bits):
+                    continue
+                for turn in Color:
+                    position = BitBoard(
+                        white, black_men_bits | black_kings_bits,
+                        white_kings | black_kings_bits, turn)
+                    yield self.index(position), position
+
+
+def generate(max_pieces):
+    '''
+    Solves all positions with up to max_pieces pieces by retrograde
+    analysis. The positions with no moves are lost, then going backwards
+    from the solved ones: a position with a move into a lost position is
+    won, a position with all its moves leading into won positions is lost.
+    The rest is drawn. The distance is the number of moves to the end
+    of the game with the best play of both sides. The limit of moves
+    without attacks is not taken into account.
+
+    returns:
+    values: bytearray with a value for every position number
+    distances: bytearray with a distance for every position number
+    '''
+    indexer = PositionIndexer(max_pieces)
+    num_of_positions = indexer.num_of_positions
+    values = bytearray(num_of_positions)
+    distances = bytearray(num_of_positions)
+    possible = bytearray(num_of_positions)
+    #   how many moves of a position lead into unsolved or won positions
+    remaining_moves = array('H', bytes(2 * num_of_positions))
+    sources, targets = array('I'), array('I')
+    solved = array('I')
+    for index, position in indexer.positions():
+        possible[index] = 1
+        children = {indexer.index(position.apply(move))
+                    for move in position.legal_moves()}
+        remaining_moves[index] = len(children)
+        if not children:
+            values[index] = LOSS
+            solved.append(index)
+        for child in children:
+            sources.append(index)
+            targets.append(child)
+
+    #   the moves leading into every position, grouped by the positions
+    starts = array('I', bytes(4 * (num_of_positions + 1)))
+    for target in targets:
+        starts[target + 1] += 1
+    for index in range(num_of_positions):
+        starts[index + 1] += starts[index]
+    parents = array('I', bytes(4 * len(targets)))
+    filled = array('I', starts)
+    for source, target in zip(sources, targets):
+        parents[filled[target]] = source
+        filled[target] += 1
+    del sources, targets, filled
+
+    #   the positions are solved in the order of their distances,
+    #   so a won one gets the shortest win and a lost one the longest loss
+    next_solved = 0
+    while next_solved < len(solved):
+        index = solved[next_solved]
+        next_solved += 1
+        distance = min(distances[index] + 1, MAX_DISTANCE)
+        lost = values[index] == LOSS
+        for parent in parents[starts[index]:starts[index + 1]]:
+            if values[parent] != UNKNOWN:
+                continue
+            if lost:
+                values[parent] = WIN
+            else:
+                remaining_moves[parent] -= 1
+                if remaining_moves[parent]:
+                    continue
+                values[parent] = LOSS
+            distances[parent] = distance
+            solved.append(parent)
+    for index in range(num_of_positions):
+        if possible[index] and values[index] == UNKNOWN:
+            values[index] = DRAW
+    return values, distances
+
+
+def write_tablebase(path, max_pieces, values, distances):
+    '''Saves the values, packed VALUES_IN_BYTE to a byte, and the distances
+    of the positions as a tablebase file'''
+    packed = bytearray((len(values) + VALUES_IN_BYTE - 1) // VALUES_IN_BYTE)
+    for index, value in enumerate(values):
+        packed[index // VALUES_IN_BYTE] |= value << (
+            VALUE_BITS * (index % VALUES_IN_BYTE))
+    with open(path, 'wb') as tablebase_file:
+        tablebase_file.write(HEADER.pack(TABLEBASE_MAGIC, max_pieces,
+                                         len(values)))
+        tablebase_file.write(packed)
+        tablebase_file.write(distances)
+
+
+class Tablebase:
+    '''
+    Class reading a tablebase file through mmap. The file starts with
+    a HEADER, then come the values of all positions, VALUES_IN_BYTE
+    to a byte, and their distances, a byte each.
+
+    param path: the path to the tablebase file
+    type path: str
+
+    param max_pieces: positions with up to that many pieces are solved
+    type max_pieces: int
+    '''
+
+    def __init__(self, path) -> None:
+        self.path = path
+        with open(path, 'rb') as tablebase_file:
+            self._map = mmap(tablebase_file.fileno(), 0, access=ACCESS_READ)
+        if len(self._map) < HEADER.size:
+            self._map.close()
+            raise ValueError(f'{path} is not a tablebase file')
+        magic, self.max_pieces, num_of_positions = HEADER.unpack_from(
+            self._map)
+        self._indexer = PositionIndexer(self.max_pieces)
+        packed_size = ((num_of_positions + VALUES_IN_BYTE - 1)
+                       // VALUES_IN_BYTE)
+        if (magic != TABLEBASE_MAGIC
+                or num_of_positions != self._indexer.num_of_positions
+                or len(self._map)
+                != HEADER.size + packed_size + num_of_positions):
+            self._map.close()
+            raise ValueError(f'{path} is not a tablebase file')
+        self._distances_start = HEADER.size + packed_size
+
+    def close(self):
+        '''Closes the mapping of the file'''
+        self._map.close()
+
+    def probe(self, position: 'BitBoard'):
+        '''Returns the (value, distance) of a position from the perspective
+        of the player to move, or None if it has too many pieces'''
+        index = self._indexer.index(position)
+        if index is None:
+            return None
+        value = (self._map[HEADER.size + index // VALUES_IN_BYTE] >> (
+            VALUE_BITS * (index % VALUES_IN_BYTE))) & VALUE_MASK
+        return value, self._map[self._distances_start + index]
+
+    def probe_board(self, board):
+        '''The probe method for a Board, it only packs the board into
+        a BitBoard if there are few enough pieces on it'''
+        num_of_pieces = sum(len(pieces)
+                            for pieces in board.pieces_by_colors.values())
+        if num_of_pieces > self.max_pieces:
+            return None
+        return self.probe(BitBoard.from_board(board))
+
+
+def main(arguments=None):
+    '''Generates a tablebase of the positions with few pieces'''
+    parser = ArgumentParser(description=main.__doc__)
+    parser.add_argument('--output', default=TABLEBASE_PATH)
+    parser.add_argument('--pieces', type=int, default=TABLEBASE_PIECES,
+                        help='the maximal number of pieces on the board')
+    arguments = parser.parse_args(arguments)
+    values, distances = generate(arguments.pieces)
+    write_tablebase(arguments.output, arguments.pieces, values, distances)
+    print(f'Saved {len(values)} positions to {arguments.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+from checkers.constants import TT_SIZE_MB, NUM_OF_COLUMNS
+
+
+EXACT = 1
+LOWER_BOUND = 2
+UPPER_BOUND = 3
+
+ENTRIES_IN_BUCKET = 2
+WORDS_IN_ENTRY = 2
+BYTES_IN_WORD = 8
+BUCKET_SIZE = ENTRIES_IN_BUCKET * WORDS_IN_ENTRY * BYTES_IN_WORD
+
+#   layout of the data word of an entry, lowest bits first
+MOVE_BITS = 24
+SCORE_BITS = 24
+DEPTH_BITS = 6
+BOUND_BITS = 2
+AGE_BITS = 8
+
+SCORE_SHIFT = MOVE_BITS
+DEPTH_SHIFT = SCORE_SHIFT + SCORE_BITS
+BOUND_SHIFT = DEPTH_SHIFT + DEPTH_BITS
+AGE_SHIFT = BOUND_SHIFT + BOUND_BITS
+
+MOVE_MASK = (1 << MOVE_BITS) - 1
+SCORE_MASK = (1 << SCORE_BITS) - 1
+DEPTH_MASK = (1 << DEPTH_BITS) - 1
+BOUND_MASK = (1 << BOUND_BITS) - 1
+AGE_MASK = (1 << AGE_BITS) - 1
+KEY_MASK = (1 << 64) - 1
+
+#   scores are stored with an offset, the lowest and highest values
+#   stand for the infinite evaluations of won and lost games
+SCORE_OFFSET = 1 << (SCORE_BITS - 1)
+NEGATIVE_INFINITY_CODE = 0
+POSITIVE_INFINITY_CODE = SCORE_MASK
+
+
+PATH_HASH_MASK = (1 << (MOVE_BITS - 12)) - 1
+
+
+def move_key(move):
+    '''Returns a number identifying a move among the moves possible
+    in a position. It fits into MOVE_BITS and is never 0. The lowest
+    12 bits hold the fields the move starts and ends on, the rest
+    is a hash of the fields landed on along the way.'''
+    old_x, old_y = move.old_cords
+    new_x, new_y = move.new_cords
+    path_hash = 0
+    for x, y in move.path[:-1]:
+        path_hash = (path_hash * 31 + x + NUM_OF_COLUMNS * y + 1) & (
+            PATH_HASH_MASK)
+    return ((old_x + NUM_OF_COLUMNS * old_y)
+            | (new_x + NUM_OF_COLUMNS * new_y) << 6
+            | path_hash << 12)
+
+
+def find_move(moves, key):
+    '''Returns the move from the list with the given move key or None'''
+    for move in moves:
+        if move_key(move) == key:
+            return move
+    return None
+
+
+def encode_score(score):
+    '''Packs an integer (or infinite) score into SCORE_BITS'''
+    if score == float('inf'):
+        return POSITIVE_INFINITY_CODE
+    if score == float('-inf'):
+        return NEGATIVE_INFINITY_CODE
+    return min(max(int(score) + SCORE_OFFSET, NEGATIVE_INFINITY_CODE + 1),
+               POSITIVE_INFINITY_CODE - 1)
+
+
+def decode_score(code):
+    '''Reverses encode_score'''
+    if code == POSITIVE_INFINITY_CODE:
+        return float('inf')
+    if code == NEGATIVE_INFINITY_CODE:
+        return float('-inf')
+    return code - SCORE_OFFSET
+
+
+def table_size_in_bytes(size_mb):
+    '''Returns how many bytes a table of a given size in megabytes uses'''
+    return max(BUCKET_SIZE, int(size_mb * 2 ** 20) // BUCKET_SIZE * (
+        BUCKET_SIZE))
+
+
+class TranspositionTable:
+    '''
+    Fixed size hash table of search results, indexed by the Zobrist keys
+    of the positions.
+
+    Every bucket holds two entries - the first one is only replaced by
+    a search at least as deep or by an entry left from an earlier search,
+    the second one is always replaced. Each entry takes two 64-bit words:
+    the key xored with the data and the data itself, so a half written
+    entry never matches the key it is looked up with.
+
+    param size_mb: how many megabytes the table can take up
+    type size_mb: int
+
+    param buffer: the memory to keep the table in instead of a new
+    bytearray, for example the buf of a SharedMemory, so that many
+    processes can use one table. The size_mb is ignored then.
+    type buffer: writable bytes-like object or None
+
+    param age: the number of the current search, entries from older
+    searches are still used, but they are the first to be replaced
+    type age: int
+
+    param probes, hits: how many times the table was looked up since
+    the last new_search and how many of those times a matching entry
+    was found
+    type probes, hits: int
+    '''
+
+    def __init__(self, size_mb=TT_SIZE_MB, buffer=None) -> None:
+        if buffer is None:
+            buffer = bytearray(table_size_in_bytes(size_mb))
+        self._num_of_buckets = max(1, len(buffer) // BUCKET_SIZE)
+        self._bytes = memoryview(buffer)[:self._num_of_buckets * BUCKET_SIZE]
+        self._words = self._bytes.cast('Q')
+        self.age = 0
+        self.probes = 0
+        self.hits = 0
+
+    @property
+    def num_of_entries(self):
+        '''How many entries fit into the table'''
+        return self._num_of_buckets * ENTRIES_IN_BUCKET
+
+    def release(self):
+        '''Stops using the buffer of the table, so a SharedMemory holding
+        it can be closed. The table cannot be used afterwards.'''
+        self._words.release()
+        self._bytes.release()
+
+    def new_search(self):
+        '''Marks the start of a new search, so the entries of the previous
+        ones can be replaced first, and resets the counters'''
+        self.age = (self.age + 1) & AGE_MASK
+        self.probes = 0
+        self.hits = 0
+
+    def clear(self):
+        '''Removes all entries from the table'''
+        self._bytes[:] = bytes(len(self._bytes))
+
+    def _bucket_index(self, key):
+        return (key % self._num_of_buckets) * (
+            ENTRIES_IN_BUCKET * WORDS_IN_ENTRY)
+
+    def probe(self, key):
+        '''
+        Looks the position up in the table.
+        Returns a (depth, bound, score, move key) tuple or None if the
+        position is not in the table. The move key is 0 if no move
+        was stored.
+        '''
+        self.probes += 1
+        words = self._words
+        index = self._bucket_index(key)
+        for entry_index in (index, index + WORDS_IN_ENTRY):
+            data = words[entry_index + 1]
+            if data and words[entry_index] ^ data == key:
+                self.hits += 1
+                return ((data >> DEPTH_SHIFT) & DEPTH_MASK,
+                        (data >> BOUND_SHIFT) & BOUND_MASK,
+                        decode_score((data >> SCORE_SHIFT) & SCORE_MASK),
+                        data & MOVE_MASK)
+        return None
+
+    def store(self, key, depth, bound, score, best_move_key=0):
+        '''Saves the result of a search of a given depth'''
+        data = (
+            (best_move_key & MOVE_MASK)
+            | encode_score(score) << SCORE_SHIFT
+            | min(depth, DEPTH_MASK) << DEPTH_SHIFT
+            | bound << BOUND_SHIFT
+            | self.age << AGE_SHIFT
+        )
+        words = self._words
+        index = self._bucket_index(key)
+        preferred_data = words[index + 1]
+        always_index = index + WORDS_IN_ENTRY
+        if words[always_index] ^ words[always_index + 1] == key:
+            #   the position is already in the always replaced entry
+            entry_index = always_index
+        elif (not preferred_data
+                or words[index] ^ preferred_data == key
+                or (preferred_data >> AGE_SHIFT) != self.age
+                or ((preferred_data >> DEPTH_SHIFT) & DEPTH_MASK) <= depth):
+            entry_index = index
+        else:
+            entry_index = always_index
+        words[entry_index] = (key ^ data) & KEY_MASK
+        words[entry_index + 1] = data
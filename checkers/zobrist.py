@@ -0,0 +1,24 @@
+from random import Random
+from checkers.constants import NUM_OF_COLUMNS, NUM_OF_ROWS, Color
+
+
+ZOBRIST_SEED = 2022
+KEY_BITS = 64
+
+_random = Random(ZOBRIST_SEED)
+
+#   maps (color, king) of a piece onto a list of random keys indexed
+#   by the field index (x + NUM_OF_COLUMNS * y)
+PIECE_KEYS = {
+    (color, king): [_random.getrandbits(KEY_BITS)
+                    for _ in range(NUM_OF_COLUMNS * NUM_OF_ROWS)]
+    for color in Color for king in (False, True)
+}
+#   xored into the key when black is to move
+BLACK_TO_MOVE_KEY = _random.getrandbits(KEY_BITS)
+
+
+def piece_key(piece):
+    '''Returns the key of a piece standing on its current field'''
+    return PIECE_KEYS[(piece.color, piece.king)][
+        piece.x + NUM_OF_COLUMNS * piece.y]
@@ -0,0 +1,60 @@
+from checkers import batch_evaluation
+from checkers.batch_evaluation import (evaluate_positions, square_weights,
+                                       PIECE_CODES)
+from checkers.bitboard import BitBoard
+from checkers.piece_move_board import Board
+from checkers.player import MinimaxBot
+from checkers.constants import Color
+from random import Random
+import pytest
+
+
+def random_positions(count, seed=0):
+    rng = Random(seed)
+    positions = []
+    board = Board()
+    while len(positions) < count:
+        if board.is_game_over:
+            board = Board()
+        positions.append(BitBoard.from_board(board))
+        board.make_move(rng.choice(board.all_possible_moves(board.turn)))
+    return positions
+
+
+def test_square_weights():
+    weights = square_weights()
+    for square, row in enumerate(weights):
+        for (color, king, _), weight in zip(PIECE_CODES, row):
+            bit = 1 << square
+            position = BitBoard(bit if color == Color.WHITE else 0,
+                                bit if color == Color.BLACK else 0,
+                                bit if king else 0, color)
+            #   evaluate_position ends the game of a lone piece with no moves
+            if not position.is_game_over():
+                assert weight == position.evaluate_position()
+
+
+def test_evaluate_positions():
+    positions = random_positions(300)
+    assert evaluate_positions(positions) == [
+        position.evaluate_position() for position in positions]
+    assert evaluate_positions([]) == []
+
+
+def test_encode_positions():
+    pytest.importorskip('numpy')
+    position = BitBoard.from_board(Board())
+    codes = batch_evaluation.encode_positions([position, position])
+    assert codes.shape == (2, 32)
+    assert list(codes[0]) == [-1] * 12 + [0] * 8 + [1] * 12
+
+
+def test_frontier_agrees_with_the_search_one_by_one(monkeypatch):
+    positions = random_positions(20, seed=3)
+    bot = MinimaxBot(Color.WHITE, 3, False, use_bitboard=True,
+                     batch_frontier=True)
+    batched = [bot.minimax_bitboard(position, 3)[0]
+               for position in positions]
+    monkeypatch.setattr(batch_evaluation, 'np', None)
+    assert batched == [bot.minimax_bitboard(position, 3)[0]
+                       for position in positions]
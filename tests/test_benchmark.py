@@ -0,0 +1,63 @@
+from checkers import benchmark
+from checkers.benchmark import (POSITIONS, benchmark_position, compare,
+                                main, MIN_SLOWDOWN_TIME)
+from checkers.perft import parse_position
+from json import load, dump
+
+
+def test_positions_are_playable():
+    for phase, position in POSITIONS.values():
+        assert phase in ('opening', 'middlegame', 'endgame')
+        assert not parse_position(position).is_game_over
+
+
+def test_benchmark_repeats_exactly():
+    for name in ('start', 'middlegame-open'):
+        first = benchmark_position(name, 3, seed=1)
+        second = benchmark_position(name, 3, seed=1)
+        assert first['nodes'] == second['nodes'] > 0
+        assert first['move'] == second['move']
+
+
+def make_result(time, nodes=100, move='21-17'):
+    return {'position': 'start', 'depth': 4, 'nodes': nodes, 'time': time,
+            'move': move}
+
+
+def test_compare():
+    baseline = [make_result(1.0)]
+    assert compare([make_result(1.2)], baseline, 0.25) == ([], [])
+    regressions, changes = compare([make_result(1.3)], baseline, 0.25)
+    assert (len(regressions), changes) == (1, [])
+    #   short searches differ by more than that between runs
+    short = MIN_SLOWDOWN_TIME / 4
+    assert compare([make_result(short * 2)], [make_result(short)]) == (
+        [], [])
+    assert compare([make_result(5.0)], []) == ([], [])
+
+
+def test_compare_reports_changed_searches(capsys):
+    regressions, changes = compare([make_result(1.0, nodes=120)],
+                                   [make_result(1.0)])
+    assert regressions == []
+    assert changes == ['start at depth 4: 120 nodes and move 21-17, '
+                       'the baseline has 100 nodes and move 21-17']
+    assert capsys.readouterr().out == ''
+
+
+def test_main_saves_and_compares(tmp_path, monkeypatch):
+    output = tmp_path / 'results.json'
+    arguments = ['--depths', '2', '--positions', 'start', 'endgame-hunt']
+    assert main(arguments + ['--output', str(output)]) == 0
+    with open(output) as output_file:
+        results = load(output_file)
+    assert len(results['results']) == 2
+    assert main(arguments + ['--baseline', str(output),
+                             '--max-slowdown', '100']) == 0
+
+    monkeypatch.setattr(benchmark, 'MIN_SLOWDOWN_TIME', 0)
+    for result in results['results']:
+        result['time'] = 0
+    with open(output, 'w') as output_file:
+        dump(results, output_file)
+    assert main(arguments + ['--baseline', str(output)]) == 1
@@ -0,0 +1,134 @@
+from checkers.bitboard import (BitBoard, BitMove, location_to_square,
+                               square_to_location, KING_DIRECTIONS)
+from checkers.piece_move_board import Board, Piece
+from checkers.player import MinimaxBot
+from checkers.constants import Color
+from random import Random
+
+
+def make_position(pieces, turn):
+    '''Creates a BitBoard from a list of (color, x, y, king) tuples'''
+    board_pieces = []
+    for color, x, y, king in pieces:
+        piece = Piece(color, x, y)
+        if king:
+            piece.promote()
+        board_pieces.append(piece)
+    board = Board()
+    board.setup_position(board_pieces, turn)
+    return BitBoard.from_board(board)
+
+
+def test_square_numbering():
+    for square in range(32):
+        x, y = square_to_location(square)
+        assert (x + y) % 2 == 1
+        assert location_to_square((x, y)) == square
+
+
+def test_steps_match_coordinates():
+    for square in range(32):
+        x, y = square_to_location(square)
+        targets = set()
+        for step, reverse_step in KING_DIRECTIONS:
+            target = step(1 << square)
+            if target:
+                targets.add(square_to_location(target.bit_length() - 1))
+                assert reverse_step(target) == 1 << square
+        expected = {(x + dx, y + dy) for dx in (-1, 1) for dy in (-1, 1)
+                    if 0 <= x + dx < 8 and 0 <= y + dy < 8}
+        assert targets == expected
+
+
+def test_from_and_to_board():
+    board = Board()
+    position = BitBoard.from_board(board)
+    assert bin(position.white).count('1') == 12
+    assert bin(position.black).count('1') == 12
+    assert position.kings == 0
+    assert position.turn == Color.WHITE
+    assert len(position.legal_moves()) == 7
+    assert position.evaluate_position() == board.evaluate_position() == 0
+
+    new_board = position.to_board()
+    assert BitBoard.from_board(new_board) == position
+    assert new_board.turn == Color.WHITE
+    assert len(new_board.all_white_pieces()) == 12
+
+
+def test_capture_sequence():
+    position = make_position([
+        (Color.WHITE, 0, 7, False),
+        (Color.BLACK, 1, 6, False),
+        (Color.BLACK, 3, 4, False),
+        (Color.BLACK, 7, 0, False)
+    ], Color.WHITE)
+    moves = position.legal_moves()
+    assert len(moves) == 1
+    move = moves[0]
+    assert [square_to_location(square) for square in move.path] == [
+        (0, 7), (2, 5), (4, 3)]
+    after = position.apply(move)
+    assert after.black == 1 << location_to_square((7, 0))
+    assert after.white == 1 << location_to_square((4, 3))
+    assert after.turn == Color.BLACK
+
+
+def test_promotion_during_capture():
+    position = make_position([
+        (Color.WHITE, 1, 2, False),
+        (Color.BLACK, 2, 1, False),
+        (Color.BLACK, 4, 1, False),
+    ], Color.WHITE)
+    move = BitMove(tuple(location_to_square(location)
+                         for location in ((1, 2), (3, 0), (5, 2))),
+                   position.black)
+    assert move in position.legal_moves()
+    after = position.apply(move)
+    assert after.black == 0
+    assert after.kings == after.white
+
+
+def test_minimax_bitboard_takes_the_free_piece():
+    position = make_position([
+        (Color.WHITE, 0, 7, False),
+        (Color.WHITE, 6, 7, False),
+        (Color.BLACK, 1, 6, False),
+        (Color.BLACK, 7, 0, False)
+    ], Color.WHITE)
+    bot = MinimaxBot(Color.WHITE, 3, False, use_bitboard=True)
+    evaluation, move = bot.minimax_bitboard(position, 3)
+    assert move.attacking
+    assert evaluation > 0
+
+    board = position.to_board()
+    board_move = bot.search(board, 3)
+    assert board_move.attacking
+    assert board_move.old_cords == (0, 7)
+    assert board_move.new_cords == (2, 5)
+
+
+def test_board_and_bitboard_generate_the_same_moves():
+    rng = Random(7)
+    for _ in range(10):
+        board = Board()
+        board.debug_move_generation = True
+        while not board.is_game_over:
+            position = BitBoard.from_board(board)
+            board_moves = {
+                (location_to_square(move.old_cords),) + tuple(
+                    location_to_square(landing) for landing in move.landings)
+                for move in board.all_possible_moves(board.turn)}
+            assert board_moves == {move.path
+                                   for move in position.legal_moves()}
+            assert position.evaluate_position() == board.evaluate_position()
+            move = rng.choice(board.all_possible_moves(board.turn))
+            board.make_move(move)
+            assert BitBoard.from_board(board) == position.apply(
+                BitMove(
+                    (location_to_square(move.old_cords),) + tuple(
+                        location_to_square(landing)
+                        for landing in move.landings),
+                    sum(1 << location_to_square(piece.location)
+                        for piece in board.captured_pieces(move))
+                    if move.attacking else 0))
@@ -1,6 +1,9 @@
-from checkers.piece_move_board import Board, Move
+from checkers.piece_move_board import Board, Move, Piece
 from checkers.constants import Color, BROWN, BEIGE
+from checkers.evaluation import (MAN_VALUE, KING_VALUE, ADVANCE_BONUS,
+                                 BACK_RANK_BONUS, KING_MOBILITY_BONUS)
 from copy import copy
+from random import Random
 
 
 def test_board_init():
@@ -55,6 +58,10 @@ def test_get_field_by_location():
     field_at_3_2 = board.get_field_by_location((3, 2))
     assert field_at_3_2.x == 3
     assert field_at_3_2.y == 2
+    assert board.one_dimensional_field_list[3 + 8 * 2] is field_at_3_2
+    assert board.fields[3][2] is field_at_3_2
+    assert board.get_field_by_location((8, 2)) is None
+    assert board.get_field_by_location((3, -1)) is None
 
 
 def test_delete_piece():
@@ -131,10 +138,30 @@ def test_evaluate_position():
     assert board.evaluate_position() == 0
     piece_to_del = board.get_field_by_location((0, 7)).piece
     board.delete_piece(piece_to_del)
-    assert board.evaluate_position() == -3
+    lost_score = MAN_VALUE + BACK_RANK_BONUS
+    assert board.evaluate_position() == -lost_score
     piece_to_promote = board.get_field_by_location((7, 6)).piece
-    piece_to_promote.promote()
-    assert board.evaluate_position() == -1
+    board.promote(piece_to_promote)
+    #   the king on the edge can step onto two fields
+    assert board.evaluate_position() == (
+        -lost_score + KING_VALUE + 2 * KING_MOBILITY_BONUS
+        - MAN_VALUE - ADVANCE_BONUS)
+
+
+def test_scores_follow_the_moves():
+    rng = Random(11)
+    for _ in range(5):
+        board = Board()
+        while not board.is_game_over:
+            move = rng.choice(board.all_possible_moves(board.turn))
+            before = board.evaluate_position()
+            record = board.make_move(move)
+            assert (board.material, board.positional) == (
+                board.compute_scores())
+            board.unmake_move(record)
+            assert board.evaluate_position() == before
+            board.handle_move(move)
+        assert (board.material, board.positional) == board.compute_scores()
 
 
 def test_player_has_moving_options_and_winner():
@@ -169,3 +196,159 @@ def test_jumped_piece_and_has_to_jump():
     assert len(board.moves_by_colors[Color.WHITE][first_piece]) == 1
     attacking_move = board.moves_by_colors[Color.WHITE][first_piece][0]
     assert board.get_jumped_piece(attacking_move) == second_piece
+    board.handle_move(attacking_move)
+    assert board.moves_without_attacks == 0
+
+
+def board_snapshot(board):
+    return (
+        sorted((piece.location, piece.color.value, piece.king)
+               for pieces in board.pieces_by_colors.values()
+               for piece in pieces),
+        [field.piece for field in board.one_dimensional_field_list],
+        board.turn, board.moves_without_attacks, board.ply,
+        board.is_game_over,
+        dict(board.mandatory_attacks),
+        {color: dict(moves) for color, moves in board.moves_by_colors.items()}
+    )
+
+
+def test_make_and_unmake_move():
+    board = Board()
+    for move in [Move(False, (0, 5), (1, 4), None),
+                 Move(False, (3, 2), (2, 3), None)]:
+        piece = board.get_field_by_location(move.old_cords).piece
+        board.handle_move(Move(False, move.old_cords, move.new_cords, piece))
+
+    before = board_snapshot(board)
+    attacking_move = board.all_possible_moves(Color.WHITE)[0]
+    assert attacking_move.attacking
+    record = board.make_move(attacking_move)
+    assert len(record.captured_pieces) == 1
+    assert len(board.all_black_pieces()) == 11
+    board.unmake_move(record)
+    assert board_snapshot(board) == before
+
+    for move in board.all_possible_moves(board.turn):
+        record = board.make_move(move)
+        for reply in board.all_possible_moves(board.turn):
+            board.unmake_move(board.make_move(reply))
+        board.unmake_move(record)
+        assert board_snapshot(board) == before
+
+
+def test_unmake_promotion():
+    board = Board()
+    piece = Piece(Color.WHITE, 1, 2)
+    board.setup_position([piece, Piece(Color.BLACK, 2, 1),
+                          Piece(Color.BLACK, 6, 1)], Color.WHITE)
+    record = board.make_move(board.moves_by_colors[Color.WHITE][piece][0])
+    assert record.promoted
+    assert piece.king
+    board.unmake_move(record)
+    assert not piece.king
+    assert piece.image_dict_ind == 'WP'
+    assert piece.location == (1, 2)
+    assert len(board.all_black_pieces()) == 2
+
+
+def test_incremental_moves_match_full_generation():
+    rng = Random(0)
+    for _ in range(20):
+        board = Board()
+        board.debug_move_generation = True
+        records = []
+        while not board.is_game_over and len(records) < 200:
+            moves = board.all_possible_moves(board.turn)
+            records.append(board.make_move(rng.choice(moves)))
+        while records:
+            board.unmake_move(records.pop())
+            board._check_moves_by_colors()
+
+
+def test_zobrist_key_is_updated_incrementally():
+    rng = Random(1)
+    board = Board()
+    start_key = board.zobrist_key
+    assert start_key == board.compute_zobrist_key()
+    records = []
+    while not board.is_game_over and len(records) < 150:
+        moves = board.all_possible_moves(board.turn)
+        records.append(board.make_move(rng.choice(moves)))
+        assert board.zobrist_key == board.compute_zobrist_key()
+    while records:
+        board.unmake_move(records.pop())
+    assert board.zobrist_key == start_key
+
+
+def test_zobrist_key_of_transposed_positions():
+    def play(moves):
+        board = Board()
+        for old_cords, new_cords in moves:
+            piece = board.get_field_by_location(old_cords).piece
+            board.handle_move(Move(False, old_cords, new_cords, piece))
+        return board
+
+    first = play([((0, 5), (1, 4)), ((1, 2), (0, 3)),
+                  ((2, 5), (3, 4)), ((3, 2), (2, 3))])
+    second = play([((2, 5), (3, 4)), ((3, 2), (2, 3)),
+                   ((0, 5), (1, 4)), ((1, 2), (0, 3))])
+    assert first.zobrist_key == second.zobrist_key
+    assert first.zobrist_key != Board().zobrist_key
+    first.change_turn()
+    assert first.zobrist_key != second.zobrist_key
+
+
+def test_sequence_of_jumps_is_one_move():
+    board = Board()
+    white_piece = Piece(Color.WHITE, 0, 7)
+    first_black, second_black = Piece(Color.BLACK, 1, 6), Piece(
+        Color.BLACK, 3, 4)
+    board.setup_position([white_piece, first_black, second_black,
+                          Piece(Color.BLACK, 7, 0)], Color.WHITE)
+    assert board.mandatory_attacks[Color.WHITE]
+    moves = board.moves_by_colors[Color.WHITE][white_piece]
+    assert len(moves) == 1
+    move = moves[0]
+    assert move.new_cords == (4, 3)
+    assert move.path == ((2, 5), (4, 3))
+    assert move.captured_pieces == (first_black, second_black)
+
+    before = board_snapshot(board)
+    record = board.make_move(move)
+    assert board.turn == Color.BLACK
+    assert board.all_black_pieces() == [board.get_field_by_location(
+        (7, 0)).piece]
+    assert board.zobrist_key == board.compute_zobrist_key()
+    board.unmake_move(record)
+    assert board_snapshot(board) == before
+
+
+def test_iter_children():
+    board = Board()
+    before = board_snapshot(board)
+    keys = set()
+    for move in board.iter_children():
+        assert move.piece.location == move.new_cords
+        assert board.turn == Color.BLACK
+        keys.add(board.zobrist_key)
+    assert len(keys) == 7
+    assert board_snapshot(board) == before
+
+    children = board.iter_children()
+    next(children)
+    assert board_snapshot(board) != before
+    children.close()
+    assert board_snapshot(board) == before
+
+
+def test_staged_moves_start_with_attacks():
+    board = Board()
+    white_piece = Piece(Color.WHITE, 2, 5)
+    board.setup_position([white_piece, Piece(Color.WHITE, 6, 5),
+                          Piece(Color.BLACK, 3, 4)], Color.WHITE)
+    moves = list(board.staged_moves(Color.WHITE))
+    assert [move.attacking for move in moves] == [True]
+    board.setup_position([white_piece, Piece(Color.WHITE, 6, 5),
+                          Piece(Color.BLACK, 3, 2)], Color.WHITE)
+    assert len(list(board.staged_moves(Color.WHITE))) == 4
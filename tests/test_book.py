@@ -0,0 +1,57 @@
+from checkers.book import OpeningBook, build_book, write_book
+from checkers.piece_move_board import Board
+from checkers.player import MinimaxBot
+from checkers.constants import Color, BOOK_PATH
+from checkers.transposition import move_key
+import pytest
+
+
+def test_build_write_and_probe_book(tmp_path):
+    moves_by_keys = build_book(plies=2, search_depth=2)
+    #   the starting position and the positions after each white move
+    assert len(moves_by_keys) == 1 + len(
+        Board().all_possible_moves(Color.WHITE))
+    path = tmp_path / 'book.bin'
+    write_book(path, moves_by_keys)
+    book = OpeningBook(path)
+    assert len(book) == len(moves_by_keys)
+    for key, stored_move_key in moves_by_keys.items():
+        assert book.probe(key) == stored_move_key
+    assert book.probe(12345) is None
+    board = Board()
+    assert move_key(book.find_move(board)) == moves_by_keys[board.zobrist_key]
+    book.close()
+
+
+def test_bot_takes_moves_from_the_book(tmp_path):
+    board = Board()
+    book_move = board.all_possible_moves(Color.WHITE)[3]
+    path = tmp_path / 'book.bin'
+    write_book(path, {board.zobrist_key: move_key(book_move)})
+    bot = MinimaxBot(Color.WHITE, 4, False, book_path=path, book_depth=1)
+    assert bot.book_move(board) == book_move
+    board.handle_move(book_move)
+    board.handle_move(board.all_possible_moves(Color.BLACK)[0])
+    assert board.ply == 2
+    assert bot.book_move(board) is None
+    assert MinimaxBot(Color.WHITE, 4, False,
+                      book_path=tmp_path / 'none.bin').opening_book is None
+
+
+def test_not_a_book_file(tmp_path):
+    path = tmp_path / 'book.bin'
+    path.write_bytes(b'not a book file at all')
+    with pytest.raises(ValueError):
+        OpeningBook(path)
+    path.write_bytes(b'CKRSBOOK')
+    with pytest.raises(ValueError):
+        OpeningBook(path)
+
+
+def test_book_and_tablebase_are_opt_in(tmp_path, monkeypatch):
+    board = Board()
+    write_book(tmp_path / BOOK_PATH, {
+        board.zobrist_key: move_key(board.all_possible_moves(Color.WHITE)[0])})
+    monkeypatch.chdir(tmp_path)
+    bot = MinimaxBot(Color.WHITE, 2, False)
+    assert bot.opening_book is None and bot.tablebase is None
@@ -1,6 +1,7 @@
 from checkers.game import Game
 from checkers.player import Player, MinimaxBot
 from checkers.constants import (Color, SLEEP_TIME_IN_PVB_GAME, Placeholder)
+from checkers.piece_move_board import Piece
 
 
 def test_game_init(monkeypatch):
@@ -31,3 +32,60 @@ def test_game_interpret_clicked_location(monkeypatch):
     clicked_piece = clicked_field.piece
     assert (game.interpret_clicked_pixel_location(click_location_1)
             == (clicked_field, clicked_piece))
+
+
+def two_jumps_ending_on_one_field(monkeypatch):
+    '''Returns a game in which the white man on (2, 5) can reach (2, 1)
+    by jumping either through (0, 3) or through (4, 3)'''
+    monkeypatch.setattr('checkers.game.Game.load_images', lambda x: None)
+    monkeypatch.setattr('checkers.game.Game.draw_board', lambda x: None)
+    highlighted = []
+    monkeypatch.setattr('checkers.game.Game.highlight_field',
+                        lambda game, field: highlighted.append(field.location))
+    game = Game(Placeholder.SCREEN, [Player(Color.WHITE),
+                                     Player(Color.BLACK)])
+    game.board.setup_position(
+        [Piece(Color.WHITE, 2, 5), Piece(Color.BLACK, 1, 4),
+         Piece(Color.BLACK, 3, 4), Piece(Color.BLACK, 1, 2),
+         Piece(Color.BLACK, 3, 2)], Color.WHITE)
+    game.selected_piece = game.board.get_field_by_location((2, 5)).piece
+    return game, highlighted
+
+
+def test_game_jump_sequences_ending_on_one_field(monkeypatch):
+    game, highlighted = two_jumps_ending_on_one_field(monkeypatch)
+    moves = game.board.all_possible_moves(Color.WHITE)
+    assert sorted(move.landings for move in moves) == [
+        ((0, 3), (2, 1)), ((4, 3), (2, 1))]
+
+    #   clicking the end field only highlights where the sequences go
+    game.handle_field_click(game.board.get_field_by_location((2, 1)))
+    assert game.board.turn == Color.WHITE
+    assert sorted(highlighted) == [(0, 3), (4, 3)]
+
+    game.handle_field_click(game.board.get_field_by_location((4, 3)))
+    assert game.board.turn == Color.BLACK
+    assert game.selected_piece is None
+    remaining = {piece.location
+                 for piece in game.board.pieces_by_colors[Color.BLACK]}
+    assert remaining == {(1, 4), (1, 2)}
+
+
+def test_game_clicks_on_the_landings(monkeypatch):
+    game, highlighted = two_jumps_ending_on_one_field(monkeypatch)
+    game.handle_field_click(game.board.get_field_by_location((0, 3)))
+    assert game.board.turn == Color.BLACK
+    remaining = {piece.location
+                 for piece in game.board.pieces_by_colors[Color.BLACK]}
+    assert remaining == {(3, 4), (3, 2)}
+
+
+def test_game_apply_move(monkeypatch):
+    game, _ = two_jumps_ending_on_one_field(monkeypatch)
+    move = next(move for move in game.board.all_possible_moves(Color.WHITE)
+                if move.landings[0] == (4, 3))
+    game.apply_move(move)
+    remaining = {piece.location
+                 for piece in game.board.pieces_by_colors[Color.BLACK]}
+    assert remaining == {(1, 4), (1, 2)}
+    assert game.board.moves_without_attacks == 0
@@ -0,0 +1,67 @@
+from checkers.move_ordering import MoveOrdering
+from checkers.transposition import move_key
+from checkers.piece_move_board import Board, Move, Piece
+from checkers.constants import Color
+
+
+def test_order_of_move_sources():
+    board = Board()
+    moves = board.all_possible_moves(Color.WHITE)
+    ordering = MoveOrdering()
+    killer, history_move, table_move = moves[1], moves[2], moves[5]
+    ordering.record_cutoff(killer, 3, 2, 0)
+    ordering.history[move_key(history_move) & 0xFFF] = 50
+    ordered = ordering.order(moves, 3, move_key(table_move))
+    assert ordered[:3] == [table_move, killer, history_move]
+    assert sorted(map(move_key, ordered)) == sorted(map(move_key, moves))
+    #   killers are kept separately for every ply
+    assert ordering.order(moves, 2)[0] == history_move
+
+
+def test_attacks_and_promotions_first():
+    white_piece = Piece(Color.WHITE, 1, 1)
+    passive_move = Move(False, (1, 1), (2, 2), white_piece)
+    promotion = Move(False, (1, 1), (0, 0), white_piece)
+    single_attack = Move(True, (1, 1), (3, 3), white_piece)
+    double_attack = Move(True, (1, 1), (5, 5), white_piece,
+                         ((3, 3), (5, 5)), (None, None))
+    ordered = MoveOrdering().order(
+        [passive_move, promotion, single_attack, double_attack], 0)
+    assert ordered == [double_attack, single_attack, promotion, passive_move]
+
+
+def test_cutoff_counters_and_aging():
+    board = Board()
+    moves = board.all_possible_moves(Color.WHITE)
+    ordering = MoveOrdering()
+    ordering.record_cutoff(moves[0], 0, 3, 0)
+    ordering.record_cutoff(moves[1], 0, 2, 4)
+    assert ordering.cutoffs == 2
+    assert ordering.first_move_cutoffs == 1
+    assert ordering.cutoffs_by_move_number == {0: 1, 4: 1}
+    assert ordering.killers[0] == [move_key(moves[1]), move_key(moves[0])]
+    assert ordering.history[move_key(moves[0]) & 0xFFF] == 9
+    ordering.new_search()
+    assert ordering.killers == []
+    assert ordering.cutoffs == 0
+    assert ordering.cutoffs_by_move_number == {}
+    assert ordering.history[move_key(moves[0]) & 0xFFF] == 4
+
+
+def test_principal_variation_move_before_table_move():
+    moves = Board().all_possible_moves(Color.WHITE)
+    ordered = MoveOrdering().order(
+        moves, 0, move_key(moves[2]), move_key(moves[4]))
+    assert ordered[:2] == [moves[4], moves[2]]
+
+
+def test_root_rotation():
+    board = Board()
+    moves = board.all_possible_moves(Color.WHITE)
+    assert MoveOrdering().order(moves, 0) == moves
+    rotated = MoveOrdering(root_rotation=2)
+    assert rotated.order(moves, 0) == moves[2:] + moves[:2]
+    #   only the root is rotated and the best moves still come first
+    assert rotated.order(moves, 1) == moves
+    assert rotated.order(moves, 0, pv_move_key=move_key(moves[4]))[0] == (
+        moves[4])
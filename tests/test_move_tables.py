@@ -0,0 +1,31 @@
+from checkers.move_tables import (MOVE_TABLES, field_index, PLUS_MINUS,
+                                  MINUS_MINUS)
+from checkers.constants import Color, NUM_OF_COLUMNS, NUM_OF_ROWS
+
+
+def test_tables_cover_playable_fields():
+    for (color, king), table in MOVE_TABLES.items():
+        assert len(table) == NUM_OF_COLUMNS * NUM_OF_ROWS
+        #   men have no moves from the row they get promoted on
+        expected_fields = 32 if king else 28
+        assert sum(1 for entries in table if entries) == expected_fields
+
+
+def test_white_man_entries():
+    table = MOVE_TABLES[(Color.WHITE, False)]
+    entries = table[field_index((1, 2))]
+    assert [entry[0] for entry in entries] == [PLUS_MINUS, MINUS_MINUS]
+    assert entries[0][1:] == ((2, 1), field_index((2, 1)),
+                              (3, 0), field_index((3, 0)))
+    assert entries[1][1:] == ((0, 1), field_index((0, 1)), None, -1)
+    assert table[field_index((1, 0))] == ()
+
+
+def test_king_entries():
+    king_table = MOVE_TABLES[(Color.BLACK, True)]
+    assert king_table is MOVE_TABLES[(Color.WHITE, True)]
+    assert len(king_table[field_index((3, 4))]) == 4
+    corner_entries = king_table[field_index((0, 7))]
+    assert len(corner_entries) == 1
+    assert corner_entries[0][1] == (1, 6)
+    assert corner_entries[0][3] == (2, 5)
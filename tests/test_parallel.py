@@ -0,0 +1,138 @@
+from checkers import parallel
+from checkers.parallel import (ParallelSearch, LazySMPSearch,
+                               encode_position, decode_position,
+                               benchmark_boards, move_id, _init_worker,
+                               _search_root_move)
+from checkers.player import MinimaxBot
+from checkers.constants import Color
+from multiprocessing import Value
+from multiprocessing.shared_memory import SharedMemory
+import pytest
+
+
+def test_encoded_position_round_trip():
+    for board in benchmark_boards(3, seed=1):
+        board.moves_without_attacks = 7
+        decoded = decode_position(encode_position(board))
+        assert decoded.zobrist_key == board.zobrist_key
+        assert decoded.turn == board.turn
+        assert decoded.moves_without_attacks == 7
+        assert encode_position(decoded) == encode_position(board)
+
+
+def test_parallel_search_agrees_with_one_process():
+    search = ParallelSearch(2, tt_size_mb=0)
+    bot = MinimaxBot(Color.WHITE, 3, False, tt_size_mb=0)
+    try:
+        for board in benchmark_boards(3, seed=2):
+            score, move, nodes = search.search(board, 3)
+            assert score == bot.minimax(board, 3)[0]
+            assert move in board.all_possible_moves(board.turn)
+            assert nodes > 0
+    finally:
+        search.close()
+
+
+def test_lazy_smp_search():
+    search = LazySMPSearch(2, tt_size_mb=1)
+    try:
+        for board in benchmark_boards(2, seed=3):
+            depth, score, move, nodes = search.search(board, 3)
+            if len(board.all_possible_moves(board.turn)) == 1:
+                #   a forced move is only searched to depth 1
+                assert depth == 1
+            else:
+                assert depth in (3, 4)
+            assert move in board.all_possible_moves(board.turn)
+            assert nodes > 0
+    finally:
+        search.close()
+
+
+def test_bot_with_lazy_smp():
+    bot = MinimaxBot(Color.WHITE, 3, False, workers=2, lazy_smp=True)
+    assert bot.parallel_search is None
+    board = benchmark_boards(1)[0]
+    try:
+        move = bot.iterative_deepening(board)
+        memory_name = bot.lazy_smp._memory.name
+        processes = list(bot.lazy_smp._processes)
+    finally:
+        bot.close()
+    assert bot.lazy_smp._memory is None
+    assert not any(process.is_alive() for process in processes)
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=memory_name)
+    assert bot.completed_depth >= 3
+    assert move in board.all_possible_moves(board.turn)
+
+
+def test_bot_close_stops_the_pool():
+    bot = MinimaxBot(Color.WHITE, 2, False, workers=2, lazy_smp=False)
+    board = benchmark_boards(1)[0]
+    try:
+        bot.iterative_deepening(board)
+        processes = list(bot.parallel_search._pool._pool)
+        assert processes
+    finally:
+        bot.close()
+    assert bot.parallel_search._pool is None
+    assert not any(process.is_alive() for process in processes)
+    #   the next search starts the pool again
+    try:
+        assert bot.iterative_deepening(board) is not None
+    finally:
+        bot.close()
+
+
+def test_workers_start_every_search_anew():
+    shared_alpha = Value('d', float('-inf'))
+    _init_worker(True, 1, shared_alpha)
+    bot = parallel._worker_bot
+    board = benchmark_boards(1)[0]
+    encoded = encode_position(board)
+    moves = [move_id(move) for move in board.all_possible_moves(board.turn)]
+    _search_root_move((encoded, moves[0], 4, None, 1))
+    assert bot.transposition_table.age == 1
+    history = dict(bot.move_ordering.history)
+    assert history
+    #   the tasks of the same search keep what the earlier ones found
+    _search_root_move((encoded, moves[1], 4, None, 1))
+    assert all(bot.move_ordering.history.get(key, 0) >= score
+               for key, score in history.items())
+    history = dict(bot.move_ordering.history)
+    bot.move_ordering.killers.append([1])
+    shared_alpha.value = float('-inf')
+    _search_root_move((encoded, moves[0], 1, None, 2))
+    assert bot.transposition_table.age == 2
+    assert [1] not in bot.move_ordering.killers
+
+
+def test_parallel_bot_has_no_table_of_its_own():
+    bot = MinimaxBot(Color.WHITE, 2, False, workers=2, lazy_smp=False)
+    assert bot.transposition_table is None
+    board = benchmark_boards(1)[0]
+    try:
+        bot.choose_move(board)
+        assert bot.parallel_search.age == 1
+    finally:
+        bot.close()
+
+
+def test_lazy_smp_search_fails_when_a_worker_dies(monkeypatch):
+    monkeypatch.setattr(parallel, 'RESULT_WAIT_TIME', 0.05)
+    search = LazySMPSearch(2, tt_size_mb=1)
+    board = benchmark_boards(1)[0]
+    try:
+        search.start()
+        memory_name = search._memory.name
+        search._processes[0].kill()
+        search._processes[0].join()
+        with pytest.raises(RuntimeError):
+            search.search(board, 3)
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=memory_name)
+        #   the next search starts new workers
+        assert search.search(board, 2)[0] >= 2
+    finally:
+        search.close()
@@ -0,0 +1,78 @@
+from checkers.perft import (perft, perft_bitboard, divide, divide_bitboard,
+                            format_position, parse_position, move_name,
+                            bit_move_name, main, REFERENCE_COUNTS)
+from checkers.bitboard import BitBoard
+from checkers.piece_move_board import Board
+from checkers.constants import Color
+import pytest
+
+
+def test_perft_of_the_starting_position():
+    board = Board()
+    key = board.zobrist_key
+    for depth in range(1, 5):
+        assert perft(board, depth) == REFERENCE_COUNTS[depth]
+    assert board.zobrist_key == key
+    assert perft(board, 0) == 1
+
+
+def test_bitboard_perft_agrees():
+    board = parse_position('B:W18,K26,27,30:B6,10,K14,15')
+    position = BitBoard.from_board(board)
+    for depth in range(1, 5):
+        assert perft_bitboard(position, depth) == perft(board, depth)
+
+
+def test_divide():
+    board = Board()
+    results = divide(board, 3)
+    assert len(results) == 7
+    assert sum(count for _, count in results) == REFERENCE_COUNTS[3]
+    assert {move_name(move) for move, _ in results} == {
+        '21-17', '22-18', '22-17', '23-19', '23-18', '24-20', '24-19'}
+
+
+def test_bitboard_divide_agrees():
+    board = parse_position('B:W18,K26,27,30:B6,10,K14,15')
+    results = {move_name(move): count for move, count in divide(board, 3)}
+    assert {bit_move_name(move): count for move, count in divide_bitboard(
+        BitBoard.from_board(board), 3)} == results
+    assert any('x' in name for name in results)
+
+
+def test_format_and_parse_position():
+    text = 'B:W18,K26,27,30:B6,10,K14,15'
+    board = parse_position(text)
+    assert board.turn == Color.BLACK
+    assert len(board.pieces_by_colors[Color.WHITE]) == 4
+    assert board.get_field_by_location((3, 6)).piece.king
+    assert format_position(board) == text
+    assert parse_position(format_position(Board())).zobrist_key == (
+        Board().zobrist_key)
+
+
+def test_parse_invalid_position():
+    for text in ('X:W1:B2', 'W:W1', 'W:W40:B2', 'W:W1:Q2', 'W:W2x:B1',
+                 'W:WK:B1', 'W:W1,1:B2', 'W:W1:B1'):
+        with pytest.raises(ValueError):
+            parse_position(text)
+
+
+def test_main(capsys):
+    assert main(['--depth', '3']) == 0
+    assert 'matches the reference count' in capsys.readouterr().out
+    assert main(['--depth', '2', '--divide', '--bitboard']) == 0
+    bitboard_output = capsys.readouterr().out
+    assert main(['--depth', '2', '--divide']) == 0
+    output = capsys.readouterr().out
+    #   the lines of the moves, without the one with the time taken
+    assert bitboard_output.splitlines()[:-2] == output.splitlines()[:-2]
+    assert '22-18: 7' in bitboard_output
+
+
+def test_main_rejects_invalid_positions(capsys):
+    for text in ('X:W2:B1', 'W:W2x:B1'):
+        with pytest.raises(SystemExit) as error:
+            main(['--position', text])
+        assert error.value.code == 2
+        assert f'{text} is not a valid position' in capsys.readouterr().err
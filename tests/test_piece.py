@@ -1,10 +1,11 @@
 from checkers.piece_move_board import Piece, Move
 from checkers.constants import Color
+from checkers.evaluation import MAN_VALUE, KING_VALUE
 
 
 def test_init():
     piece = Piece(Color.WHITE, 7, 6)
-    assert piece.value == 3
+    assert piece.value == MAN_VALUE
     assert not piece.king
     assert piece.x == 7
     assert piece.y == 6
@@ -15,7 +16,7 @@ def test_init():
 def test_promote():
     piece = Piece(Color.BLACK, 0, 1)
     piece.promote()
-    assert piece.value == 5
+    assert piece.value == KING_VALUE
     assert piece.image_dict_ind == 'BK'
     assert piece.king
 
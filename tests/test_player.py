@@ -1,5 +1,15 @@
 from checkers.player import Player, RandomBot, MinimaxBot
 from checkers.constants import Color, Placeholder
+from checkers.piece_move_board import Board, Move, Piece
+from time import time
+from checkers.transposition import move_key
+from random import Random
+from json import loads
+from threading import Event
+import pytest
+from checkers.constants import NODES_BETWEEN_TIME_CHECKS
+from checkers.perft import parse_position
+from checkers.player import SearchTimeout
 
 
 def test_init_player():
@@ -25,3 +35,160 @@ def test_minimaxbot_init_and_methods():
     assert player.color == Color.WHITE
     assert player.minimizing_or_maximizing(Color.WHITE)
     assert not player.minimizing_or_maximizing(Color.BLACK)
+
+
+def test_transposition_table_keeps_minimax_results():
+    board = Board()
+    for old_cords, new_cords in [((2, 5), (3, 4)), ((1, 2), (0, 3))]:
+        piece = board.get_field_by_location(old_cords).piece
+        board.handle_move(Move(False, old_cords, new_cords, piece))
+    plain_bot = MinimaxBot(Color.WHITE, 4, False, tt_size_mb=0)
+    table_bot = MinimaxBot(Color.WHITE, 4, False, tt_size_mb=1)
+    assert plain_bot.transposition_table is None
+    for depth in range(1, 5):
+        assert (plain_bot.minimax(board, depth)[0]
+                == table_bot.minimax(board, depth)[0])
+    assert table_bot.transposition_table.hits > 0
+
+
+def test_time_limit_interrupts_the_search():
+    board = Board()
+    key = board.zobrist_key
+    moves = board.all_possible_moves(Color.WHITE)
+    bot = MinimaxBot(Color.WHITE, 10, 0.05)
+    start = time()
+    move = bot.iterative_deepening(board)
+    assert time() - start < 1
+    assert 1 <= bot.completed_depth < 10
+    assert move in moves
+    #   the abandoned iteration leaves the board as it was
+    assert board.zobrist_key == key
+    assert board.all_possible_moves(Color.WHITE) == moves
+
+
+def test_principal_variation_of_completed_iterations():
+    board = Board()
+    bot = MinimaxBot(Color.WHITE, 4, False)
+    move = bot.iterative_deepening(board)
+    assert bot.completed_depth == 4
+    assert bot.principal_variation[0] == move
+    assert 1 <= len(bot.principal_variation) <= 4
+    for pv_move in bot.principal_variation:
+        assert pv_move in board.all_possible_moves(board.turn)
+        board.handle_move(pv_move)
+
+
+def test_principal_variation_search_agrees_with_minimax():
+    rng = Random(3)
+    for _ in range(3):
+        board = Board()
+        for _ in range(rng.randint(4, 16)):
+            board.handle_move(rng.choice(board.all_possible_moves(board.turn)))
+        minimax_bot = MinimaxBot(Color.WHITE, 4, False, tt_size_mb=0,
+                                 use_pvs=False)
+        pvs_bot = MinimaxBot(Color.WHITE, 4, False, tt_size_mb=0)
+        sign = 1 if board.turn == Color.WHITE else -1
+        for depth in range(1, 5):
+            score = minimax_bot.minimax(board, depth)[0]
+            assert sign * pvs_bot.negamax(board, depth)[0] == score
+            #   a window missing the score has to be opened again
+            assert pvs_bot.aspiration_search(board, depth, score + 10)[0] == (
+                score)
+
+
+def test_quiescence_sees_the_recapture():
+    board = Board()
+    board.setup_position([
+        Piece(Color.WHITE, 3, 4), Piece(Color.WHITE, 0, 7),
+        Piece(Color.BLACK, 4, 3), Piece(Color.BLACK, 4, 1),
+        Piece(Color.BLACK, 3, 0)], Color.WHITE)
+    for use_pvs in (False, True):
+        bot = MinimaxBot(Color.WHITE, 1, False, use_pvs=use_pvs)
+        bot.search(board, 1)
+        #   taking the piece loses one more to the forced recapture
+        assert bot.score < 0
+        assert bot.quiescence_nodes > 0
+    bot = MinimaxBot(Color.WHITE, 1, False, use_bitboard=True)
+    bot.search(board, 1)
+    assert bot.score < 0
+
+
+def test_pondering_on_the_predicted_reply():
+    board = Board()
+    bot = MinimaxBot(Color.WHITE, 4, False)
+    board.handle_move(bot.iterative_deepening(board))
+    predicted_reply = bot.principal_variation[1]
+    bot.start_pondering(board)
+    board.handle_move(next(
+        move for move in board.all_possible_moves(board.turn)
+        if move_key(move) == move_key(predicted_reply)))
+    move = bot.finish_pondering(board)
+    moves = board.all_possible_moves(board.turn)
+    assert move in moves
+    #   a forced move is only searched to depth 1
+    assert bot.completed_depth == (1 if len(moves) == 1 else 4)
+    assert bot.finish_pondering(board) is None
+
+
+def test_pondering_on_a_wrong_prediction():
+    board = Board()
+    bot = MinimaxBot(Color.WHITE, 4, False)
+    board.handle_move(bot.iterative_deepening(board))
+    predicted_reply = bot.principal_variation[1]
+    bot.start_pondering(board)
+    board.handle_move(next(
+        move for move in board.all_possible_moves(board.turn)
+        if move_key(move) != move_key(predicted_reply)))
+    assert bot.finish_pondering(board) is None
+    assert bot.stop_signal is None
+    forced = len(board.all_possible_moves(board.turn)) == 1
+    bot.make_move(board)
+    assert bot.completed_depth == (1 if forced else 4)
+
+
+def test_statistics_of_the_moves(tmp_path):
+    log_path = tmp_path / 'stats.jsonl'
+    board = Board()
+    bot = MinimaxBot(Color.WHITE, 4, False, stats_log=str(log_path))
+    bot.make_move(board)
+    stats = bot.stats
+    assert stats.source == 'search'
+    assert stats.move in ('21-17', '22-18', '22-17', '23-19', '23-18',
+                          '24-20', '24-19')
+    assert stats.nodes == bot.nodes and stats.leaf_evaluations > 0
+    assert [depth for depth, _, _ in stats.iterations] == [1, 2, 3, 4]
+    assert sum(nodes for _, _, nodes in stats.iterations) == (
+        stats.nodes + stats.quiescence_nodes)
+    assert stats.completed_depth == 4
+    assert stats.max_depth >= 4
+    assert stats.cutoffs == sum(stats.cutoffs_by_move_number.values()) > 0
+    assert 0 < stats.table_hits <= stats.table_probes
+    assert stats.effective_branching_factor > 1
+
+    board.handle_move(bot.iterative_deepening(board))
+    bot.make_move(board)
+    with open(log_path) as log_file:
+        lines = [loads(line) for line in log_file]
+    assert len(lines) == 2
+    assert lines[0]['nodes'] == stats.nodes
+    assert lines[1]['ply'] == 1
+
+
+def test_timeout_in_a_forced_move_restores_the_board():
+    board = parse_position('W:W22:B1,18')
+    assert len(board.all_possible_moves(board.turn)) == 1
+    key, ply = board.zobrist_key, board.ply
+    for use_pvs in (False, True):
+        bot = MinimaxBot(Color.WHITE, 3, False, use_pvs=use_pvs)
+        bot.stop_signal = Event()
+        bot.stop_signal.set()
+        #   the node of the root is counted first, the one after
+        #   the forced move checks the signal
+        bot.nodes = NODES_BETWEEN_TIME_CHECKS - 2
+        with pytest.raises(SearchTimeout):
+            if use_pvs:
+                bot.negamax(board, 3)
+            else:
+                bot.minimax(board, 3)
+        assert (board.zobrist_key, board.ply) == (key, ply)
+        assert len(board.all_possible_moves(board.turn)) == 1
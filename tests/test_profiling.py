@@ -0,0 +1,51 @@
+from checkers.profiling import (Profiler, profiler_from_environment,
+                                PROFILE_DIR_VARIABLE)
+from checkers.piece_move_board import Board
+from checkers.player import MinimaxBot
+from checkers.constants import Color
+from pstats import Stats
+
+
+def test_profiler_saves_every_move(tmp_path):
+    original_choose_move = MinimaxBot.choose_move
+    profiler = Profiler(str(tmp_path), top=5)
+    profiler.install()
+    try:
+        board = Board()
+        bots = [MinimaxBot(color, 2, False) for color in Color]
+        board.handle_move(bots[0].choose_move(board))
+        #   the pondering search runs outside of the moves of the bots
+        bots[0].start_pondering(board)
+        board.handle_move(bots[1].choose_move(board))
+        board.handle_move(bots[0].choose_move(board))
+    finally:
+        profiler.uninstall()
+    assert MinimaxBot.choose_move is original_choose_move
+    assert profiler.moves == 3
+
+    stats = Stats(str(tmp_path / 'move-001-white.prof'))
+    assert any(function == 'iterative_deepening'
+               for _, _, function in stats.stats)
+    assert (tmp_path / 'move-002-black.prof').exists()
+    with open(tmp_path / 'move-001-white-allocations.txt') as report:
+        lines = report.readlines()
+    assert lines[0].startswith('Allocations during move 1')
+    assert len(lines) <= 6
+    board_stats = Stats(str(tmp_path / 'board.prof'))
+    board_functions = {function for _, _, function in board_stats.stats}
+    assert '_update_moves_around' in board_functions
+    assert 'make_move' in board_functions
+    assert (tmp_path / 'allocations.txt').exists()
+
+
+def test_profiling_is_off_without_the_variable(monkeypatch, tmp_path):
+    original_choose_move = MinimaxBot.choose_move
+    monkeypatch.delenv(PROFILE_DIR_VARIABLE, raising=False)
+    assert profiler_from_environment() is None
+    assert MinimaxBot.choose_move is original_choose_move
+
+    monkeypatch.setenv(PROFILE_DIR_VARIABLE, str(tmp_path / 'profiles'))
+    profiler = profiler_from_environment()
+    assert MinimaxBot.choose_move is not original_choose_move
+    profiler.uninstall()
+    assert MinimaxBot.choose_move is original_choose_move
@@ -0,0 +1,26 @@
+from checkers.search_stats import SearchStats
+from json import loads
+
+
+def test_computed_values():
+    stats = SearchStats()
+    assert stats.effective_branching_factor is None
+    assert stats.first_move_cutoff_rate is None
+    assert stats.table_hit_rate is None
+    stats = SearchStats(cutoffs=4, cutoffs_by_move_number={0: 3, 2: 1},
+                        table_probes=10, table_hits=4,
+                        iterations=[(1, 0.01, 8), (2, 0.02, 50),
+                                    (3, 0.1, 200)])
+    assert stats.effective_branching_factor == 4
+    assert stats.first_move_cutoff_rate == 0.75
+    assert stats.table_hit_rate == 0.4
+
+
+def test_to_json():
+    stats = SearchStats('book', '22-18', ply=3, time=0.5)
+    line = loads(stats.to_json())
+    assert line['source'] == 'book'
+    assert line['move'] == '22-18'
+    assert line['ply'] == 3
+    assert line['effective_branching_factor'] is None
+    assert line['iterations'] == []
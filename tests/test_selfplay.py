@@ -0,0 +1,55 @@
+from checkers.selfplay import create_bot, play_game, game_tasks, main
+from checkers.player import RandomBot, MinimaxBot
+from checkers.constants import Color
+from json import loads
+from subprocess import run
+import sys
+import pytest
+
+
+def test_create_bot():
+    assert isinstance(create_bot('random', Color.WHITE), RandomBot)
+    bot = create_bot('minimax:3', Color.BLACK)
+    assert isinstance(bot, MinimaxBot)
+    assert bot.color == Color.BLACK
+    assert (bot.depth, bot.time_limit) == (3, False)
+    assert bot.parallel_search is None and bot.lazy_smp is None
+    assert create_bot('minimax:5:1.5', Color.WHITE).time_limit == 1.5
+    for spec in ('minimax', 'minimax:x', 'minimax:0', 'minimax:2:0',
+                 'random:2', 'human'):
+        with pytest.raises(ValueError):
+            create_bot(spec, Color.WHITE)
+
+
+def test_games_repeat_with_the_same_seed():
+    task = (0, 'minimax:2', 'random', 5, None)
+    result = play_game(task)
+    assert result['winner'] in ('white', 'black', 'draw')
+    assert result['length'] == len(result['moves']) == len(
+        result['move_times'])
+    assert play_game(task)['moves'] == result['moves']
+    assert play_game((0, 'minimax:2', 'random', 6, None))['moves'] != (
+        result['moves'])
+
+
+def test_game_tasks():
+    tasks = game_tasks(3, 'minimax:2', 'random', seed=10, alternate=True)
+    assert [task[1:4] for task in tasks] == [
+        ('minimax:2', 'random', 10),
+        ('random', 'minimax:2', 11),
+        ('minimax:2', 'random', 12)]
+
+
+def test_main_streams_the_results(tmp_path):
+    output = tmp_path / 'games.jsonl'
+    wins = main(['--games', '2', '--white', 'random', '--black', 'random',
+                 '--output', str(output)])
+    assert sum(wins.values()) == 2
+    with open(output) as output_file:
+        results = [loads(line) for line in output_file]
+    assert sorted(result['game'] for result in results) == [0, 1]
+
+
+def test_selfplay_does_not_import_pygame():
+    run([sys.executable, '-c', 'import sys, checkers.selfplay; '
+         'assert "pygame" not in sys.modules'], check=True)
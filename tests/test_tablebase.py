@@ -0,0 +1,80 @@
+from checkers.tablebase import (PositionIndexer, Tablebase, generate,
+                                write_tablebase, WIN, LOSS, DRAW, UNKNOWN)
+from checkers.bitboard import BitBoard, location_to_square
+from checkers.piece_move_board import Board, Piece
+from checkers.player import MinimaxBot
+from checkers.constants import Color, TABLEBASE_WIN_SCORE
+import pytest
+
+
+@pytest.fixture(scope='module')
+def tablebase_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp('tablebase') / 'tablebase.bin'
+    values, distances = generate(2)
+    write_tablebase(path, 2, values, distances)
+    return path
+
+
+def test_indexer_numbers_positions_uniquely():
+    indexer = PositionIndexer(2)
+    numbers = [index for index, _ in indexer.positions()]
+    assert len(numbers) == len(set(numbers))
+    assert max(numbers) < indexer.num_of_positions
+    assert indexer.index(BitBoard.from_board(Board())) is None
+
+
+def test_values_agree_with_the_moves(tablebase_path):
+    tablebase = Tablebase(tablebase_path)
+    for _, position in PositionIndexer(2).positions():
+        value, distance = tablebase.probe(position)
+        children = [tablebase.probe(position.apply(move))
+                    for move in position.legal_moves()]
+        assert value != UNKNOWN
+        if value == WIN:
+            assert (LOSS, distance - 1) in children
+        elif value == LOSS:
+            assert all(child[0] == WIN for child in children)
+            assert distance == max([child[1] + 1 for child in children],
+                                   default=0)
+        else:
+            assert all(child[0] != LOSS for child in children)
+    tablebase.close()
+
+
+def test_known_positions(tablebase_path):
+    tablebase = Tablebase(tablebase_path)
+    white_king = 1 << location_to_square((2, 5))
+    black_man = 1 << location_to_square((3, 4))
+    #   the king takes the last black piece
+    assert tablebase.probe(
+        BitBoard(white_king, black_man, white_king, Color.WHITE)) == (WIN, 1)
+    kings = (1 << location_to_square((1, 0))) | (
+        1 << location_to_square((6, 7)))
+    assert tablebase.probe(
+        BitBoard(kings & -kings, kings & (kings - 1), kings, Color.WHITE)
+    )[0] == DRAW
+    tablebase.close()
+
+
+def test_bot_probes_the_tablebase(tablebase_path):
+    board = Board()
+    king = Piece(Color.WHITE, 2, 5)
+    king.promote()
+    board.setup_position([king, Piece(Color.WHITE, 4, 7),
+                          Piece(Color.BLACK, 7, 0)], Color.WHITE)
+    bot = MinimaxBot(Color.WHITE, 3, False, tablebase_path=tablebase_path)
+    bot.search(board, 3)
+    assert bot.tablebase_hits == 0
+    board.setup_position([king, Piece(Color.BLACK, 7, 0)], Color.WHITE)
+    bot.search(board, 3)
+    assert bot.tablebase_hits > 0
+    #   the king catches the man before it gets promoted
+    assert TABLEBASE_WIN_SCORE - 20 < bot.score < TABLEBASE_WIN_SCORE
+
+
+def test_not_a_tablebase_file(tmp_path):
+    path = tmp_path / 'tablebase.bin'
+    for data in (b'CKRSTBDB', b'CKRSTBDB' + bytes(64)):
+        path.write_bytes(data)
+        with pytest.raises(ValueError):
+            Tablebase(path)
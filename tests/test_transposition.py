@@ -0,0 +1,66 @@
+from checkers.transposition import (TranspositionTable, EXACT, LOWER_BOUND,
+                                    UPPER_BOUND, BUCKET_SIZE, move_key,
+                                    find_move, table_size_in_bytes)
+from checkers.piece_move_board import Board, Move
+
+
+def test_size_follows_memory_cap():
+    table = TranspositionTable(1)
+    assert table.num_of_entries * BUCKET_SIZE // 2 == 2 ** 20
+
+
+def test_store_and_probe():
+    table = TranspositionTable(1)
+    assert table.probe(12345) is None
+    table.store(12345, 4, EXACT, -7, 300)
+    assert table.probe(12345) == (4, EXACT, -7, 300)
+    table.store(999, 2, LOWER_BOUND, float('inf'))
+    assert table.probe(999) == (2, LOWER_BOUND, float('inf'), 0)
+    table.store(998, 2, UPPER_BOUND, float('-inf'))
+    assert table.probe(998)[2] == float('-inf')
+    assert table.probes == 4
+    assert table.hits == 3
+    table.clear()
+    assert table.probe(12345) is None
+
+
+def test_replacement_policy():
+    table = TranspositionTable(1)
+    num_of_buckets = table.num_of_entries // 2
+    deep_key, shallow_key, newer_key = (
+        5, 5 + num_of_buckets, 5 + 2 * num_of_buckets)
+    table.store(deep_key, 8, EXACT, 1)
+    table.store(shallow_key, 3, EXACT, 2)
+    table.store(newer_key, 2, EXACT, 3)
+    #   the deep entry stays, the always replaced one got overwritten
+    assert table.probe(deep_key) == (8, EXACT, 1, 0)
+    assert table.probe(shallow_key) is None
+    assert table.probe(newer_key) == (2, EXACT, 3, 0)
+
+    table.new_search()
+    table.store(shallow_key, 1, EXACT, 4)
+    #   entries from an earlier search can be replaced by shallower ones
+    assert table.probe(deep_key) is None
+    assert table.probe(shallow_key) == (1, EXACT, 4, 0)
+
+
+def test_move_key():
+    board = Board()
+    moves = board.all_possible_moves(board.turn)
+    keys = {move_key(move) for move in moves}
+    assert len(keys) == len(moves)
+    assert 0 not in keys
+    assert find_move(moves, move_key(moves[3])) is moves[3]
+    assert find_move(moves, 0) is None
+    assert move_key(Move(False, (0, 5), (1, 4), None)) == 40 | 33 << 6
+
+
+def test_tables_sharing_a_buffer():
+    buffer = bytearray(table_size_in_bytes(1))
+    first, second = TranspositionTable(buffer=buffer), TranspositionTable(
+        buffer=buffer)
+    assert first.num_of_entries == TranspositionTable(1).num_of_entries
+    first.store(4321, 3, EXACT, 5, 17)
+    assert second.probe(4321) == (3, EXACT, 5, 17)
+    first.release()
+    second.release()